@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark relationship formatting for hub tables with many incoming foreign keys.
+
+Builds relationship maps shaped like the CUSTOMERS hub in test/db/init, which is referenced by
+every table in the sales_data_N family, mixed with history/archive families, and times
+format_schema on them.
+
+Usage:
+    python -m benchmarks.bench_formatter [--sizes 1000 5000 20000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from db_context.schema.formatter import format_schema
+
+FAMILIES = [
+    "SALES_DATA_{i}",
+    "INVENTORY_DATA_{i}",
+    "FINANCE_DATA_{i}",
+    "HIST_ORDERS_{i}",
+    "ORDERS_{year}",
+    "SERVICE_DATA_{i}_HISTORY",
+    "OPERATIONS_DATA_{i}",
+    "HR_ATTRIBUTE_{i}",
+]
+
+def build_hub_relationships(incoming: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Build a deterministic relationship map with the given number of incoming foreign keys."""
+    rng = random.Random(seed)
+    relationships: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(incoming):
+        family = FAMILIES[i % len(FAMILIES)]
+        table = family.format(i=i // len(FAMILIES) + 1, year=2000 + i // len(FAMILIES))
+        relationships.setdefault(table, []).append({
+            "local_column": "CUSTOMER_ID",
+            "foreign_column": rng.choice(["CUSTOMER_ID", "REFERRED_BY", "ACCOUNT_OWNER_ID"]),
+            "direction": "INCOMING",
+        })
+    relationships["REGIONS"] = [{"local_column": "REGION_ID", "foreign_column": "REGION_ID", "direction": "OUTGOING"}]
+    return relationships
+
+def run(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    columns = [
+        {"name": "CUSTOMER_ID", "type": "NUMBER", "nullable": False},
+        {"name": "NAME", "type": "VARCHAR2", "nullable": False},
+        {"name": "EMAIL", "type": "VARCHAR2", "nullable": False},
+        {"name": "CREATED_AT", "type": "TIMESTAMP(6)", "nullable": True},
+    ]
+    results = []
+    for size in sizes:
+        relationships = build_hub_relationships(size)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = format_schema("CUSTOMERS", columns, relationships)
+            timings.append(time.perf_counter() - start)
+        results.append({
+            "incoming_fks": size,
+            "best_ms": min(timings) * 1000,
+            "mean_ms": sum(timings) / len(timings) * 1000,
+            "output_chars": len(output),
+        })
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'incoming FKs':>12} {'best ms':>10} {'mean ms':>10} {'chars':>8}")
+    for row in run(args.sizes, args.repeat):
+        print(f"{row['incoming_fks']:>12} {row['best_ms']:>10.2f} {row['mean_ms']:>10.2f} {row['output_chars']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cold start time of the MCP server over stdio, checked against a budget.
+
+Every editor window starts its own server process, so the time until a new process answers
+the MCP handshake and lists its tools is paid on every window opened. Each run starts
+the server in a new process serving a synthetic schema through the fake connector
+(benchmarks.serve_synthetic), so no database is needed. It times the process until the initialize
+response arrives and again until the tools/list response arrives. The schema cache loads in
+the background and is not part of either figure. A separate `python -X importtime` run shows
+how long each module imported by server.main takes to import.
+
+The exit status is 1 when the median time to the tools/list response exceeds --budget-ms.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 2000] [--tables 1000] [--output report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .load_test import PROTOCOL_VERSION, REPO_ROOT, StdioClient, start_server
+
+# Modules imported by server.main listed in the import time breakdown
+TOP_IMPORTS = 10
+
+async def start_once(tables: int, cache_dir: Path, timeout: float, server_log: Optional[Path]) -> Dict[str, float]:
+    """Start a server process and time its handshake and tool listing, in milliseconds from the spawn"""
+    start = time.perf_counter()
+    client = StdioClient(await start_server(tables, 0.0, cache_dir, server_log))
+    try:
+        response = await client.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "oracle-mcp-bench-startup", "version": "1.0.0"}
+        }, timeout)
+        if 'error' in response:
+            raise RuntimeError(f"initialize failed: {response['error']}")
+        initialize_ms = (time.perf_counter() - start) * 1000
+        await client.notify("notifications/initialized")
+        tools = await client.request("tools/list", {}, timeout)
+        if 'error' in tools:
+            raise RuntimeError(f"tools/list failed: {tools['error']}")
+        return {'initialize_ms': initialize_ms, 'tools_ms': (time.perf_counter() - start) * 1000,
+                'tools': len(tools.get('result', {}).get('tools', []))}
+    finally:
+        await client.close()
+
+def import_times(module: str = "server.main") -> Dict[str, Any]:
+    """Cumulative import time of module and of each module it imports directly, from -X importtime"""
+    env = {**os.environ, 'PYTHONPATH': str(REPO_ROOT)}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    # Lines read "import time: <self us> | <cumulative us> | <name indented by two spaces per level>";
+    # a module is listed after everything it imported, at one level less than those imports
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative) / 1000))
+    position = next((i for i, (_, name, _) in enumerate(entries) if name == module), None)
+    if position is None:
+        return {'total_ms': 0.0, 'imports': {}}
+    depth, _, total = entries[position]
+    imports = []
+    for child_depth, name, ms in reversed(entries[:position]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 2:
+            imports.append((name, round(ms, 1)))
+    imports.sort(key=lambda item: item[1], reverse=True)
+    return {'total_ms': round(total, 1), 'imports': dict(imports[:TOP_IMPORTS])}
+
+async def run_startup(args: argparse.Namespace) -> Dict[str, Any]:
+    runs: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory(prefix="oracle-mcp-startup-") as cache_dir:
+        for _ in range(args.runs):
+            runs.append(await start_once(args.tables, Path(cache_dir), args.timeout, args.server_log))
+
+    def summary(key: str) -> Dict[str, float]:
+        timings = sorted(run[key] for run in runs)
+        return {'p50_ms': round(statistics.median(timings), 1), 'best_ms': round(timings[0], 1),
+                'worst_ms': round(timings[-1], 1)}
+
+    return {
+        'parameters': {'runs': args.runs, 'tables': args.tables, 'budget_ms': args.budget_ms},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'tools': runs[-1]['tools'],
+        'initialize': summary('initialize_ms'),
+        'tools_list': summary('tools_ms'),
+        'import_time': import_times()
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Server processes started one after another")
+    parser.add_argument("--budget-ms", type=float, default=2000.0,
+                        help="Median time to the tools/list response above which the run fails")
+    parser.add_argument("--tables", type=int, default=1000, help="Tables in the synthetic schema")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each response")
+    parser.add_argument("--server-log", type=Path, help="Append the servers' stderr to this file")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_startup(args))
+
+    print(f"{'phase':<12} {'p50 ms':>10} {'best ms':>10} {'worst ms':>10}")
+    for name, key in (('initialize', 'initialize'), ('tools/list', 'tools_list')):
+        row = report[key]
+        print(f"{name:<12} {row['p50_ms']:>10.1f} {row['best_ms']:>10.1f} {row['worst_ms']:>10.1f}")
+    imports = report['import_time']
+    print(f"\nimport server.main: {imports['total_ms']:.1f} ms; slowest direct imports:")
+    for name, ms in imports['imports'].items():
+        print(f"  {name:<40} {ms:>8.1f} ms")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Report written to {args.output}")
+
+    p50 = report['tools_list']['p50_ms']
+    if p50 > args.budget_ms:
+        print(f"OVER BUDGET: {report['tools']} tools listed after {p50:.1f} ms, budget {args.budget_ms:g} ms")
+        sys.exit(1)
+    print(f"Within budget: {report['tools']} tools listed after {p50:.1f} ms, budget {args.budget_ms:g} ms")
+
+if __name__ == "__main__":
+    main()
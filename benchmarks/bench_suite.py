@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite: schema cache, search, formatting and tool latency against a synthetic schema.
+
+A deterministic schema of --tables tables (see benchmarks.synthetic) is served by an in-process
+FakeConnector that charges --latency-ms per simulated database round trip, so no database is
+needed and runs are comparable across machines and commits. Every benchmark records wall time
+and the database statements and round trips it caused; round trips are deterministic, so a
+change in them is reported as a regression regardless of timing noise.
+
+Usage:
+    python -m benchmarks.bench_suite [--tables 10000] [--latency-ms 1] [--repeat 5] [--lookups 50]
+                                     [--output report.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from db_context import DatabaseContext
+from db_context.schema.formatter import format_schema, format_schemas_with_budget
+
+from .fake_connector import FakeConnector
+from .synthetic import SyntheticSchema, generate_schema
+
+REPORT_VERSION = 1
+# Timing differences below this many milliseconds are never reported as regressions
+MIN_REGRESSION_MS = 0.5
+
+class Suite:
+    """Runs benchmarks against one DatabaseContext and collects their results"""
+
+    def __init__(self, schema: SyntheticSchema, latency_ms: float, repeat: int, cache_dir: Path) -> None:
+        self.schema = schema
+        self.latency_ms = latency_ms
+        self.repeat = repeat
+        self.cache_dir = cache_dir
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.db_context = self.new_context()
+        self.ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=self.db_context))
+
+    def new_context(self) -> DatabaseContext:
+        connector = FakeConnector(self.schema, latency_ms=self.latency_ms)
+        return DatabaseContext("fake", self.cache_dir / "schema_cache.json", connector=connector)
+
+    async def measure(self, name: str, fn: Callable[[], Awaitable[Any]], repeat: Optional[int] = None) -> Any:
+        """Time fn over repeat runs; statements and round trips are averaged per run"""
+        metrics = self.db_context.metrics
+        statements, round_trips = metrics.statements, metrics.round_trips
+        timings = []
+        result = None
+        runs = repeat or self.repeat
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = await fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.record(name, timings, (metrics.statements - statements) / runs,
+                    (metrics.round_trips - round_trips) / runs)
+        return result
+
+    def record(self, name: str, timings: List[float], statements: float = 0, round_trips: float = 0) -> None:
+        ordered = sorted(timings)
+        self.results[name] = {
+            'samples': len(timings),
+            'best_ms': round(ordered[0], 3),
+            'mean_ms': round(statistics.fmean(ordered), 3),
+            'p50_ms': round(statistics.median(ordered), 3),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            'statements': round(statements, 2),
+            'round_trips': round(round_trips, 2)
+        }
+
+    async def bench_cache(self) -> None:
+        manager = self.db_context.schema_manager
+        manager.cache = await self.measure(
+            'cache.build', lambda: manager.load_or_build_cache(force_rebuild=True), repeat=1)
+        await self.measure('cache.save', manager.save_cache)
+        # A second context reads the file the first one wrote, as a restarted server would
+        reader = self.new_context().schema_manager
+        await self.measure('cache.load', reader.load_or_build_cache)
+        self.results['cache.load']['file_bytes'] = reader.cache_path.stat().st_size
+
+    async def bench_lookups(self, lookups: int) -> None:
+        """Lazy per-table loading: first lookups load details from the database, later ones hit the cache"""
+        names = random.Random(self.schema.seed).sample(sorted(self.schema.tables), min(lookups, len(self.schema.tables)))
+        for phase in ('cold', 'warm'):
+            metrics = self.db_context.metrics
+            statements, round_trips = metrics.statements, metrics.round_trips
+            timings = []
+            for name in names:
+                start = time.perf_counter()
+                await self.db_context.get_schema_info(name)
+                timings.append((time.perf_counter() - start) * 1000)
+            self.record(f'schema.lookup_{phase}', timings, (metrics.statements - statements) / len(names),
+                        (metrics.round_trips - round_trips) / len(names))
+
+    async def bench_search(self) -> None:
+        await self.measure('search.tables_many', lambda: self.db_context.search_tables("DATA_1", 20))
+        await self.measure('search.tables_none', lambda: self.db_context.search_tables("NO_SUCH_TABLE", 20))
+        await self.measure('search.columns', lambda: self.db_context.search_columns("DISCOUNT", 50))
+
+    async def bench_formatter(self) -> None:
+        hub = await self.db_context.get_schema_info("CUSTOMERS")
+
+        async def format_hub() -> str:
+            return format_schema(hub.table_name, hub.columns, hub.relationships)
+        await self.measure('format.hub_schema', format_hub)
+        self.results['format.hub_schema']['relationships'] = len(hub.relationships)
+
+        infos = [info for info in self.db_context.schema_manager.cache.tables.values() if info.fully_loaded]
+        tables = [(info.table_name, info.columns, info.relationships) for info in infos]
+
+        async def format_budget() -> str:
+            return format_schemas_with_budget(tables, 20000)
+        await self.measure('format.budget', format_budget)
+        self.results['format.budget']['tables'] = len(tables)
+
+    async def bench_tools(self) -> None:
+        """End-to-end latency of the MCP tools, called the way the server calls them"""
+        from server import main as server
+
+        table = next(name for name in sorted(self.schema.tables) if name.startswith("SALES_DATA_"))
+        calls: Dict[str, Callable[[], Awaitable[str]]] = {
+            'get_table_schema': lambda: server.get_table_schema(table, ctx=self.ctx),
+            'get_table_schema_hub': lambda: server.get_table_schema("CUSTOMERS", ctx=self.ctx),
+            'get_tables_schema': lambda: server.get_tables_schema(
+                ["CUSTOMERS", "ORDERS", "ORDER_ITEMS", table], ctx=self.ctx, max_tokens=4000),
+            'search_tables_schema': lambda: server.search_tables_schema("SALES_DATA_1", ctx=self.ctx),
+            'search_columns': lambda: server.search_columns("UNIT_PRICE", ctx=self.ctx),
+            'get_table_constraints': lambda: server.get_table_constraints("ORDERS", ctx=self.ctx),
+            'get_table_indexes': lambda: server.get_table_indexes("ORDERS", ctx=self.ctx),
+            'get_related_tables': lambda: server.get_related_tables("ORDERS", ctx=self.ctx),
+            'explain_sql': lambda: server.explain_sql(
+                "SELECT o.order_id, c.name FROM orders o JOIN customers c ON c.customer_id = o.customer_id",
+                ctx=self.ctx),
+            'validate_sql': lambda: server.validate_sql("SELECT order_id FROM orders WHERE status_id = 1",
+                                                        ctx=self.ctx),
+        }
+        if self.schema.sources:
+            object_type, object_name = sorted(self.schema.sources)[0]
+            calls['get_object_source'] = lambda: server.get_object_source(object_type, object_name, ctx=self.ctx)
+        for name, call in calls.items():
+            await self.measure(f'tool.{name}', call)
+
+async def run_suite(table_count: int, latency_ms: float, repeat: int, lookups: int, seed: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    schema = generate_schema(table_count, seed)
+    generate_ms = (time.perf_counter() - start) * 1000
+    with tempfile.TemporaryDirectory(prefix="oracle-mcp-bench-") as cache_dir:
+        suite = Suite(schema, latency_ms, repeat, Path(cache_dir))
+        suite.record('schema.generate', [generate_ms])
+        await suite.bench_cache()
+        await suite.bench_lookups(lookups)
+        await suite.bench_search()
+        await suite.bench_formatter()
+        await suite.bench_tools()
+    return {
+        'version': REPORT_VERSION,
+        'parameters': {'tables': len(schema.tables), 'latency_ms': latency_ms, 'repeat': repeat,
+                       'lookups': lookups, 'seed': seed},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'results': suite.results
+    }
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of report against baseline: p50 slower by more than tolerance, or more round trips"""
+    if baseline.get('parameters') != report['parameters']:
+        print("Warning: baseline was run with different parameters; timings may not be comparable",
+              file=sys.stderr)
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if (current['p50_ms'] > previous['p50_ms'] * (1 + tolerance)
+                and current['p50_ms'] - previous['p50_ms'] > MIN_REGRESSION_MS):
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.2f} ms -> {current['p50_ms']:.2f} ms")
+        if current['round_trips'] > previous['round_trips']:
+            regressions.append(f"{name}: round trips {previous['round_trips']:g} -> {current['round_trips']:g}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=10000, help="Tables in the synthetic schema")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated latency per database round trip")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each benchmark")
+    parser.add_argument("--lookups", type=int, default=50, help="Tables looked up cold and then warm")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report; exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative p50 slowdown")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_suite(args.tables, args.latency_ms, args.repeat, args.lookups, args.seed))
+
+    print(f"{'benchmark':<32} {'p50 ms':>10} {'p95 ms':>10} {'best ms':>10} {'stmts':>8} {'trips':>8}")
+    for name, row in report['results'].items():
+        print(f"{name:<32} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} {row['best_ms']:>10.2f} "
+              f"{row['statements']:>8g} {row['round_trips']:>8g}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Report written to {args.output}")
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding='utf-8')), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+In-process stand-in for DatabaseConnector that serves a SyntheticSchema instead of querying Oracle.
+
+Every method issues the same number of statements as the Oracle implementation it replaces, and
+each round trip costs a configurable simulated latency, so round-trip counts, metrics, traces and
+end-to-end timings behave like those of a server talking to a database at that distance.
+"""
+import asyncio
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from db_context.database import DatabaseConnector
+from db_context.sql.parser import parse
+from db_context.tracing import trace_methods
+
+from .synthetic import SyntheticSchema
+
+# DDL time reported for every object of the synthetic schema
+FIXED_DDL_TIME = "2024-01-01 00:00:00"
+# Rows per fetch round trip, matching the driver's default arraysize
+FAKE_ARRAYSIZE = 100
+
+@trace_methods("connector")
+class FakeConnector(DatabaseConnector):
+    """DatabaseConnector serving a SyntheticSchema, with latency_ms of simulated latency per round trip"""
+
+    def __init__(self, schema: SyntheticSchema, latency_ms: float = 0.0, schema_name: str = "BENCH") -> None:
+        super().__init__("fake", target_schema=schema_name)
+        self.schema = schema
+        self.latency_ms = latency_ms
+        # Bumped to simulate DDL in the schema, which changes the schema signature
+        self.ddl_generation = 0
+
+    async def _query(self, operation: str, rows: int = 0, **params: Any) -> None:
+        """Simulate one statement returning rows: one round trip to execute plus one per fetch batch"""
+        with self._statement_span(f"/* synthetic */ {operation}", params) as span:
+            start = time.perf_counter()
+            round_trips = 1 + -(-max(0, rows - 2) // FAKE_ARRAYSIZE)
+            await asyncio.sleep(self.latency_ms * round_trips / 1000)
+            self.metrics.record_statement((time.perf_counter() - start) * 1000, round_trips, rows)
+            if span is not None:
+                span.set('db.rows', rows)
+                span.set('db.round_trips', round_trips)
+
+    async def initialize_pool(self) -> None:
+        pass
+
+    async def close_pool(self) -> None:
+        pass
+
+    async def get_effective_schema(self) -> str:
+        return self.target_schema
+
+    async def get_database_info(self) -> Dict[str, Any]:
+        await self._query("v$version", rows=1)
+        return {"vendor": "Oracle", "version": "Synthetic benchmark schema", "schema": self.target_schema}
+
+    async def get_all_table_names(self) -> Set[str]:
+        await self._query("all_tables", rows=len(self.schema.tables))
+        return set(self.schema.tables)
+
+    async def get_schema_statistics(self) -> Dict[str, Dict[str, Any]]:
+        await self._query("all_tables statistics", rows=len(self.schema.tables))
+        result = {}
+        column_count = 0
+        for table in self.schema.tables.values():
+            columns = {}
+            for position, column in enumerate(table.columns):
+                distinct = max(1, table.num_rows // (position + 1))
+                columns[column["name"]] = {
+                    "num_distinct": distinct,
+                    "num_nulls": 0 if not column["nullable"] else table.num_rows // 50,
+                    "density": 1 / distinct,
+                    "histogram": "FREQUENCY" if distinct < 255 else None,
+                    "num_buckets": min(distinct, 254),
+                    "last_analyzed": FIXED_DDL_TIME
+                }
+            column_count += len(columns)
+            result[table.name] = {
+                "num_rows": table.num_rows,
+                "blocks": table.num_rows // 60 + 1,
+                "avg_row_len": 40 + 8 * len(table.columns),
+                "last_analyzed": FIXED_DDL_TIME,
+                "columns": columns
+            }
+        await self._query("all_tab_col_statistics", rows=column_count)
+        return result
+
+    async def load_table_details(self, table_name: str) -> Optional[Dict[str, Any]]:
+        table_name = table_name.upper()
+        await self._query("all_tables count", rows=1, table_name=table_name)
+        table = self.schema.tables.get(table_name)
+        if table is None:
+            return None
+        await self._query("all_tab_cols", rows=len(table.columns), table_name=table_name)
+        relationships = self.schema.relationships(table_name)
+        await self._query("relationships", rows=sum(len(r) for r in relationships.values()), table_name=table_name)
+        return {"columns": [dict(column) for column in table.columns], "relationships": relationships}
+
+    async def get_pl_sql_objects(self, object_type: str, name_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        objects = [
+            {"name": name, "type": kind, "owner": self.target_schema, "status": "VALID",
+             "created": FIXED_DDL_TIME, "last_modified": FIXED_DDL_TIME}
+            for kind, name in self.schema.sources
+            if kind == object_type.upper() and (not name_pattern or name_pattern.upper().strip('%') in name)
+        ]
+        await self._query("all_objects", rows=len(objects))
+        return objects
+
+    async def get_all_objects(self) -> List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]]:
+        rows = [("TABLE", name, "VALID", FIXED_DDL_TIME, FIXED_DDL_TIME) for name in self.schema.tables]
+        rows += [(kind, name, "VALID", FIXED_DDL_TIME, FIXED_DDL_TIME) for kind, name in self.schema.sources]
+        await self._query("all_objects", rows=len(rows))
+        return rows
+
+    async def get_object_last_ddl_time(self, object_type: str, object_name: str) -> Optional[str]:
+        await self._query("all_objects last_ddl_time", rows=1, object_name=object_name)
+        if (object_type, object_name) in self.schema.sources or object_name in self.schema.tables:
+            return FIXED_DDL_TIME
+        return None
+
+    async def fetch_object_source(self, object_type: str, object_name: str) -> str:
+        lines = self.schema.sources.get((object_type, object_name), [])
+        await self._query("all_source", rows=len(lines), name=object_name)
+        return "\n".join(lines)
+
+    async def get_source_ddl_times(self) -> Dict[Tuple[str, str], str]:
+        await self._query("all_objects source ddl times", rows=len(self.schema.sources))
+        return {key: FIXED_DDL_TIME for key in self.schema.sources}
+
+    async def fetch_all_source(self, object_names: Optional[List[str]] = None) -> Dict[Tuple[str, str], List[str]]:
+        wanted = set(object_names) if object_names is not None else None
+        result = {key: list(lines) for key, lines in self.schema.sources.items()
+                  if wanted is None or key[1] in wanted}
+        await self._query("all_source", rows=sum(len(lines) for lines in result.values()))
+        return result
+
+    async def get_table_constraints(self, table_name: str) -> List[Dict[str, Any]]:
+        table = self.schema.tables.get(table_name.upper())
+        if table is None:
+            await self._query("all_constraints", rows=0, table_name=table_name)
+            return []
+        key = table.columns[0]["name"]
+        constraints: List[Dict[str, Any]] = [{"name": f"PK_{table.name}"[:128], "type": "PRIMARY KEY", "columns": [key]}]
+        for position, (column, referenced, referenced_column) in enumerate(table.foreign_keys, 1):
+            constraints.append({"name": f"FK_{table.name}_{position}"[:128], "type": "FOREIGN KEY",
+                                "columns": [column],
+                                "references": {"table": referenced, "columns": [referenced_column]}})
+        await self._query("all_constraints", rows=len(constraints), table_name=table_name)
+        for constraint in constraints:
+            await self._query("all_cons_columns", rows=1)
+            if "references" in constraint:
+                await self._query("referenced columns", rows=1)
+        return constraints
+
+    async def get_table_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        table = self.schema.tables.get(table_name.upper())
+        if table is None:
+            await self._query("all_indexes", rows=0, table_name=table_name)
+            return []
+        indexes = [{"name": f"PK_{table.name}"[:128], "unique": True, "columns": [table.columns[0]["name"]]}]
+        # Roughly half of the foreign keys are indexed, decided by name so it is stable across runs
+        for position, (column, _, _) in enumerate(table.foreign_keys, 1):
+            if zlib.crc32(f"{table.name}.{column}".encode()) % 2 == 0:
+                indexes.append({"name": f"IX_{table.name}_{position}"[:128], "unique": False, "columns": [column]})
+        await self._query("all_indexes", rows=len(indexes), table_name=table_name)
+        for _ in indexes:
+            await self._query("all_ind_columns", rows=1)
+        return indexes
+
+    async def get_dependent_objects(self, object_name: str) -> List[Dict[str, Any]]:
+        await self._query("all_dependencies", rows=0, object_name=object_name)
+        return []
+
+    async def get_all_dependencies(self) -> List[Tuple[str, str, str, str, str]]:
+        await self._query("all_dependencies", rows=0)
+        return []
+
+    async def get_schema_signatures(self) -> Dict[str, str]:
+        await self._query("schema signatures", rows=1)
+        return {'ddl': f"{len(self.schema.tables)}:{self.ddl_generation}", 'stats': FIXED_DDL_TIME}
+
+    async def get_user_defined_types(self, type_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        await self._query("all_types", rows=0)
+        return []
+
+    async def get_related_tables(self, table_name: str) -> Dict[str, List[str]]:
+        table_name = table_name.upper()
+        table = self.schema.tables.get(table_name)
+        referenced = list(dict.fromkeys(referenced for _, referenced, _ in table.foreign_keys)) if table else []
+        referencing = list(dict.fromkeys(name for name, _, _ in self.schema.incoming.get(table_name, [])))
+        await self._query("referenced tables", rows=len(referenced), table_name=table_name)
+        await self._query("referencing tables", rows=len(referencing), table_name=table_name)
+        return {'referenced_tables': referenced, 'referencing_tables': referencing}
+
+    async def search_in_database(self, search_term: str, limit: int = 20) -> List[str]:
+        term = search_term.upper()
+        matches = sorted(name for name in self.schema.tables if term in name)[:limit]
+        await self._query("all_tables like", rows=len(matches), search_term=term)
+        return matches
+
+    async def search_columns_in_database(self, table_names: List[str], search_term: str) -> Dict[str, List[Dict[str, Any]]]:
+        term = search_term.upper()
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name in table_names:
+            table = self.schema.tables.get(table_name)
+            if table is None:
+                continue
+            matches = [dict(column) for column in table.columns if term in column["name"].upper()]
+            if matches:
+                result[table_name] = matches
+        await self._query("all_tab_cols like", rows=sum(len(columns) for columns in result.values()))
+        return result
+
+    async def sample_table(self, table_name: str, columns: List[Dict[str, Any]], rows: int = 10,
+                           max_bytes: int = 16384) -> Dict[str, Any]:
+        table = self.schema.tables[table_name]
+        await self._query("num_rows", rows=1, table_name=table_name)
+        await self._query("sample", rows=min(rows, table.num_rows), table_name=table_name)
+        sample_rows = [[f"{column['name'].lower()}_{row}" for column in columns]
+                       for row in range(min(rows, table.num_rows))]
+        return {"table": table_name, "columns": [column["name"] for column in columns], "rows": sample_rows,
+                "sampled": table.num_rows > rows * 40, "truncated": False,
+                "bytes": sum(len(value) for row in sample_rows for value in row), "max_bytes": max_bytes}
+
+    async def explain_query_plan(self, query: str) -> Dict[str, Any]:
+        statement = parse(query)
+        await self._query("explain plan", rows=0)
+        plan = ["Plan hash value: 0", "", "| Id | Operation | Name |", "|  0 | SELECT STATEMENT | |"]
+        plan += [f"|  {i} | TABLE ACCESS FULL | {table.name} |" for i, table in enumerate(statement.tables, 1)]
+        await self._query("dbms_xplan.display", rows=len(plan))
+        await self._query("delete plan_table", rows=0)
+        return {
+            "statement_id": uuid.uuid4().hex[:30],
+            "execution_plan": plan,
+            "plan_steps": [],
+            "optimization_suggestions": self._analyze_query_for_optimization(query)
+        }
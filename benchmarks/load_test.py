@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test of the MCP server over the stdio protocol.
+
+Starts the server as a subprocess serving a synthetic schema through the fake connector
+(benchmarks.serve_synthetic), so no database is needed, and drives it with many JSON-RPC requests
+in flight at once. The workload mixes two kinds of client sessions:
+- analysis sessions derived from test/db/queries. Each one reads an analysis package's source,
+  fetches the schema of the tables the script uses, follows their relationships and explains
+  queries against them, in order.
+- single browsing calls: table lookups, searches, constraints, indexes and SQL validation.
+
+--concurrency sessions run at once. Each session issues its calls one after another, as an
+assistant working through a task would. The report gives throughput, latency percentiles overall
+and per tool, error counts by kind, and the server's own metrics at the end of the run.
+
+Usage:
+    python -m benchmarks.load_test [--tables 10000] [--latency-ms 1] [--concurrency 16]
+                                   [--requests 2000] [--analysis-share 0.5] [--output report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .synthetic import EXTRA_COLUMNS, FAMILIES, QUERIES_DIR, SyntheticSchema, generate_schema, load_query_sources
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PROTOCOL_VERSION = "2024-11-05"
+# Largest JSON-RPC message read from the server, well above any tool response
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# Tables of one analysis script fetched in one get_tables_schema call
+SESSION_TABLES = 8
+
+# A tool call as (tool name, arguments)
+Call = Tuple[str, Dict[str, Any]]
+
+class StdioClient:
+    """Minimal MCP client over a subprocess's stdin/stdout, with any number of requests in flight"""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read_responses())
+
+    async def _read_responses(self) -> None:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Not a protocol message
+            future = self._pending.pop(message.get('id'), None) if 'id' in message else None
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Server closed its output"))
+        self._pending.clear()
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self.process.stdin.write((json.dumps(message) + "\n").encode('utf-8'))
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str) -> None:
+        await self._send({"jsonrpc": "2.0", "method": method})
+
+    async def close(self) -> None:
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 10)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self._reader.cancel()
+
+def query_workloads(schema: SyntheticSchema, queries_dir: Path = QUERIES_DIR) -> List[List[Call]]:
+    """One analysis session per script in test/db/queries, limited to tables the schema has"""
+    table_reference = re.compile(r"\b(?:FROM|JOIN)\s+([A-Z][A-Z0-9_$#]*)", re.IGNORECASE)
+    packages = {name for kind, name in load_query_sources(queries_dir) if kind == "PACKAGE"}
+    sessions = []
+    for path in sorted(queries_dir.glob("*.sql")) if queries_dir.is_dir() else []:
+        text = path.read_text(encoding="utf-8")
+        tables = list(dict.fromkeys(name.upper() for name in table_reference.findall(text)
+                                    if name.upper() in schema.tables))
+        names = {name.upper() for name in re.findall(r"PACKAGE\s+(?:BODY\s+)?(\w+)", text, re.IGNORECASE)}
+        session: List[Call] = [("get_object_source", {"object_type": "PACKAGE", "object_name": name})
+                               for name in sorted(names & packages)]
+        if tables:
+            session.append(("get_tables_schema", {"table_names": tables[:SESSION_TABLES], "max_tokens": 4000}))
+            session.append(("get_related_tables", {"table_name": tables[0]}))
+            for table in tables[:2]:
+                session.append(("explain_sql", {"sql": f"SELECT COUNT(*) FROM {table} WHERE ID > 0"}))
+        if session:
+            sessions.append(session)
+    return sessions
+
+def browse_call(schema: SyntheticSchema, rng: random.Random) -> Call:
+    """A single exploratory call, as an assistant makes before it knows which tables it needs"""
+    table = rng.choice(list(schema.tables))
+    family = rng.choice(FAMILIES)[0].split("{")[0]
+    kind = rng.choices(["table", "search", "columns", "constraints", "indexes", "related", "validate"],
+                       weights=[35, 15, 10, 10, 10, 10, 10])[0]
+    if kind == "table":
+        return ("get_table_schema", {"table_name": table})
+    if kind == "search":
+        return ("search_tables_schema", {"search_term": f"{family}{rng.randint(1, 20)}", "max_tokens": 4000})
+    if kind == "columns":
+        return ("search_columns", {"search_term": rng.choice(EXTRA_COLUMNS)[0]})
+    if kind == "constraints":
+        return ("get_table_constraints", {"table_name": table})
+    if kind == "indexes":
+        return ("get_table_indexes", {"table_name": table})
+    if kind == "related":
+        return ("get_related_tables", {"table_name": table})
+    return ("validate_sql", {"sql": f"SELECT * FROM {table} WHERE ROWNUM <= 10"})
+
+def build_sessions(schema: SyntheticSchema, requests: int, analysis_share: float, seed: int) -> List[List[Call]]:
+    """Sessions totalling at least requests calls, drawn deterministically from seed"""
+    rng = random.Random(seed)
+    analyses = query_workloads(schema)
+    sessions: List[List[Call]] = []
+    total = 0
+    while total < requests:
+        if analyses and rng.random() < analysis_share:
+            session = rng.choice(analyses)
+        else:
+            session = [browse_call(schema, rng)]
+        sessions.append(session)
+        total += len(session)
+    return sessions
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(percentile(ordered, 0.50), 3),
+        'p90_ms': round(percentile(ordered, 0.90), 3),
+        'p99_ms': round(percentile(ordered, 0.99), 3),
+        'max_ms': round(ordered[-1], 3) if ordered else 0.0
+    }
+
+def response_error(response: Dict[str, Any]) -> Optional[str]:
+    """Kind of error in a tools/call response, or None if it succeeded"""
+    if 'error' in response:
+        return f"rpc {response['error'].get('code')}"
+    result = response.get('result', {})
+    if result.get('isError'):
+        return "tool exception"
+    text = "".join(item.get('text', '') for item in result.get('content', []))
+    if text.startswith("Error"):
+        return "error response"
+    return None
+
+async def start_server(tables: int, latency_ms: float, cache_dir: Path, server_log: Optional[Path],
+                       seed: int = 42) -> asyncio.subprocess.Process:
+    env = {**os.environ, 'CACHE_DIR': str(cache_dir), 'PYTHONPATH': str(REPO_ROOT)}
+    stderr = open(server_log, 'ab') if server_log else asyncio.subprocess.DEVNULL
+    try:
+        return await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "benchmarks.serve_synthetic", "--tables", str(tables), "--latency-ms", str(latency_ms),
+            "--seed", str(seed), cwd=REPO_ROOT, env=env, limit=MAX_MESSAGE_BYTES,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=stderr)
+    finally:
+        if server_log:
+            stderr.close()
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    schema = generate_schema(args.tables, args.seed)
+    sessions = build_sessions(schema, args.requests, args.analysis_share, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="oracle-mcp-load-") as cache_dir:
+        start = time.perf_counter()
+        client = StdioClient(await start_server(args.tables, args.latency_ms, Path(cache_dir), args.server_log, args.seed))
+        try:
+            await client.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "oracle-mcp-load-test", "version": "1.0.0"}
+            }, args.startup_timeout)
+            await client.notify("notifications/initialized")
+            startup_ms = (time.perf_counter() - start) * 1000
+            tools = await client.request("tools/list", {}, args.timeout)
+            available = {tool['name'] for tool in tools.get('result', {}).get('tools', [])}
+
+            latencies: Dict[str, List[float]] = {}
+            errors: Dict[str, int] = {}
+            queue: asyncio.Queue = asyncio.Queue()
+            for session in sessions:
+                queue.put_nowait(session)
+
+            async def worker() -> None:
+                while not queue.empty():
+                    for name, arguments in queue.get_nowait():
+                        if name not in available:
+                            errors["unknown tool"] = errors.get("unknown tool", 0) + 1
+                            continue
+                        call_start = time.perf_counter()
+                        try:
+                            response = await client.request("tools/call", {"name": name, "arguments": arguments},
+                                                            args.timeout)
+                            error = response_error(response)
+                        except asyncio.TimeoutError:
+                            error = "timeout"
+                        except ConnectionError:
+                            error = "connection closed"
+                        latencies.setdefault(name, []).append((time.perf_counter() - call_start) * 1000)
+                        if error:
+                            errors[error] = errors.get(error, 0) + 1
+
+            run_start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - run_start
+
+            metrics = await client.request("tools/call", {"name": "get_server_metrics",
+                                                          "arguments": {"output_format": "json"}}, args.timeout)
+            try:
+                server_metrics = json.loads(metrics['result']['content'][0]['text'])
+            except (KeyError, IndexError, json.JSONDecodeError):
+                server_metrics = None
+        finally:
+            await client.close()
+
+    completed = sum(len(values) for values in latencies.values())
+    return {
+        'parameters': {'tables': len(schema.tables), 'latency_ms': args.latency_ms,
+                       'concurrency': args.concurrency, 'requests': completed,
+                       'analysis_share': args.analysis_share, 'seed': args.seed},
+        'startup_ms': round(startup_ms, 1),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 2) if elapsed else 0.0,
+        'latency': summarize([value for values in latencies.values() for value in values]),
+        'tools': {name: summarize(values) for name, values in sorted(latencies.items())},
+        'errors': errors,
+        'error_rate': round(sum(errors.values()) / max(1, completed), 4),
+        'server_metrics': server_metrics
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=10000, help="Tables in the synthetic schema")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated latency per database round trip")
+    parser.add_argument("--concurrency", type=int, default=16, help="Sessions running at once")
+    parser.add_argument("--requests", type=int, default=2000, help="Tool calls to make in total")
+    parser.add_argument("--analysis-share", type=float, default=0.5,
+                        help="Fraction of sessions that replay a test/db/queries analysis")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each response")
+    parser.add_argument("--startup-timeout", type=float, default=600.0, help="Seconds to wait for the server to start")
+    parser.add_argument("--server-log", type=Path, help="Append the server's stderr to this file")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+
+    print(f"Startup: {report['startup_ms']:.0f} ms")
+    print(f"Requests: {report['parameters']['requests']} in {report['elapsed_s']:.2f} s "
+          f"({report['throughput_rps']:.1f}/s) at concurrency {args.concurrency}")
+    print(f"Errors: {sum(report['errors'].values())} ({report['error_rate']:.2%})"
+          + "".join(f", {kind}: {count}" for kind, count in sorted(report['errors'].items())))
+    print(f"\n{'tool':<24} {'count':>7} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name, row in [('all', report['latency'])] + list(report['tools'].items()):
+        print(f"{name:<24} {row['count']:>7} {row['p50_ms']:>10.2f} {row['p90_ms']:>10.2f} "
+              f"{row['p99_ms']:>10.2f} {row['max_ms']:>10.2f}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
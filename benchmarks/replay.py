@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded workload against a DatabaseContext backed by the fake connector.
+
+A workload is captured from a running server by setting WORKLOAD_FILE, which appends every tool
+call with its arguments and start time. The replay runs the calls through the same tool
+functions, in recorded order and one at a time, against a synthetic schema. Tables and PL/SQL
+objects the workload names are added to that schema. The schema manager's clock follows the
+recorded start times, so TTLs expire as they did in production however fast the replay runs,
+and the same workload and options always produce the same cache hits and round trips.
+
+Use --ttl and --plan-cache-size to try other cache settings on the same workload. Compare the
+reports: the cache hit rates, database round trips and per-call latency they give show whether
+a change helps the real workload.
+
+Usage:
+    python -m benchmarks.replay workload.jsonl [--tables 10000] [--latency-ms 1]
+                                [--ttl related_tables=3600 ...] [--plan-cache-size 256] [--output report.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from db_context import DatabaseContext
+from db_context.diagnostics import load_workload
+from db_context.sql.parser import parse
+
+from .fake_connector import FakeConnector
+from .synthetic import SyntheticSchema, generate_schema
+
+# Diagnostic tools that do not touch the caches and would change the replaying process
+SKIPPED_TOOLS = ('get_server_metrics', 'profile_requests')
+
+class RecordedClock:
+    """Clock returning the start time of the recorded call being replayed"""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+def add_workload_objects(schema: SyntheticSchema, calls: List[Dict[str, Any]]) -> int:
+    """Add the tables and PL/SQL objects named in the workload's arguments; returns how many were added"""
+    tables = set()
+    sources: set = set()
+    for call in calls:
+        arguments = call.get('arguments') or {}
+        if isinstance(arguments.get('table_name'), str):
+            tables.add(arguments['table_name'].upper())
+        tables.update(name.upper() for name in arguments.get('table_names') or [] if isinstance(name, str))
+        if isinstance(arguments.get('sql'), str):
+            try:
+                tables.update(table.name.upper() for table in parse(arguments['sql']).tables)
+            except Exception:
+                pass  # Statements the parser cannot read name no tables
+        if isinstance(arguments.get('object_type'), str) and isinstance(arguments.get('object_name'), str):
+            sources.add((arguments['object_type'].upper(), arguments['object_name'].upper()))
+    added = 0
+    for name in sorted(tables - set(schema.tables)):
+        schema.add_referencing_table(name)
+        added += 1
+    for object_type, object_name in sorted(sources - set(schema.sources)):
+        schema.sources[(object_type, object_name)] = [
+            f"CREATE OR REPLACE {object_type} {object_name.lower()} AS",
+            "  -- Placeholder source for a recorded workload",
+            f"END {object_name.lower()};"
+        ]
+        added += 1
+    return added
+
+def cache_counts(db_context: DatabaseContext) -> Tuple[int, int]:
+    metrics = db_context.metrics
+    return sum(metrics.cache_hits.values()), sum(metrics.cache_misses.values())
+
+async def replay(workload: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    from server import main as server
+    # Replayed calls must not be captured again
+    server.workload_recorder = None
+
+    schema = generate_schema(args.tables, args.seed)
+    added = add_workload_objects(schema, workload)
+    calls = [call for call in workload if call['tool'] not in SKIPPED_TOOLS]
+
+    with tempfile.TemporaryDirectory(prefix="oracle-mcp-replay-") as cache_dir:
+        connector = FakeConnector(schema, latency_ms=args.latency_ms)
+        db_context = DatabaseContext("fake", Path(cache_dir) / "schema_cache.json", connector=connector)
+        manager = db_context.schema_manager
+        clock = RecordedClock(calls[0]['time'] if calls else time.time())
+        manager.clock = clock
+        unknown = [cache_type for cache_type, _ in args.ttl if cache_type not in manager.ttl]
+        if unknown:
+            raise ValueError(f"Unknown cache types {', '.join(unknown)}; use one of {', '.join(manager.ttl)}")
+        manager.ttl.update(args.ttl)
+        if args.plan_cache_size is not None:
+            manager.plan_cache_size = args.plan_cache_size
+        ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=db_context))
+        await db_context.initialize()
+        metrics = db_context.metrics
+        startup = {'round_trips': metrics.round_trips, 'statements': metrics.statements}
+
+        results = []
+        for index, call in enumerate(calls):
+            clock.now = call['time']
+            tool = getattr(server, call['tool'], None)
+            round_trips, statements = metrics.round_trips, metrics.statements
+            hits, misses = cache_counts(db_context)
+            start = time.perf_counter()
+            error = None
+            if tool is None or call['tool'].startswith('_'):
+                error = "unknown tool"
+            else:
+                try:
+                    response = await tool(**(call.get('arguments') or {}), ctx=ctx)
+                    if isinstance(response, str) and response.startswith("Error"):
+                        error = "error response"
+                except TypeError as e:
+                    error = f"arguments no longer accepted: {e}"
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            hits_after, misses_after = cache_counts(db_context)
+            results.append({
+                'index': index,
+                'offset_s': round(call['time'] - calls[0]['time'], 3),
+                'tool': call['tool'],
+                'elapsed_ms': round(elapsed_ms, 3),
+                'recorded_ms': call.get('elapsed_ms'),
+                'round_trips': metrics.round_trips - round_trips,
+                'statements': metrics.statements - statements,
+                'cache_hits': hits_after - hits,
+                'cache_misses': misses_after - misses,
+                **({'error': error} if error else {})
+            })
+
+    return {
+        'parameters': {'workload': str(args.workload), 'tables': len(schema.tables), 'objects_added': added,
+                       'latency_ms': args.latency_ms, 'seed': args.seed, 'ttl': dict(manager.ttl),
+                       'plan_cache_size': manager.plan_cache_size},
+        'startup': startup,
+        'summary': summarize(results),
+        'tools': {name: summarize([r for r in results if r['tool'] == name])
+                  for name in sorted({r['tool'] for r in results})},
+        'cache': {
+            cache_type: {
+                **counts,
+                'hit_ratio': round(counts['hits'] / (counts['hits'] + counts['misses']), 4)
+                if counts['hits'] + counts['misses'] else None
+            }
+            for cache_type, counts in metrics.snapshot()['cache'].items()
+        },
+        'calls': results
+    }
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    timings = sorted(result['elapsed_ms'] for result in results)
+    hits = sum(result['cache_hits'] for result in results)
+    lookups = hits + sum(result['cache_misses'] for result in results)
+    return {
+        'calls': len(results),
+        'errors': sum(1 for result in results if 'error' in result),
+        'p50_ms': round(statistics.median(timings), 3) if timings else 0.0,
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3) if timings else 0.0,
+        'total_ms': round(sum(timings), 3),
+        'round_trips': sum(result['round_trips'] for result in results),
+        'statements': sum(result['statements'] for result in results),
+        'cache_hit_ratio': round(hits / lookups, 4) if lookups else None
+    }
+
+def parse_ttl(value: str) -> Tuple[str, float]:
+    cache_type, _, seconds = value.partition('=')
+    try:
+        return cache_type, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected CACHE_TYPE=SECONDS, got '{value}'")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workload", type=Path, help="Workload file written by a server with WORKLOAD_FILE set")
+    parser.add_argument("--tables", type=int, default=10000, help="Tables in the synthetic schema")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated latency per database round trip")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ttl", type=parse_ttl, action="append", default=[], metavar="CACHE_TYPE=SECONDS",
+                        help="Override a SchemaManager TTL, e.g. related_tables=3600; may be repeated")
+    parser.add_argument("--plan-cache-size", type=int, help="Override the execution plan LRU size")
+    parser.add_argument("--output", type=Path, help="Write the JSON report, including every call, to this file")
+    args = parser.parse_args()
+
+    workload = load_workload(args.workload)
+    if not workload:
+        print(f"No tool calls recorded in {args.workload}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        report = asyncio.run(replay(workload, args))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    summary = report['summary']
+    print(f"Replayed {summary['calls']} calls ({summary['errors']} errors) against "
+          f"{report['parameters']['tables']} tables, {report['parameters']['objects_added']} added from the workload")
+    print(f"Startup: {report['startup']['round_trips']} round trips")
+    print(f"\n{'tool':<24} {'calls':>6} {'p50 ms':>10} {'p95 ms':>10} {'trips':>8} {'hit ratio':>10}")
+    for name, row in [('all', summary)] + list(report['tools'].items()):
+        ratio = f"{row['cache_hit_ratio']:.1%}" if row['cache_hit_ratio'] is not None else "-"
+        print(f"{name:<24} {row['calls']:>6} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+              f"{row['round_trips']:>8} {ratio:>10}")
+    print(f"\n{'cache':<24} {'hits':>8} {'misses':>8} {'hit ratio':>10}")
+    for cache_type, row in report['cache'].items():
+        ratio = f"{row['hit_ratio']:.1%}" if row['hit_ratio'] is not None else "-"
+        print(f"{cache_type:<24} {row['hits']:>8} {row['misses']:>8} {ratio:>10}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Run the MCP server over stdio against a synthetic schema instead of an Oracle database.
+
+The server is server/main.py with its DatabaseContext built on the fake connector, which
+answers every dictionary query from a generated schema after --latency-ms per round trip.
+All other settings (CACHE_DIR, metrics, tracing) are read from the environment as usual.
+The load test and the startup benchmark start the server this way.
+
+Usage:
+    python -m benchmarks.serve_synthetic [--tables 10000] [--latency-ms 1] [--seed 42]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from db_context import DatabaseContext
+import server.main as server_main
+
+from .fake_connector import FakeConnector
+from .synthetic import generate_schema
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=10000, help="Tables in the synthetic schema")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated latency of each round trip")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic schema")
+    args = parser.parse_args()
+
+    def create_database_context() -> DatabaseContext:
+        print(f"Serving a synthetic schema of {args.tables} tables", file=sys.stderr)
+        cache_dir = Path(server_main.CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        connector = FakeConnector(generate_schema(args.tables, args.seed), latency_ms=args.latency_ms)
+        db_context = DatabaseContext("synthetic", cache_dir / 'schema_cache.json', connector=connector)
+        db_context.schema_manager.compress_cache = server_main.CACHE_COMPRESSION
+        return db_context
+
+    # The server's lifespan builds its DatabaseContext through this function when the first session starts
+    server_main.create_database_context = create_database_context
+    server_main.mcp.run()
+
+if __name__ == "__main__":
+    main()
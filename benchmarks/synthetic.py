@@ -0,0 +1,169 @@
+"""
+Deterministic synthetic schemas shaped like the test database in test/db/init, at any size.
+
+The test database has a core of hub tables (CUSTOMERS, PRODUCTS, EMPLOYEES, ...) and large
+families of numbered tables that each reference one hub, such as SALES_DATA_1..199 referencing
+CUSTOMERS. generate_schema() keeps that shape and scales the families, so at 200,000 tables
+each hub has tens of thousands of incoming foreign keys. The same seed always yields the same schema.
+
+PL/SQL objects are taken from the analysis scripts in test/db/queries when they are available.
+"""
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+QUERIES_DIR = Path(__file__).resolve().parent.parent / "test" / "db" / "queries"
+
+# Core tables as (name, key column, [(column, referenced table)])
+CORE_TABLES: List[Tuple[str, str, List[Tuple[str, str]]]] = [
+    ("DEPARTMENTS", "DEPT_ID", []),
+    ("JOB_TITLES", "TITLE_ID", []),
+    ("EMPLOYEE_GRADES", "GRADE_ID", []),
+    ("EMPLOYEES", "EMPLOYEE_ID", [("DEPT_ID", "DEPARTMENTS"), ("TITLE_ID", "JOB_TITLES"),
+                                  ("GRADE_ID", "EMPLOYEE_GRADES"), ("MANAGER_ID", "EMPLOYEES")]),
+    ("EMPLOYEE_HISTORY", "HISTORY_ID", [("EMPLOYEE_ID", "EMPLOYEES")]),
+    ("CUSTOMERS", "CUSTOMER_ID", []),
+    ("PRODUCT_CATEGORIES", "CATEGORY_ID", [("PARENT_CATEGORY_ID", "PRODUCT_CATEGORIES")]),
+    ("PRODUCTS", "PRODUCT_ID", [("CATEGORY_ID", "PRODUCT_CATEGORIES")]),
+    ("PRODUCT_PRICES", "PRICE_ID", [("PRODUCT_ID", "PRODUCTS")]),
+    ("ORDER_STATUS", "STATUS_ID", []),
+    ("ORDERS", "ORDER_ID", [("CUSTOMER_ID", "CUSTOMERS"), ("EMPLOYEE_ID", "EMPLOYEES"), ("STATUS_ID", "ORDER_STATUS")]),
+    ("ORDER_ITEMS", "ORDER_ITEM_ID", [("ORDER_ID", "ORDERS"), ("PRODUCT_ID", "PRODUCTS")]),
+    ("ACCOUNTS", "ACCOUNT_ID", []),
+    ("TRANSACTIONS", "TRANSACTION_ID", [("ACCOUNT_ID", "ACCOUNTS"), ("ORDER_ID", "ORDERS")]),
+    ("FACILITIES", "FACILITY_ID", []),
+    ("TICKETS", "TICKET_ID", [("CUSTOMER_ID", "CUSTOMERS")]),
+]
+
+# Numbered table families as (name pattern, referenced hub, foreign key column, weight); the weights
+# are the family sizes in test/db/init
+FAMILIES: List[Tuple[str, str, str, int]] = [
+    ("HR_ATTRIBUTE_{i}", "EMPLOYEES", "EMPLOYEE_ID", 48),
+    ("SALES_DATA_{i}", "CUSTOMERS", "CUSTOMER_ID", 199),
+    ("INVENTORY_DATA_{i}", "PRODUCTS", "PRODUCT_ID", 199),
+    ("FINANCE_DATA_{i}", "ACCOUNTS", "ACCOUNT_ID", 199),
+    ("OPERATIONS_DATA_{i}", "FACILITIES", "FACILITY_ID", 199),
+    ("SERVICE_DATA_{i}", "TICKETS", "TICKET_ID", 149),
+]
+
+# Extra columns added at random to family tables, as (name, column dict without name)
+EXTRA_COLUMNS: List[Tuple[str, Dict[str, Any]]] = [
+    ("STATUS", {"type": "VARCHAR2", "char_length": 20, "char_semantics": False}),
+    ("QUANTITY", {"type": "NUMBER", "precision": 10, "scale": 0}),
+    ("UNIT_PRICE", {"type": "NUMBER", "precision": 12, "scale": 2}),
+    ("REGION_CODE", {"type": "CHAR", "char_length": 3, "char_semantics": False}),
+    ("NOTES", {"type": "VARCHAR2", "char_length": 4000, "char_semantics": True}),
+    ("UPDATED_AT", {"type": "TIMESTAMP(6)", "scale": 6}),
+    ("CREATED_BY", {"type": "VARCHAR2", "char_length": 30, "char_semantics": False}),
+    ("PAYLOAD", {"type": "CLOB"}),
+    ("EXTERNAL_REF", {"type": "RAW", "data_length": 16}),
+    ("DISCOUNT_PCT", {"type": "NUMBER", "precision": 5, "scale": 2}),
+]
+
+@dataclass
+class SyntheticTable:
+    name: str
+    columns: List[Dict[str, Any]]
+    # (local column, referenced table, referenced column)
+    foreign_keys: List[Tuple[str, str, str]]
+    num_rows: int
+
+@dataclass
+class SyntheticSchema:
+    tables: Dict[str, SyntheticTable]
+    # Referenced table -> [(referencing table, referencing column, referenced column)]
+    incoming: Dict[str, List[Tuple[str, str, str]]] = field(default_factory=dict)
+    # (object type, object name) -> source lines
+    sources: Dict[Tuple[str, str], List[str]] = field(default_factory=dict)
+    seed: int = 42
+
+    def add(self, table: SyntheticTable) -> None:
+        self.tables[table.name] = table
+        for column, referenced, referenced_column in table.foreign_keys:
+            self.incoming.setdefault(referenced, []).append((table.name, column, referenced_column))
+
+    def add_referencing_table(self, name: str, hub: str = "CUSTOMERS") -> None:
+        """Add a small table referencing hub, for names a workload uses that the generated schema lacks"""
+        hub_key = self.key_column(hub)
+        columns = [_column("ID", nullable=False, precision=10, scale=0), _column(hub_key, precision=10, scale=0),
+                   _column("AMOUNT", precision=10, scale=2)]
+        self.add(SyntheticTable(name, columns, [(hub_key, hub, hub_key)], num_rows=1000))
+
+    def key_column(self, table_name: str) -> str:
+        return self.tables[table_name].columns[0]["name"]
+
+    def relationships(self, table_name: str) -> Dict[str, List[Dict[str, str]]]:
+        """Relationships of a table in the format returned by DatabaseConnector.load_table_details"""
+        result: Dict[str, List[Dict[str, str]]] = {}
+        for column, referenced, referenced_column in self.tables[table_name].foreign_keys:
+            result.setdefault(referenced, []).append(
+                {"local_column": column, "foreign_column": referenced_column, "direction": "OUTGOING"})
+        for referencing, column, referenced_column in self.incoming.get(table_name, []):
+            result.setdefault(referencing, []).append(
+                {"local_column": referenced_column, "foreign_column": column, "direction": "INCOMING"})
+        return result
+
+def _column(name: str, nullable: bool = True, **details: Any) -> Dict[str, Any]:
+    return {"name": name, "type": details.pop("type", "NUMBER"), "nullable": nullable, **details}
+
+def load_query_sources(queries_dir: Path = QUERIES_DIR) -> Dict[Tuple[str, str], List[str]]:
+    """PL/SQL units created by the analysis scripts, keyed by (object type, object name)"""
+    header = re.compile(r"^CREATE\s+OR\s+REPLACE\s+(PACKAGE\s+BODY|PACKAGE|PROCEDURE|FUNCTION|TRIGGER)\s+(\w+)",
+                        re.IGNORECASE)
+    sources: Dict[Tuple[str, str], List[str]] = {}
+    if not queries_dir.is_dir():
+        return sources
+    for path in sorted(queries_dir.glob("*.sql")):
+        current: Optional[List[str]] = None
+        for line in path.read_text(encoding="utf-8").splitlines():
+            match = header.match(line)
+            if match:
+                object_type = " ".join(match.group(1).upper().split())
+                current = sources.setdefault((object_type, match.group(2).upper()), [])
+            if current is None:
+                continue
+            if line.strip() == "/":
+                current = None
+                continue
+            current.append(line)
+    return sources
+
+def generate_schema(table_count: int, seed: int = 42) -> SyntheticSchema:
+    """Build a schema of about table_count tables (at least the core tables), deterministically from seed"""
+    rng = random.Random(seed)
+    schema = SyntheticSchema(tables={}, seed=seed)
+    for name, key, references in CORE_TABLES:
+        columns = [_column(key, nullable=False, precision=10, scale=0)]
+        columns += [_column(column, precision=10, scale=0) for column, _ in references]
+        columns += [_column("NAME", nullable=False, type="VARCHAR2", char_length=100, char_semantics=False),
+                    _column("CREATED_AT", type="TIMESTAMP(6)", scale=6, default="CURRENT_TIMESTAMP")]
+        foreign_keys = [(column, referenced, next(k for n, k, _ in CORE_TABLES if n == referenced))
+                        for column, referenced in references]
+        schema.add(SyntheticTable(name, columns, foreign_keys, num_rows=rng.randint(100, 1_000_000)))
+
+    total_weight = sum(weight for _, _, _, weight in FAMILIES)
+    remaining = max(0, table_count - len(CORE_TABLES))
+    for pattern, hub, fk_column, weight in FAMILIES:
+        hub_key = schema.key_column(hub)
+        for i in range(1, remaining * weight // total_weight + 1):
+            columns = [
+                _column("ID", nullable=False, precision=10, scale=0),
+                _column(fk_column, precision=10, scale=0),
+                _column("TRANSACTION_DATE", type="TIMESTAMP(6)", scale=6, default="CURRENT_TIMESTAMP"),
+                _column("AMOUNT", precision=10, scale=2),
+            ]
+            for extra_name, extra in rng.sample(EXTRA_COLUMNS, rng.randint(0, 6)):
+                columns.append(_column(extra_name, **dict(extra)))
+            foreign_keys = [(fk_column, hub, hub_key)]
+            # Some tables also reference a second hub, as the order tables do
+            if rng.random() < 0.1:
+                other = rng.choice([h for _, h, _, _ in FAMILIES if h != hub])
+                other_key = schema.key_column(other)
+                columns.append(_column(other_key, precision=10, scale=0))
+                foreign_keys.append((other_key, other, other_key))
+            schema.add(SyntheticTable(pattern.format(i=i), columns, foreign_keys, num_rows=rng.randint(0, 5_000_000)))
+
+    schema.sources = load_query_sources()
+    return schema
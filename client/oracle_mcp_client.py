@@ -40,8 +40,6 @@ class MCPStdioClient:
             cwd=server_dir  
         )
         
-        await asyncio.sleep(3)
-        
         if self.process.returncode is not None:
             stderr_output = await self.process.stderr.read()
             raise RuntimeError(f"Server process exited immediately with code {self.process.returncode}. stderr: {stderr_output.decode('utf-8')}")
@@ -63,11 +61,9 @@ class MCPStdioClient:
         
         print(f"Initialize result received")
         
+        # The server answers as soon as the session is initialized; its schema cache loads in the background
         await self.send_notification("notifications/initialized")
         
-        print("Waiting for server to complete database initialization...")
-        await asyncio.sleep(5)
-        
         print("📋 Loading available tools...")
         tools_result = await self.list_tools()
         self.tools = tools_result.get("tools", [])
@@ -1,25 +1,97 @@
+import asyncio
+import sys
+import time
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 from .database import DatabaseConnector
 from .schema.manager import SchemaManager
 from .models import TableInfo
+from .source import select_source_lines
+from .sql.tokenizer import fingerprint
+from .sql.parser import parse
+from .sql.analyzer import analyze_statement
+from .sql.validator import validate_statement, is_dictionary_view
+from .tracing import trace_methods
 
-
+@trace_methods("context")
 class DatabaseContext:
-    def __init__(self, connection_string: str, cache_path: Path, target_schema: Optional[str] = None,  use_thick_mode: bool = False, lib_dir: Optional[str] = None):
-        self.db_connector = DatabaseConnector(connection_string, target_schema, use_thick_mode, lib_dir)
+    def __init__(self, connection_string: str, cache_path: Path, target_schema: Optional[str] = None,  use_thick_mode: bool = False, lib_dir: Optional[str] = None,
+                 connector: Optional[DatabaseConnector] = None):
+        # A pre-built connector, such as the in-process fake used by the benchmarks, replaces the Oracle one
+        self.db_connector = connector or DatabaseConnector(connection_string, target_schema, use_thick_mode, lib_dir)
         self.schema_manager = SchemaManager(self.db_connector, cache_path)
         # Set the schema manager reference in the connector
         self.db_connector.set_schema_manager(self.schema_manager)
+        # Tool call and database round trip metrics, fed by the connector
+        self.metrics = self.db_connector.metrics
+        # Initialization progress: not_started, loading, ready or failed
+        self.state = "not_started"
+        self.state_error: Optional[str] = None
+        self.init_started: Optional[float] = None
+        self.init_seconds: Optional[float] = None
+        self._init_task: Optional[asyncio.Task] = None
         
     async def initialize(self) -> None:
         """Initialize the database context, connection pool, and schema cache"""
-        await self.db_connector.initialize_pool()
-        await self.schema_manager.initialize()
+        if self.state != "loading":
+            self._start_timing()
+        try:
+            # The connection pool is created within the shared cache load, so lookups arriving while the
+            # pool is set up see the cache as loading and use direct queries instead of waiting for it
+            self.schema_manager.start_loading(self.db_connector.initialize_pool)
+            await self.schema_manager.initialize()
+        except Exception as e:
+            self.state, self.state_error = "failed", str(e)
+            raise
+        finally:
+            self.init_seconds = time.time() - self.init_started
+        self.state = "ready"
+    
+    def start_initialization(self) -> None:
+        """
+        Initialize in a background task, so requests can be answered while the schema cache loads:
+        table lookups and searches fall through to direct queries until it is ready.
+        """
+        self._start_timing()
+        # Mark the cache as loading now rather than when the task first runs
+        self.schema_manager.start_loading(self.db_connector.initialize_pool)
+        self._init_task = asyncio.create_task(self.initialize())
+        self._init_task.add_done_callback(self._initialization_done)
+    
+    def _start_timing(self) -> None:
+        self.state, self.state_error = "loading", None
+        self.init_started, self.init_seconds = time.time(), None
+    
+    def _initialization_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            print(f"Background initialization failed, retrying on first use: {task.exception()}", file=sys.stderr)
+        else:
+            print(f"Schema cache ready after {self.init_seconds:.1f}s", file=sys.stderr)
+    
+    def readiness(self) -> Dict[str, Any]:
+        """Initialization state, for clients deciding whether results may come from direct queries"""
+        cache = self.schema_manager.cache
+        if self.init_seconds is not None:
+            elapsed = self.init_seconds
+        else:
+            elapsed = time.time() - self.init_started if self.init_started is not None else None
+        # A failed background load is retried by the first request needing the cache
+        recovered = self.state == "failed" and cache is not None
+        return {
+            'state': "ready" if recovered else self.state,
+            'error': None if recovered else self.state_error,
+            'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'tables_indexed': len(cache.all_table_names) if cache else None
+        }
         
     async def close(self) -> None:
         """Close the database context and connection pool"""
+        if self._init_task is not None and not self._init_task.done():
+            self._init_task.cancel()
+        self.schema_manager.cancel_loading()
         await self.db_connector.close_pool()
         
     async def get_database_info(self):
@@ -30,6 +102,10 @@ class DatabaseContext:
         """Get schema information for a specific table"""
         return await self.schema_manager.get_schema_info(table_name)
     
+    async def get_table_statistics(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Get optimizer statistics for a table and its columns, from the bulk-loaded statistics cache"""
+        return await self.schema_manager.get_table_statistics(table_name)
+    
     async def search_tables(self, search_term: str, limit: int = 20) -> List[str]:
         """Search for table names matching the search term"""
         return await self.schema_manager.search_tables(search_term, limit)
@@ -37,41 +113,74 @@ class DatabaseContext:
     async def rebuild_cache(self) -> None:
         """Force a rebuild of the schema cache"""
         self.schema_manager.cache = await self.schema_manager.load_or_build_cache(force_rebuild=True)
+        self.schema_manager.invalidate_schema_state()
         
     async def search_columns(self, search_term: str, limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
         """Search for columns matching the given pattern across all tables"""
         return await self.schema_manager.search_columns(search_term, limit)
         
     async def get_pl_sql_objects(self, object_type: str, name_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get information about PL/SQL objects of the specified type"""
-        # First check schema manager cache
-        cache_key = f"{object_type}_{name_pattern or 'all'}"
-        if self.schema_manager.is_cache_valid('plsql', cache_key):
-            self.schema_manager.cache_stats['hits'] += 1
-            return self.schema_manager.object_cache['plsql'][cache_key]['data']
+        """Get information about PL/SQL objects of the specified type, matched locally against the object catalog"""
+        catalog = await self.schema_manager.get_object_catalog()
+        return catalog.find(object_type, name_pattern)
         
-        # If not in cache or expired, get from database
-        self.schema_manager.cache_stats['misses'] += 1
-        result = await self.db_connector.get_pl_sql_objects(object_type, name_pattern)
+    async def get_object_source(self, object_type: str, object_name: str) -> str:
+        """Get the source code for a PL/SQL object, served from the source cache unless it was recompiled"""
+        try:
+            return await self._load_object_source(object_type, object_name)
+        except Exception as e:
+            print(f"Error getting object source: {str(e)}", file=sys.stderr)
+            return f"Error retrieving source: {str(e)}"
+    
+    async def _load_object_source(self, object_type: str, object_name: str) -> str:
+        """Load a PL/SQL source through the source cache, raising database errors to the caller"""
+        cache_key = f"{object_type}:{object_name}"
         
-        # Update cache
-        self.schema_manager.update_cache('plsql', cache_key, result)
-        await self.schema_manager.save_cache()
-        return result
+        # Recently validated copies are served without touching the database
+        if self.schema_manager.is_cache_valid('source', cache_key):
+            source = self.schema_manager.get_cached_source(cache_key)
+            if source is not None:
+                self.schema_manager.record_cache_access('source', True)
+                return source
         
-    async def get_object_source(self, object_type: str, object_name: str) -> str:
-        """Get the source code for a PL/SQL object"""
-        return await self.db_connector.get_object_source(object_type, object_name)
+        # Otherwise a single LAST_DDL_TIME lookup decides whether the cached copy is still current
+        last_ddl_time = await self.db_connector.get_object_last_ddl_time(object_type, object_name)
+        if last_ddl_time is not None:
+            source = self.schema_manager.get_cached_source(cache_key, last_ddl_time)
+            if source is not None:
+                self.schema_manager.record_cache_access('source', True)
+                self.schema_manager.update_cache('source', cache_key, {'last_ddl_time': last_ddl_time})
+                return source
+        
+        self.schema_manager.record_cache_access('source', False)
+        source = await self.db_connector.fetch_object_source(object_type, object_name)
+        
+        if last_ddl_time is not None and source:
+            self.schema_manager.store_source(cache_key, last_ddl_time, source)
+            await self.schema_manager.save_cache()
+        return source
+
+    async def get_object_source_lines(self, object_type: str, object_name: str, offset: int = 0,
+                                      max_lines: Optional[int] = None,
+                                      subprogram: Optional[str] = None) -> Dict[str, Any]:
+        """Get part of a PL/SQL object's source by line offset/count, optionally within one subprogram"""
+        source = await self._load_object_source(object_type, object_name)
+        return select_source_lines(source, offset, max_lines, subprogram)
+        
+    async def search_source(self, pattern: str, object_type: Optional[str] = None, regex: bool = False,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        """Search the text of all PL/SQL source in the schema"""
+        return await self.schema_manager.search_source(pattern, object_type, regex, limit)
         
     async def get_table_constraints(self, table_name: str) -> List[Dict[str, Any]]:
         """Get constraints for a specific table"""
         # Check cache first
         if self.schema_manager.is_cache_valid('constraints', table_name):
-            self.schema_manager.cache_stats['hits'] += 1
+            self.schema_manager.record_cache_access('constraints', True)
             return self.schema_manager.object_cache['constraints'][table_name]['data']
         
         # If not in cache or expired, get from database
-        self.schema_manager.cache_stats['misses'] += 1
+        self.schema_manager.record_cache_access('constraints', False)
         result = await self.db_connector.get_table_constraints(table_name)
         
         # Update cache
@@ -83,11 +192,11 @@ class DatabaseContext:
         """Get indexes for a specific table"""
         # Check cache first
         if self.schema_manager.is_cache_valid('indexes', table_name):
-            self.schema_manager.cache_stats['hits'] += 1
+            self.schema_manager.record_cache_access('indexes', True)
             return self.schema_manager.object_cache['indexes'][table_name]['data']
         
         # If not in cache or expired, get from database
-        self.schema_manager.cache_stats['misses'] += 1
+        self.schema_manager.record_cache_access('indexes', False)
         result = await self.db_connector.get_table_indexes(table_name)
         
         # Update cache
@@ -95,20 +204,20 @@ class DatabaseContext:
         await self.schema_manager.save_cache()
         return result
         
-    async def get_dependent_objects(self, object_name: str) -> List[Dict[str, Any]]:
-        """Get objects that depend on the specified object"""
-        return await self.db_connector.get_dependent_objects(object_name)
+    async def get_dependent_objects(self, object_name: str, depth: int = 1) -> List[Dict[str, Any]]:
+        """Get objects that depend on the specified object, transitively up to depth levels (0 = all levels)"""
+        return await self.schema_manager.get_dependent_objects(object_name, depth)
         
     async def get_user_defined_types(self, type_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get information about user-defined types"""
         # Check cache first
         cache_key = type_pattern or 'all'
         if self.schema_manager.is_cache_valid('types', cache_key):
-            self.schema_manager.cache_stats['hits'] += 1
+            self.schema_manager.record_cache_access('types', True)
             return self.schema_manager.object_cache['types'][cache_key]['data']
         
         # If not in cache or expired, get from database
-        self.schema_manager.cache_stats['misses'] += 1
+        self.schema_manager.record_cache_access('types', False)
         result = await self.db_connector.get_user_defined_types(type_pattern)
         
         # Update cache
@@ -116,16 +225,38 @@ class DatabaseContext:
         await self.schema_manager.save_cache()
         return result
 
+    async def sample_table(self, table_name: str, rows: int = 10, columns: Optional[List[str]] = None,
+                           max_bytes: int = 16384) -> Dict[str, Any]:
+        """
+        Get a bounded sample of a table's rows. The table and columns are checked against the schema cache
+        first, so only known identifiers ever reach the generated SQL.
+        """
+        table_info = await self.get_schema_info(table_name)
+        if table_info is None:
+            raise ValueError(f"Table '{table_name}' not found in the schema")
+        
+        if columns:
+            by_name = {column['name']: column for column in table_info.columns}
+            wanted = [name.strip().upper() for name in columns]
+            unknown = [name for name in wanted if name not in by_name]
+            if unknown:
+                raise ValueError(f"Unknown column(s) in {table_info.table_name}: {', '.join(unknown)}")
+            selected = [by_name[name] for name in wanted]
+        else:
+            selected = table_info.columns
+        
+        return await self.db_connector.sample_table(table_info.table_name, selected, rows, max_bytes)
+
     async def get_related_tables(self, table_name: str) -> Dict[str, List[str]]:
         """Get all tables that are related to the specified table through foreign keys."""
         # Check cache first
         cache_key = f"related_{table_name}"
         if self.schema_manager.is_cache_valid('related_tables', cache_key):
-            self.schema_manager.cache_stats['hits'] += 1
+            self.schema_manager.record_cache_access('related_tables', True)
             return self.schema_manager.object_cache['related_tables'][cache_key]['data']
         
         # If not in cache or expired, get from database
-        self.schema_manager.cache_stats['misses'] += 1
+        self.schema_manager.record_cache_access('related_tables', False)
         result = await self.db_connector.get_related_tables(table_name)
         
         # Update cache
@@ -134,5 +265,87 @@ class DatabaseContext:
         return result
 
     async def explain_query_plan(self, query: str) -> Dict[str, Any]:
-        """Get execution plan for an SQL query with optimization suggestions"""
-        return await self.db_connector.explain_query_plan(query)
\ No newline at end of file
+        """
+        Get execution plan for an SQL query with optimization suggestions.
+        Plans are cached by the query's normalized fingerprint, so re-explaining the same statement with
+        different formatting or literals is served from memory until the schema's DDL or statistics change.
+        The statement a plan was explained for is kept with it as 'explained_sql', as its predicates and
+        cardinality estimates reflect that statement's literals.
+        """
+        key = await self.schema_manager.plan_cache_key(fingerprint(query))
+        plan = self.schema_manager.get_cached_plan(key)
+        if plan is not None:
+            self.schema_manager.record_cache_access('plans', True)
+            return {**plan, 'cached': True}
+        
+        self.schema_manager.record_cache_access('plans', False)
+        plan = await self.db_connector.explain_query_plan(query)
+        if 'error' not in plan:
+            plan['explained_sql'] = query
+            plan['optimization_suggestions'] = await self.analyze_query(query)
+            self.schema_manager.store_plan(key, plan)
+        return plan
+
+    async def analyze_query(self, query: str) -> List[str]:
+        """
+        Get optimization suggestions for a query, checked against the cached columns and indexes of the tables
+        it references. Tables in other schemas, views and unknown names are only checked structurally.
+        """
+        statement = parse(query)
+        tables: Dict[str, TableInfo] = {}
+        indexes: Dict[str, List[Dict[str, Any]]] = {}
+        schema = None
+        for table in statement.tables:
+            if table.name in tables:
+                continue
+            if table.schema is not None:
+                schema = schema or await self.db_connector.get_effective_schema()
+                if table.schema != schema:
+                    continue
+            try:
+                table_info = await self.get_schema_info(table.name)
+                if table_info is None:
+                    continue
+                tables[table.name] = table_info
+                indexes[table.name] = await self.get_table_indexes(table.name)
+            except Exception as e:
+                print(f"Error loading metadata of {table.name} for query analysis: {str(e)}", file=sys.stderr)
+        return analyze_statement(statement, tables, indexes)
+
+    async def validate_sql(self, sql: str) -> Dict[str, Any]:
+        """
+        Check that every table and column a statement references exists, using the schema cache.
+        Names that are not tables are looked up in the cached object catalog, so views and synonyms are
+        accepted without their columns being checked.
+        """
+        statement = parse(sql)
+        # While the cache loads, referenced tables are looked up directly and no names are suggested
+        known_tables = None if self.schema_manager.cache_loading else \
+            (await self.schema_manager.ensure_cache()).all_table_names
+        
+        tables: Dict[str, TableInfo] = {}
+        unchecked = set()
+        missing = set()
+        schema = None
+        for table in statement.tables:
+            if table.name in tables or table.name in unchecked or is_dictionary_view(table.name):
+                continue
+            if table.schema is not None:
+                schema = schema or await self.db_connector.get_effective_schema()
+                if table.schema != schema:
+                    unchecked.add(table.name)
+                    continue
+            table_info = await self.get_schema_info(table.name) \
+                if known_tables is None or table.name in known_tables else None
+            if table_info is not None:
+                tables[table.name] = table_info
+            else:
+                missing.add(table.name)
+        
+        if missing:
+            catalog = await self.schema_manager.get_object_catalog()
+            for object_type in ('VIEW', 'SYNONYM', 'MATERIALIZED VIEW'):
+                unchecked.update(name for name in missing
+                                 if any(row['name'] == name for row in catalog.find(object_type, name)))
+        
+        return validate_statement(statement, tables, known_tables or tables.keys(), unchecked)
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Compact in-memory catalog of every object in a schema, queried with LIKE patterns locally."""
+import bisect
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (object_name, status, created, last_ddl_time) with timestamps already formatted as strings
+CatalogRow = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+def like_to_regex(pattern: str) -> "re.Pattern[str]":
+    """Translate a SQL LIKE pattern (% and _ wildcards, no escape character) into a compiled regex"""
+    parts = []
+    for char in pattern:
+        if char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL)
+
+def like_prefix(pattern: str) -> str:
+    """The literal prefix of a LIKE pattern, before its first wildcard"""
+    match = re.search(r'[%_]', pattern)
+    return pattern[:match.start()] if match else pattern
+
+class ObjectCatalog:
+    """
+    Snapshot of all_objects for one owner, indexed by object type with names kept sorted.
+
+    Name patterns are matched locally: the literal prefix of the pattern narrows the search to a
+    contiguous slice of the sorted names by binary search, and only that slice is regex-matched.
+    """
+
+    def __init__(self, owner: str, rows: Iterable[Tuple[str, str, Optional[str], Optional[str], Optional[str]]],
+                 signature: Optional[str] = None) -> None:
+        self.owner = owner
+        self.signature = signature
+        grouped: Dict[str, List[CatalogRow]] = {}
+        for object_type, object_name, status, created, last_ddl_time in rows:
+            grouped.setdefault(object_type, []).append((object_name, status, created, last_ddl_time))
+        # object_type -> (sorted names, rows in the same order)
+        self.by_type: Dict[str, Tuple[List[str], List[CatalogRow]]] = {}
+        for object_type, type_rows in grouped.items():
+            type_rows.sort(key=lambda row: row[0])
+            self.by_type[object_type] = ([row[0] for row in type_rows], type_rows)
+
+    def __len__(self) -> int:
+        return sum(len(names) for names, _ in self.by_type.values())
+
+    def find(self, object_type: str, name_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find objects of a type whose names match a LIKE pattern.
+
+        Args:
+            object_type: Object type, e.g. PROCEDURE or PACKAGE BODY.
+            name_pattern: Case-insensitive LIKE pattern; None or empty returns every object of the type.
+
+        Returns:
+            Object info dicts with name, type, status, owner and, when known, created/last_modified, by name.
+        """
+        names, rows = self.by_type.get(object_type, ([], []))
+        start, end = 0, len(rows)
+
+        if name_pattern:
+            pattern = name_pattern.upper()
+            prefix = like_prefix(pattern)
+            if prefix:
+                start = bisect.bisect_left(names, prefix)
+                # Every name starting with the prefix sorts below prefix + the highest code point
+                end = bisect.bisect_left(names, prefix + '\U0010ffff', start)
+            if prefix != pattern:
+                matcher = like_to_regex(pattern).fullmatch
+                selected = [row for row in rows[start:end] if matcher(row[0])]
+            else:
+                selected = [row for row in rows[start:end] if row[0] == pattern]
+        else:
+            selected = rows[start:end]
+
+        result = []
+        for name, status, created, last_modified in selected:
+            obj_info = {
+                "name": name,
+                "type": object_type,
+                "status": status,
+                "owner": self.owner
+            }
+            if created:
+                obj_info["created"] = created
+            if last_modified:
+                obj_info["last_modified"] = last_modified
+            result.append(obj_info)
+        return result
@@ -1,36 +1,98 @@
 import sys
-import oracledb
 import time
 import asyncio
-from typing import Dict, List, Set, Optional, Any
+import uuid
+from typing import Dict, List, Set, Optional, Any, Tuple
 from pathlib import Path
 from .models import SchemaManager
+from .metrics import MetricsRegistry
+from .tracing import MAX_STATEMENT_CHARS, describe_arguments, oracle_sql_id, trace_methods, tracer
+from .sql.parser import parse
+from .sql.analyzer import analyze_statement
 
+# Rows fetched per round trip when streaming large PL/SQL sources
+SOURCE_FETCH_ARRAYSIZE = 1000
+# LOB chunks read per call when reading large CLOBs such as generated DDL
+LOB_CHUNKS_PER_READ = 16
+# Object types whose source is stored in all_source
+SOURCE_OBJECT_TYPES = ('PROCEDURE', 'FUNCTION', 'PACKAGE', 'PACKAGE BODY', 'TRIGGER', 'TYPE', 'TYPE BODY', 'LIBRARY')
+# Rows fetched per round trip when streaming dictionary views for the whole schema
+DICTIONARY_FETCH_ARRAYSIZE = 1000
+# Maximum number of names bound into a single IN list
+NAME_BIND_BATCH_SIZE = 500
+# Limits for sampling table data: rows, output bytes, characters per value and database call time
+MAX_SAMPLE_ROWS = 100
+MAX_SAMPLE_BYTES = 65536
+MAX_SAMPLE_VALUE_CHARS = 200
+SAMPLE_CALL_TIMEOUT_MS = 10000
+# Expected rows per requested row when choosing a SAMPLE BLOCK percentage, to allow for uneven blocks
+SAMPLE_OVERSAMPLING = 4
+
+# Select list for column details, shared by the lazy per-table and the bulk column loaders. all_tab_cols is
+# used over all_tab_columns for the virtual column flag; {identity} is identity_column on 12c and later.
+COLUMN_DETAIL_SELECT = """
+    atc.column_name, atc.data_type, atc.nullable, atc.data_length, atc.char_length, atc.char_used,
+    atc.data_precision, atc.data_scale, atc.data_default, atc.virtual_column, {identity}, acc.comments
+"""
+COLUMN_DETAIL_FROM = """
+    FROM all_tab_cols atc
+    LEFT JOIN all_col_comments acc ON acc.owner = atc.owner
+                                  AND acc.table_name = atc.table_name
+                                  AND acc.column_name = atc.column_name
+"""
+
+# python-oracledb, imported by load_driver when the first connection pool is created rather than at
+# import time, so the server can answer the MCP handshake without waiting for the driver
+oracledb: Any = None
+
+def load_driver() -> Any:
+    """Import python-oracledb on first use and return it"""
+    global oracledb
+    if oracledb is None:
+        import oracledb as driver
+        oracledb = driver
+    return oracledb
+
+@trace_methods("connector")
 class DatabaseConnector:
     def __init__(self, connection_string: str, target_schema: Optional[str] = None, use_thick_mode: bool = False, lib_dir: Optional[str] = None):
         self.connection_string = connection_string
         self.schema_manager: Optional[SchemaManager] = None  # Will be set by DatabaseContext
         self.target_schema: Optional[str] = target_schema
         self.thick_mode = use_thick_mode
+        self.lib_dir = lib_dir
+        # The Oracle Client is initialized with the first pool, in thick mode only
+        self._client_initialized = False
+        # Whether the dictionary has identity_column (12c+); None until the first column query finds out
+        self._has_identity_columns: Optional[bool] = None
+        # Round trips, rows and pool waits, attributed to the tool call being served
+        self.metrics = MetricsRegistry()
         self._pool = None
         self._pool_lock = asyncio.Lock()
-        
-        if self.thick_mode:
-            try:
-                if lib_dir:
-                    oracledb.init_oracle_client(lib_dir=lib_dir)
-                else:
-                    oracledb.init_oracle_client()
-                print("Oracle Client initialized in thick mode", file=sys.stderr)
-            except Exception as e:
-                print(f"Warning: Could not initialize Oracle Client: {e}", file=sys.stderr)
-                print("Falling back to thin mode", file=sys.stderr)
-                self.thick_mode = False
+
+    def _load_client(self) -> None:
+        """Import the driver and, in thick mode, initialize the Oracle Client libraries once"""
+        load_driver()
+        if not self.thick_mode or self._client_initialized:
+            return
+        self._client_initialized = True
+        try:
+            if self.lib_dir:
+                oracledb.init_oracle_client(lib_dir=self.lib_dir)
+            else:
+                oracledb.init_oracle_client()
+            print("Oracle Client initialized in thick mode", file=sys.stderr)
+        except Exception as e:
+            print(f"Warning: Could not initialize Oracle Client: {e}", file=sys.stderr)
+            print("Falling back to thin mode", file=sys.stderr)
+            self.thick_mode = False
 
     async def initialize_pool(self):
         """Initialize the connection pool"""
         async with self._pool_lock:
             if self._pool is None:
+                # Importing the driver and loading the Oracle Client block; keep them off the event loop
+                await asyncio.to_thread(self._load_client)
                 try:
                     if self.thick_mode:
                         self._pool = oracledb.create_pool(
@@ -58,6 +120,7 @@ class DatabaseConnector:
         if self._pool is None:
             await self.initialize_pool()
             
+        start = time.perf_counter()
         try:
             if self.thick_mode:
                 return self._pool.acquire()
@@ -66,6 +129,8 @@ class DatabaseConnector:
         except Exception as e:
             print(f"Error acquiring connection from pool: {e}", file=sys.stderr)
             raise
+        finally:
+            self.metrics.record_pool_wait((time.perf_counter() - start) * 1000)
 
     async def _close_connection(self, conn):
         """Return connection to the pool"""
@@ -77,6 +142,12 @@ class DatabaseConnector:
         except Exception as e:
             print(f"Error releasing connection to pool: {e}", file=sys.stderr)
 
+    def get_pool_stats(self) -> Optional[Dict[str, int]]:
+        """Connections in use, open and allowed in the pool, or None before the pool is created"""
+        if self._pool is None:
+            return None
+        return {'busy': self._pool.busy, 'opened': self._pool.opened, 'max': self._pool.max}
+
     async def close_pool(self):
         """Close the connection pool"""
         if self._pool:
@@ -94,21 +165,81 @@ class DatabaseConnector:
         """Set the schema manager reference"""
         self.schema_manager = schema_manager
 
+    @staticmethod
+    def _fetch_round_trips(cursor, rows: int) -> int:
+        """Round trips fetchall needed after execute, which already returned prefetchrows rows"""
+        prefetched = getattr(cursor, 'prefetchrows', 2) or 0
+        arraysize = getattr(cursor, 'arraysize', 100) or 1
+        return -(-max(0, rows - prefetched) // arraysize)
+
+    @staticmethod
+    def _statement_span(sql: str, params: Dict[str, Any]):
+        """Trace span for one SQL statement, identified by the SQL_ID Oracle gives its text"""
+        if not tracer.enabled:
+            return tracer.span("sql")
+        return tracer.span("sql", **{'db.system': 'oracle', 'db.sql_id': oracle_sql_id(sql),
+                                     'db.statement': " ".join(sql.split())[:MAX_STATEMENT_CHARS],
+                                     'db.binds': describe_arguments((), params)})
+
     async def _execute_cursor(self, cursor, sql: str, **params):
         """Helper method to execute cursor operations based on mode"""
-        if self.thick_mode:
-            cursor.execute(sql, **params)  # Synchronous execution
-            return cursor.fetchall()
-        else:
-            await cursor.execute(sql, **params)  # Async execution
-            return await cursor.fetchall()
+        with self._statement_span(sql, params) as span:
+            start = time.perf_counter()
+            if self.thick_mode:
+                cursor.execute(sql, **params)  # Synchronous execution
+                rows = cursor.fetchall()
+            else:
+                await cursor.execute(sql, **params)  # Async execution
+                rows = await cursor.fetchall()
+            round_trips = 1 + self._fetch_round_trips(cursor, len(rows))
+            self.metrics.record_statement((time.perf_counter() - start) * 1000, round_trips, len(rows))
+            if span is not None:
+                span.set('db.rows', len(rows))
+                span.set('db.round_trips', round_trips)
+        return rows
 
     async def _execute_cursor_no_fetch(self, cursor, sql: str, **params):
         """Helper method for cursor operations that don't need fetching (e.g. DELETE, UPDATE)"""
+        with self._statement_span(sql, params):
+            start = time.perf_counter()
+            if self.thick_mode:
+                cursor.execute(sql, **params)
+            else:
+                await cursor.execute(sql, **params)
+            self.metrics.record_statement((time.perf_counter() - start) * 1000, 1)
+
+    async def _fetch_many(self, cursor, size: int):
+        """Helper method to fetch the next batch of rows based on mode"""
+        if self.thick_mode:
+            rows = cursor.fetchmany(size)
+        else:
+            rows = await cursor.fetchmany(size)
+        self.metrics.record_round_trips(1, len(rows))
+        span = tracer.current()
+        if span is not None:
+            span.add('db.rows_fetched', len(rows))
+        return rows
+
+    async def _read_lob(self, lob) -> str:
+        """Read a LOB in multiples of its chunk size rather than in a single call"""
         if self.thick_mode:
-            cursor.execute(sql, **params)
+            size = lob.size()
+            amount = lob.getchunksize() * LOB_CHUNKS_PER_READ
         else:
-            await cursor.execute(sql, **params)
+            size = await lob.size()
+            amount = await lob.getchunksize() * LOB_CHUNKS_PER_READ
+        
+        self.metrics.record_round_trips(2)
+        parts = []
+        offset = 1  # LOB offsets are 1-based
+        while offset <= size:
+            part = lob.read(offset, amount) if self.thick_mode else await lob.read(offset, amount)
+            self.metrics.record_round_trips(1)
+            if not part:
+                break
+            parts.append(part)
+            offset += len(part)
+        return "".join(parts)
 
     async def _commit(self, conn):
         """Commit the current transaction"""
@@ -116,6 +247,15 @@ class DatabaseConnector:
             conn.commit()
         else:         
             await conn.commit()
+        self.metrics.record_round_trips(1)
+
+    async def _rollback(self, conn):
+        """Roll back the current transaction"""
+        if self.thick_mode:
+            conn.rollback()
+        else:
+            await conn.rollback()
+        self.metrics.record_round_trips(1)
 
 
     async def _get_effective_schema(self, conn) -> str:
@@ -185,6 +325,122 @@ class DatabaseConnector:
         finally:
             await self._close_connection(conn)
     
+    @staticmethod
+    def _column_info(row: Tuple) -> Dict[str, Any]:
+        """Build a column dict from a row selected with COLUMN_DETAIL_SELECT; optional details are only set if present"""
+        (column_name, data_type, nullable, data_length, char_length, char_used,
+         precision, scale, default, virtual, identity, comment) = row
+        column = {
+            "name": column_name,
+            "type": data_type,
+            "nullable": nullable == 'Y'
+        }
+        if char_length:
+            column["char_length"] = char_length
+            column["char_semantics"] = char_used == 'C'
+        elif data_length is not None and data_type in ('RAW', 'NCHAR', 'NVARCHAR2', 'CHAR', 'VARCHAR2', 'UROWID'):
+            column["data_length"] = data_length
+        if precision is not None:
+            column["precision"] = precision
+        if scale is not None:
+            column["scale"] = scale
+        if default is not None and default.strip() and default.strip().upper() != 'NULL':
+            column["default"] = default.strip()
+        if virtual == 'YES':
+            column["virtual"] = True
+        if identity == 'YES':
+            column["identity"] = True
+        if comment:
+            column["comment"] = comment
+        return column
+
+    async def _execute_column_query(self, cursor, where: str, order_by: str, extra_columns: str = "",
+                                    **params) -> List[Tuple]:
+        """
+        Run a column detail query, falling back to no identity information on databases before 12c.
+        extra_columns are appended after the COLUMN_DETAIL_SELECT columns.
+        """
+        while True:
+            identity = "atc.identity_column" if self._has_identity_columns is not False else "'NO'"
+            select = COLUMN_DETAIL_SELECT.format(identity=identity) + (f", {extra_columns}" if extra_columns else "")
+            sql = (f"SELECT {select} {COLUMN_DETAIL_FROM} "
+                   f"WHERE atc.hidden_column = 'NO' AND {where} ORDER BY {order_by}")
+            try:
+                rows = await self._execute_cursor(cursor, sql, **params)
+                self._has_identity_columns = self._has_identity_columns is not False
+                return rows
+            except oracledb.DatabaseError as e:
+                # ORA-00904: invalid identifier, raised for identity_column before 12c
+                if self._has_identity_columns is None and "ORA-00904" in str(e):
+                    self._has_identity_columns = False
+                    continue
+                raise
+
+    async def get_schema_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load optimizer statistics for every table in the schema with two streamed queries, one over
+        all_tables and one over all_tab_col_statistics.
+        
+        Returns:
+            Per table name: num_rows, blocks, avg_row_len and last_analyzed, plus 'columns' mapping each
+            analyzed column to its num_distinct, num_nulls, density, histogram, num_buckets and last_analyzed.
+            Dates are formatted as strings so the result can be cached as JSON.
+        """
+        fmt = lambda value: value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            cursor.arraysize = DICTIONARY_FETCH_ARRAYSIZE
+            cursor.prefetchrows = DICTIONARY_FETCH_ARRAYSIZE + 1
+            result: Dict[str, Dict[str, Any]] = {}
+            
+            await self._execute_cursor_no_fetch(cursor, """
+                SELECT table_name, num_rows, blocks, avg_row_len, last_analyzed
+                FROM all_tables
+                WHERE owner = :owner
+            """, owner=schema)
+            while True:
+                rows = await self._fetch_many(cursor, DICTIONARY_FETCH_ARRAYSIZE)
+                if not rows:
+                    break
+                for table_name, num_rows, blocks, avg_row_len, last_analyzed in rows:
+                    result[table_name] = {
+                        "num_rows": num_rows,
+                        "blocks": blocks,
+                        "avg_row_len": avg_row_len,
+                        "last_analyzed": fmt(last_analyzed),
+                        "columns": {}
+                    }
+            
+            await self._execute_cursor_no_fetch(cursor, """
+                SELECT table_name, column_name, num_distinct, num_nulls, density,
+                       histogram, num_buckets, last_analyzed
+                FROM all_tab_col_statistics
+                WHERE owner = :owner
+            """, owner=schema)
+            while True:
+                rows = await self._fetch_many(cursor, DICTIONARY_FETCH_ARRAYSIZE)
+                if not rows:
+                    break
+                for (table_name, column_name, num_distinct, num_nulls, density,
+                     histogram, num_buckets, last_analyzed) in rows:
+                    # Only keep column statistics of the tables listed above (not e.g. dropped tables in the recycle bin)
+                    if table_name not in result:
+                        continue
+                    result[table_name]["columns"][column_name] = {
+                        "num_distinct": num_distinct,
+                        "num_nulls": num_nulls,
+                        "density": density,
+                        "histogram": histogram if histogram and histogram != 'NONE' else None,
+                        "num_buckets": num_buckets,
+                        "last_analyzed": fmt(last_analyzed)
+                    }
+            
+            return result
+        finally:
+            await self._close_connection(conn)
+    
     async def load_table_details(self, table_name: str) -> Optional[Dict[str, Any]]:
         """Load detailed schema information for a specific table with optimized queries"""
         conn = await self.get_connection()
@@ -207,27 +463,16 @@ class DatabaseConnector:
             if table_exists[0][0] == 0:
                 return None
                 
-            # Get column information using result cache and index hints
-            columns = await self._execute_cursor(
+            # Get column information, with full type details and comments, in one query
+            columns = await self._execute_column_query(
                 cursor,
-                """
-                SELECT /*+ RESULT_CACHE INDEX(atc) */ 
-                    column_name, data_type, nullable
-                FROM all_tab_columns atc
-                WHERE owner = :owner AND table_name = :table_name
-                ORDER BY column_id
-                """,
+                "atc.owner = :owner AND atc.table_name = :table_name",
+                "atc.column_id",
                 owner=schema, 
                 table_name=table_name.upper()
             )
             
-            column_info = []
-            for column, data_type, nullable in columns:
-                column_info.append({
-                    "name": column,
-                    "type": data_type,
-                    "nullable": nullable == 'Y'
-                })
+            column_info = [self._column_info(row) for row in columns]
             
             # Get relationship information using optimized join order and result cache
             relationships = await self._execute_cursor(
@@ -336,8 +581,65 @@ class DatabaseConnector:
         finally:
             await self._close_connection(conn)
     
+    async def get_all_objects(self) -> List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]]:
+        """Get every object in the schema as (object_type, object_name, status, created, last_ddl_time) rows in one query"""
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            cursor.arraysize = SOURCE_FETCH_ARRAYSIZE
+            cursor.prefetchrows = SOURCE_FETCH_ARRAYSIZE + 1
+            
+            objects = await self._execute_cursor(cursor, """
+                SELECT object_type, object_name, status, created, last_ddl_time
+                FROM all_objects
+                WHERE owner = :owner
+            """, owner=schema)
+            
+            return [
+                (
+                    obj_type,
+                    name,
+                    status,
+                    created.strftime("%Y-%m-%d %H:%M:%S") if created else None,
+                    last_modified.strftime("%Y-%m-%d %H:%M:%S") if last_modified else None
+                )
+                for obj_type, name, status, created, last_modified in objects
+            ]
+        finally:
+            await self._close_connection(conn)
+    
+    async def get_object_last_ddl_time(self, object_type: str, object_name: str) -> Optional[str]:
+        """Get the LAST_DDL_TIME of an object, or None if it does not exist"""
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            
+            rows = await self._execute_cursor(cursor, """
+                SELECT last_ddl_time
+                FROM all_objects
+                WHERE owner = :owner
+                AND object_name = :object_name
+                AND object_type = :object_type
+            """, owner=schema, object_name=object_name, object_type=object_type)
+            
+            if not rows or not rows[0][0]:
+                return None
+            return rows[0][0].strftime("%Y-%m-%d %H:%M:%S")
+        finally:
+            await self._close_connection(conn)
+    
     async def get_object_source(self, object_type: str, object_name: str) -> str:
         """Get the source code for a PL/SQL object"""
+        try:
+            return await self.fetch_object_source(object_type, object_name)
+        except oracledb.Error as e:
+            print(f"Error getting object source: {str(e)}", file=sys.stderr)
+            return f"Error retrieving source: {str(e)}"
+    
+    async def fetch_object_source(self, object_type: str, object_name: str) -> str:
+        """Get the source code for a PL/SQL object, raising database errors to the caller"""
         conn = await self.get_connection()
         try:
             cursor = conn.cursor()
@@ -345,8 +647,11 @@ class DatabaseConnector:
             
             # Handle different object types accordingly
             if object_type in ('PACKAGE', 'PACKAGE BODY', 'TYPE', 'TYPE BODY'):
-                # For packages and types, we need to get the full source
-                source_lines = await self._execute_cursor(cursor, """
+                # For packages and types, stream the full source in large batches so big
+                # package bodies take few round trips and never sit in memory as one row list
+                cursor.arraysize = SOURCE_FETCH_ARRAYSIZE
+                cursor.prefetchrows = SOURCE_FETCH_ARRAYSIZE + 1
+                await self._execute_cursor_no_fetch(cursor, """
                     SELECT text
                     FROM all_source
                     WHERE owner = :owner 
@@ -355,10 +660,15 @@ class DatabaseConnector:
                     ORDER BY line
                 """, owner=schema, name=object_name, type=object_type)
                 
-                if not source_lines:
-                    return ""
+                source_lines = []
+                while True:
+                    rows = await self._fetch_many(cursor, SOURCE_FETCH_ARRAYSIZE)
+                    if not rows:
+                        break
+                    # all_source keeps each line's newline; strip it so lines join cleanly
+                    source_lines.extend((row[0] or "").rstrip("\n") for row in rows)
                 
-                return "\n".join(line[0] for line in source_lines)
+                return "\n".join(source_lines)
             else:
                 # For procedures, functions, triggers, views, etc.
                 result = await self._execute_cursor(cursor, """
@@ -372,16 +682,80 @@ class DatabaseConnector:
                 object_name=object_name,
                 owner=schema)
                 
-                if not result or not result[0]:
+                if not result or not result[0] or result[0][0] is None:
                     return ""
                     
-                # Properly await the CLOB read operation
-                clob = result[0][0]
-                return await clob.read()
+                return await self._read_lob(result[0][0])
                 
-        except oracledb.Error as e:
-            print(f"Error getting object source: {str(e)}", file=sys.stderr)
-            return f"Error retrieving source: {str(e)}"
+        finally:
+            await self._close_connection(conn)
+    
+    async def get_source_ddl_times(self) -> Dict[Tuple[str, str], str]:
+        """Get LAST_DDL_TIME for every object in the schema that has source in all_source"""
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            cursor.arraysize = SOURCE_FETCH_ARRAYSIZE
+            
+            rows = await self._execute_cursor(cursor, f"""
+                SELECT object_type, object_name, last_ddl_time
+                FROM all_objects
+                WHERE owner = :owner
+                AND object_type IN ({", ".join(f"'{t}'" for t in SOURCE_OBJECT_TYPES)})
+            """, owner=schema)
+            
+            return {
+                (object_type, object_name): last_ddl_time.strftime("%Y-%m-%d %H:%M:%S") if last_ddl_time else None
+                for object_type, object_name, last_ddl_time in rows
+            }
+        finally:
+            await self._close_connection(conn)
+    
+    async def fetch_all_source(self, object_names: Optional[List[str]] = None) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Stream all_source for the whole schema, or only for the named objects, in one query per batch of names.
+        
+        Returns:
+            Source lines keyed by (object_type, object_name), in line order.
+        """
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            cursor.arraysize = SOURCE_FETCH_ARRAYSIZE
+            cursor.prefetchrows = SOURCE_FETCH_ARRAYSIZE + 1
+            
+            # None means the whole schema in a single pass; otherwise bind names in batches
+            name_batches = [None] if object_names is None else [
+                object_names[i:i + NAME_BIND_BATCH_SIZE] for i in range(0, len(object_names), NAME_BIND_BATCH_SIZE)
+            ]
+            result: Dict[Tuple[str, str], List[str]] = {}
+            
+            for batch in name_batches:
+                params = {"owner": schema}
+                name_filter = ""
+                if batch is not None:
+                    binds = [f":n{i}" for i in range(len(batch))]
+                    params.update({f"n{i}": name for i, name in enumerate(batch)})
+                    name_filter = f"AND name IN ({', '.join(binds)})"
+                
+                await self._execute_cursor_no_fetch(cursor, f"""
+                    SELECT type, name, text
+                    FROM all_source
+                    WHERE owner = :owner
+                    {name_filter}
+                    ORDER BY type, name, line
+                """, **params)
+                
+                while True:
+                    rows = await self._fetch_many(cursor, SOURCE_FETCH_ARRAYSIZE)
+                    if not rows:
+                        break
+                    for object_type, object_name, text in rows:
+                        result.setdefault((object_type, object_name), []).append((text or "").rstrip("\n"))
+            
+            return result
         finally:
             await self._close_connection(conn)
     
@@ -550,6 +924,56 @@ class DatabaseConnector:
         finally:
             await self._close_connection(conn)
     
+    async def get_all_dependencies(self) -> List[Tuple[str, str, str, str, str]]:
+        """Get every dependency on objects in the schema as (referenced_name, referenced_type, owner, name, type) rows"""
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            cursor.arraysize = SOURCE_FETCH_ARRAYSIZE
+            cursor.prefetchrows = SOURCE_FETCH_ARRAYSIZE + 1
+            
+            rows = await self._execute_cursor(cursor, """
+                SELECT referenced_name, referenced_type, owner, name, type
+                FROM all_dependencies
+                WHERE referenced_owner = :owner
+            """, owner=schema)
+            
+            return [tuple(row) for row in rows]
+        except oracledb.Error as e:
+            print(f"Error getting dependencies: {str(e)}", file=sys.stderr)
+            raise
+        finally:
+            await self._close_connection(conn)
+    
+    async def get_schema_signatures(self) -> Dict[str, str]:
+        """
+        Get cheap signatures of the schema's state in one round trip: 'ddl' changes whenever any object is
+        created, altered or dropped, 'stats' whenever optimizer statistics are gathered on a table or index
+        """
+        conn = await self.get_connection()
+        try:
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            
+            rows = await self._execute_cursor(cursor, """
+                SELECT
+                    (SELECT COUNT(*) FROM all_objects WHERE owner = :owner),
+                    (SELECT MAX(last_ddl_time) FROM all_objects WHERE owner = :owner),
+                    (SELECT MAX(last_analyzed) FROM all_tables WHERE owner = :owner),
+                    (SELECT MAX(last_analyzed) FROM all_indexes WHERE owner = :owner)
+                FROM dual
+            """, owner=schema)
+            
+            count, last_ddl_time, tables_analyzed, indexes_analyzed = rows[0]
+            fmt = lambda value: value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+            return {
+                'ddl': f"{count}:{fmt(last_ddl_time)}",
+                'stats': f"{fmt(tables_analyzed)}:{fmt(indexes_analyzed)}"
+            }
+        finally:
+            await self._close_connection(conn)
+    
     async def get_user_defined_types(self, type_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get user-defined types"""
         conn = await self.get_connection()
@@ -693,74 +1117,203 @@ class DatabaseConnector:
             schema = await self._get_effective_schema(conn)
             result = {}
             
-            # Get columns for the specified tables that match the search term
-            rows = await self._execute_cursor(cursor, """
-                SELECT /*+ RESULT_CACHE */ 
-                    table_name,
-                    column_name,
-                    data_type,
-                    nullable
-                FROM all_tab_columns 
-                WHERE owner = :owner
-                AND table_name IN (SELECT column_value FROM TABLE(CAST(:table_names AS SYS.ODCIVARCHAR2LIST)))
-                AND UPPER(column_name) LIKE '%' || :search_term || '%'
-                ORDER BY table_name, column_id
-            """, owner=schema, 
+            # Get columns for the specified tables that match the search term, with full type details
+            rows = await self._execute_column_query(
+                cursor,
+                """atc.owner = :owner
+                AND atc.table_name IN (SELECT column_value FROM TABLE(CAST(:table_names AS SYS.ODCIVARCHAR2LIST)))
+                AND UPPER(atc.column_name) LIKE '%' || :search_term || '%'""",
+                "atc.table_name, atc.column_id",
+                owner=schema, 
                 table_names=table_names,
-                search_term=search_term.upper())
-            
-            for table_name, column_name, data_type, nullable in rows:
-                if table_name not in result:
-                    result[table_name] = []
-                result[table_name].append({
-                    "name": column_name,
-                    "type": data_type,
-                    "nullable": nullable == 'Y'
-                })
+                search_term=search_term.upper(),
+                extra_columns="atc.table_name"
+            )
+            
+            for row in rows:
+                result.setdefault(row[-1], []).append(self._column_info(row[:-1]))
             
             return result
             
         finally:
             await self._close_connection(conn)
     
+    @staticmethod
+    def _sample_expression(column: Dict[str, Any]) -> str:
+        """Select-list expression for a column that bounds the size of LOB and binary values on the server"""
+        name = '"' + column['name'] + '"'
+        data_type = (column.get('type') or '').upper()
+        if data_type in ('CLOB', 'NCLOB'):
+            return f"DBMS_LOB.SUBSTR({name}, {MAX_SAMPLE_VALUE_CHARS + 1}, 1)"
+        if data_type in ('BLOB', 'BFILE'):
+            return f"'<{data_type} ' || DBMS_LOB.GETLENGTH({name}) || ' bytes>'"
+        if data_type == 'RAW' or data_type.startswith('LONG'):
+            return f"'<{data_type}>'"
+        return name
+
+    async def sample_table(self, table_name: str, columns: List[Dict[str, Any]], rows: int = 10,
+                           max_bytes: int = 16384) -> Dict[str, Any]:
+        """
+        Fetch a few rows from a table in a read-only transaction with bounded time, rows and bytes.
+        
+        Large tables are read with SAMPLE BLOCK sized from the optimizer's row count, so only a fraction
+        of their blocks is visited; if that yields too few rows, or the table has no statistics, the first
+        rows are read instead, which stops after the first blocks. Rows are streamed in batches and
+        fetching stops as soon as the byte limit is reached.
+        
+        Args:
+            table_name: Table name as stored in the data dictionary.
+            columns: Column dicts with 'name' and 'type' to select, in output order.
+            rows: Number of rows wanted, capped at MAX_SAMPLE_ROWS.
+            max_bytes: Approximate limit on the size of the returned values, capped at MAX_SAMPLE_BYTES.
+                The limit applied is returned as 'max_bytes'.
+        """
+        rows = max(1, min(rows, MAX_SAMPLE_ROWS))
+        max_bytes = max(1, min(max_bytes, MAX_SAMPLE_BYTES))
+        for name in [table_name] + [column['name'] for column in columns]:
+            if '"' in name:
+                raise ValueError(f"Invalid identifier: {name}")
+        
+        conn = await self.get_connection()
+        previous_timeout = conn.call_timeout
+        try:
+            conn.call_timeout = SAMPLE_CALL_TIMEOUT_MS
+            cursor = conn.cursor()
+            schema = await self._get_effective_schema(conn)
+            
+            stats = await self._execute_cursor(cursor, """
+                SELECT num_rows FROM all_tables WHERE owner = :owner AND table_name = :table_name
+            """, owner=schema, table_name=table_name)
+            num_rows = stats[0][0] if stats else None
+            
+            # Start a fresh transaction that cannot modify data
+            await self._rollback(conn)
+            await self._execute_cursor_no_fetch(cursor, "SET TRANSACTION READ ONLY")
+            
+            select_list = ", ".join(self._sample_expression(column) for column in columns)
+            source = f'"{schema}"."{table_name}"'
+            attempts = []
+            if num_rows and num_rows > rows * SAMPLE_OVERSAMPLING * 10:
+                percent = max(0.000001, min(99.0, 100.0 * rows * SAMPLE_OVERSAMPLING / num_rows))
+                attempts.append((True, f"SELECT {select_list} FROM {source} SAMPLE BLOCK ({percent:.6f}) "
+                                       f"WHERE ROWNUM <= {rows}"))
+            # ROWNUM rather than FETCH FIRST keeps this working on 11g
+            attempts.append((False, f"SELECT {select_list} FROM {source} WHERE ROWNUM <= {rows}"))
+            
+            for sampled, sql in attempts:
+                cursor = conn.cursor()
+                cursor.arraysize = rows
+                cursor.prefetchrows = rows + 1
+                await self._execute_cursor_no_fetch(cursor, sql)
+                
+                result_rows = []
+                used_bytes = 0
+                truncated = False
+                while not truncated:
+                    batch = await self._fetch_many(cursor, rows)
+                    if not batch:
+                        break
+                    for row in batch:
+                        values = []
+                        for value in row:
+                            if isinstance(value, str) and len(value) > MAX_SAMPLE_VALUE_CHARS:
+                                value = value[:MAX_SAMPLE_VALUE_CHARS] + "..."
+                            elif isinstance(value, bytes):
+                                value = value[:MAX_SAMPLE_VALUE_CHARS // 2].hex()
+                            values.append(value)
+                        row_bytes = sum(len(str(value).encode()) for value in values if value is not None)
+                        if used_bytes + row_bytes > max_bytes:
+                            truncated = True
+                            break
+                        used_bytes += row_bytes
+                        result_rows.append(values)
+                    if len(result_rows) >= rows:
+                        break
+                
+                if len(result_rows) >= rows or truncated or not sampled:
+                    return {
+                        "table": table_name,
+                        "columns": [column['name'] for column in columns],
+                        "rows": result_rows,
+                        "sampled": sampled,
+                        "truncated": truncated,
+                        "bytes": used_bytes,
+                        "max_bytes": max_bytes
+                    }
+        finally:
+            try:
+                await self._rollback(conn)
+                conn.call_timeout = previous_timeout
+            except Exception as e:
+                print(f"Error ending read-only transaction: {str(e)}", file=sys.stderr)
+            await self._close_connection(conn)
+
     async def explain_query_plan(self, query: str) -> Dict[str, Any]:
-        """Get execution plan for a SQL query"""
+        """
+        Get execution plan for a SQL query.
+        Each request tags its plan_table rows with its own STATEMENT_ID, so concurrent explains never read
+        or delete each other's rows, and the formatted plan comes from DBMS_XPLAN.DISPLAY.
+        """
         conn = await self.get_connection()
+        # Generated locally from hex digits only, so it is safe to inline where binds are not allowed
+        statement_id = f"MCP_{uuid.uuid4().hex[:26]}"
         try:
             cursor = conn.cursor()
+            query = query.strip().rstrip(";").strip()
             
             # First create an explain plan
-            plan_statement = f"EXPLAIN PLAN FOR {query}"
-            await cursor.execute(plan_statement)
-            
-            # Then retrieve the execution plan with cost and cardinality information
-            plan_rows = await self._execute_cursor(cursor, """
-                SELECT 
-                    LPAD(' ', 2*LEVEL-2) || operation || ' ' || 
-                    options || ' ' || object_name || 
-                    CASE 
-                        WHEN cost IS NOT NULL THEN ' (Cost: ' || cost || ')'
-                        ELSE ''
-                    END || 
-                    CASE 
-                        WHEN cardinality IS NOT NULL THEN ' (Rows: ' || cardinality || ')'
-                        ELSE ''
-                    END as execution_plan_step
-                FROM plan_table
-                START WITH id = 0
-                CONNECT BY PRIOR id = parent_id
-                ORDER SIBLINGS BY position
-            """)
-            
-            # Clear the plan table for next time
-            await self._execute_cursor_no_fetch(cursor,"DELETE FROM plan_table")
-            await self._commit(conn)
+            await self._execute_cursor_no_fetch(
+                cursor, f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {query}"
+            )
+            
+            try:
+                # Formatted plan with rows, bytes, cost and predicate information
+                plan_rows = await self._execute_cursor(cursor, """
+                    SELECT plan_table_output
+                    FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', :statement_id, 'TYPICAL'))
+                """, statement_id=statement_id)
+                
+                # Structured plan steps for programmatic consumers
+                step_rows = await self._execute_cursor(cursor, """
+                    SELECT id, parent_id, depth, operation, options, object_owner, object_name,
+                           cost, cardinality, bytes, access_predicates, filter_predicates
+                    FROM plan_table
+                    WHERE statement_id = :statement_id
+                    ORDER BY id
+                """, statement_id=statement_id)
+            finally:
+                # Remove only this request's rows
+                await self._execute_cursor_no_fetch(
+                    cursor, "DELETE FROM plan_table WHERE statement_id = :statement_id", statement_id=statement_id
+                )
+                await self._commit(conn)
+            
+            plan_steps = []
+            for (step_id, parent_id, depth, operation, options, object_owner, object_name,
+                 cost, cardinality, byte_count, access_predicates, filter_predicates) in step_rows:
+                step = {
+                    "id": step_id,
+                    "parent_id": parent_id,
+                    "depth": depth,
+                    "operation": f"{operation} {options}" if options else operation,
+                    "object": f"{object_owner}.{object_name}" if object_owner and object_name else object_name,
+                    "cost": cost,
+                    "cardinality": cardinality,
+                    "bytes": byte_count
+                }
+                if access_predicates:
+                    step["access_predicates"] = access_predicates
+                if filter_predicates:
+                    step["filter_predicates"] = filter_predicates
+                plan_steps.append(step)
             
             # Also get some basic optimization hints based on query content
             basic_analysis = self._analyze_query_for_optimization(query)
             
             return {
+                "statement_id": statement_id,
                 "execution_plan": [row[0] for row in plan_rows],
+                "plan_steps": plan_steps,
                 "optimization_suggestions": basic_analysis
             }
         except oracledb.Error as e:
@@ -774,42 +1327,8 @@ class DatabaseConnector:
             await self._close_connection(conn)
             
     def _analyze_query_for_optimization(self, query: str) -> List[str]:
-        """Simple heuristic analysis of query for basic optimization suggestions"""
-        query = query.upper()
-        suggestions = []
-        
-        # Check for common inefficient patterns
-        if "SELECT *" in query:
-            suggestions.append("Consider selecting only needed columns instead of SELECT *")
-            
-        if " LIKE '%something" in query or " LIKE '%something%'" in query:
-            suggestions.append("Leading wildcards in LIKE predicates prevent index usage")
-            
-        if " IN (SELECT " in query and " EXISTS" not in query:
-            suggestions.append("Consider using EXISTS instead of IN with subqueries for better performance")
-            
-        if " OR " in query:
-            suggestions.append("OR conditions may prevent index usage. Consider UNION ALL of separated queries")
-            
-        if "/*+ " not in query and len(query) > 500:
-            suggestions.append("Complex query could benefit from optimizer hints")
-            
-        if " JOIN " in query:
-            if "/*+ LEADING" not in query and query.count("JOIN") > 2:
-                suggestions.append("Multi-table joins may benefit from LEADING hint to control join order")
-            
-            if "/*+ USE_NL" not in query and "/*+ USE_HASH" not in query and query.count("JOIN") > 1:
-                suggestions.append("Consider join method hints like USE_NL or USE_HASH for complex joins")
-        
-        # Count number of tables and joins
-        join_count = query.count(" JOIN ")
-        from_count = query.count(" FROM ")
-        table_count = max(from_count, join_count + 1)
-        
-        if table_count > 4:
-            suggestions.append(f"Query joins {table_count} tables - consider reviewing join order and conditions")
-            
-        return suggestions
+        """Structural analysis of the parsed query for basic optimization suggestions"""
+        return analyze_statement(parse(query))
 
     async def _close_connection(self, conn):
         """Helper method to close connection based on mode"""
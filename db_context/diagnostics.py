@@ -0,0 +1,199 @@
+"""Slow-operation log, on-demand request profiling and workload capture.
+
+SlowOperationLog is a trace exporter: it receives every finished trace, so a slow tool call can be
+logged with the timing of everything it did underneath. Statements and cache persistence steps
+over the threshold are logged on their own as well, even inside a fast call.
+
+RequestProfiler runs cProfile over the next N tool calls and writes the profile to the cache
+directory, for diagnosing hot paths in a running server without redeploying.
+
+WorkloadRecorder appends every tool call with its arguments and start time to a JSON lines file,
+which benchmarks.replay runs again against a fake connector to measure cache behavior.
+"""
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .tracing import Span
+
+# Span names of the steps that write caches to disk, as traced by SchemaManager: the snapshot, the source
+# index and its stored objects, and the side files holding the object catalog and table statistics
+PERSISTENCE_SPANS = ('schema.save_cache', 'schema.save_source_index', 'schema.store_source',
+                     'schema.save_side_file')
+# Functions listed in the text summary written next to each profile
+PROFILE_SUMMARY_LINES = 40
+
+def _duration_ms(span: Span) -> float:
+    return ((span.end_ns or span.start_ns) - span.start_ns) / 1e6
+
+class SlowOperationLog:
+    """Logs tool calls, SQL statements and cache persistence steps slower than threshold_ms"""
+
+    def __init__(self, threshold_ms: float, path: Optional[Path] = None) -> None:
+        self.threshold_ms = threshold_ms
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        children: Dict[Optional[str], List[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+        for span_list in children.values():
+            span_list.sort(key=lambda span: span.start_ns)
+
+        span_ids = {span.span_id for span in spans}
+        slow_roots = [span for span in spans
+                      if span.parent_id not in span_ids and _duration_ms(span) >= self.threshold_ms]
+        for root in slow_roots:
+            self._log(root, self._breakdown(root, children))
+        if slow_roots:
+            return
+        # A fast call can still contain a slow statement or cache write
+        for span in spans:
+            if (span.name == 'sql' or span.name in PERSISTENCE_SPANS) and _duration_ms(span) >= self.threshold_ms:
+                self._log(span, [])
+
+    def _breakdown(self, root: Span, children: Dict[Optional[str], List[Span]]) -> List[Dict[str, Any]]:
+        """Timing of every operation under root, depth first in start order"""
+        lines: List[Dict[str, Any]] = []
+
+        def walk(span: Span, depth: int) -> None:
+            for child in children.get(span.span_id, []):
+                lines.append({
+                    'depth': depth,
+                    'name': child.name,
+                    'offset_ms': round((child.start_ns - root.start_ns) / 1e6, 3),
+                    'duration_ms': round(_duration_ms(child), 3),
+                    'attributes': child.attributes,
+                    **({'error': child.error} if child.error else {})
+                })
+                walk(child, depth + 1)
+
+        walk(root, 1)
+        return lines
+
+    def _log(self, span: Span, breakdown: List[Dict[str, Any]]) -> None:
+        duration = _duration_ms(span)
+        print(f"Slow operation: {span.name} took {duration:.1f} ms (threshold {self.threshold_ms:g} ms)",
+              file=sys.stderr)
+        for line in breakdown:
+            print(f"  {'  ' * (line['depth'] - 1)}{line['duration_ms']:>10.1f} ms  {line['name']}", file=sys.stderr)
+        if self.path is None:
+            return
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(span.start_ns / 1e9)),
+            'name': span.name,
+            'duration_ms': round(duration, 3),
+            'threshold_ms': self.threshold_ms,
+            'attributes': span.attributes,
+            'error': span.error,
+            'breakdown': breakdown
+        }
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            print(f"Error writing slow operation log: {e}", file=sys.stderr)
+
+class RequestProfiler:
+    """
+    Profiles the next N tool calls with cProfile once armed. The profiler runs from the first
+    profiled call until the Nth one completes, so calls running concurrently are included.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = Path(output_dir)
+        self.remaining = 0
+        self.last_profile: Optional[Path] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._calls: List[str] = []
+        self._in_flight = 0
+
+    def arm(self, requests: int) -> None:
+        """Profile the next requests tool calls, replacing the count of a profile in progress; 0 ends it"""
+        self.remaining = max(0, requests)
+        if self.remaining == 0 and self._in_flight == 0:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+            self._write(self._profile)
+            self._profile = None
+
+    @contextmanager
+    def profile_call(self, name: str) -> Iterator[None]:
+        if self.remaining <= 0:
+            yield
+            return
+        self.remaining -= 1
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._calls = []
+            self._profile.enable()
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._calls.append(name)
+            if self.remaining <= 0 and self._in_flight == 0:
+                self._finish()
+
+    def _write(self, profile: cProfile.Profile) -> None:
+        """Write the binary profile, for pstats or snakeviz, and a text summary by cumulative time"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        try:
+            profile.dump_stats(path)
+            summary = io.StringIO()
+            summary.write(f"Tool calls profiled: {', '.join(self._calls)}\n\n")
+            pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+            path.with_suffix('.txt').write_text(summary.getvalue(), encoding='utf-8')
+            self.last_profile = path
+            print(f"Profile of {len(self._calls)} tool calls written to {path}", file=sys.stderr)
+        except OSError as e:
+            print(f"Error writing profile: {e}", file=sys.stderr)
+
+class WorkloadRecorder:
+    """Appends one JSON line per tool call: start time, tool name, arguments, duration and response size"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, arguments: Dict[str, Any], started: float, elapsed_ms: float,
+               response_bytes: int) -> None:
+        record = {
+            'time': started,
+            'tool': tool,
+            'arguments': arguments,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'response_bytes': response_bytes
+        }
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            print(f"Error writing workload record: {e}", file=sys.stderr)
+
+def load_workload(path: Path) -> List[Dict[str, Any]]:
+    """Tool calls recorded by WorkloadRecorder, in start order; unreadable lines are skipped"""
+    calls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and 'tool' in record and 'time' in record:
+                calls.append(record)
+    calls.sort(key=lambda record: record['time'])
+    return calls
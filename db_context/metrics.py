@@ -0,0 +1,208 @@
+"""In-process metrics for tool calls and the database round trips they cause.
+
+Tool calls are attributed through a context variable: the server wraps each tool in
+MetricsRegistry.tool_call(), and the connector's cursor helpers report their round trips,
+rows and pool waits to whichever call is running in the current task (or tasks it spawned).
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds of the latency histogram buckets in milliseconds, roughly logarithmic; slower
+# observations fall into a final overflow bucket bounded by the maximum seen
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000
+)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with interpolated percentiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        elapsed_ms = float(elapsed_ms)
+        index = next((i for i, bound in enumerate(self.buckets) if elapsed_ms <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimate a percentile (0..1) by linear interpolation inside the bucket that contains it"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = self.buckets[index - 1] if index > 0 else 0.0
+            upper = self.buckets[index] if index < len(self.buckets) else self.max_ms
+            upper = min(upper, self.max_ms)
+            lower = min(lower, upper)
+            return lower + (upper - lower) * (rank - seen) / bucket_count
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            'count': self.count,
+            'mean_ms': rounded(self.total_ms / self.count) if self.count else None,
+            'p50_ms': rounded(self.percentile(0.50)),
+            'p95_ms': rounded(self.percentile(0.95)),
+            'p99_ms': rounded(self.percentile(0.99)),
+            'max_ms': rounded(self.max_ms) if self.count else None
+        }
+
+@dataclass
+class CallStats:
+    """Database work done on behalf of a single tool call"""
+    round_trips: int = 0
+    rows: int = 0
+    statements: int = 0
+    pool_wait_ms: float = 0.0
+    bytes_returned: int = 0
+    # Set when the tool reports an error in its response instead of raising
+    failed: bool = False
+
+class ToolMetrics:
+    """Aggregated metrics of one tool"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.pool_wait = LatencyHistogram()
+        self.round_trips = 0
+        self.max_round_trips = 0
+        self.rows = 0
+        self.statements = 0
+        self.bytes_returned = 0
+
+    def record(self, call: CallStats, elapsed_ms: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.latency.observe(elapsed_ms)
+        self.pool_wait.observe(call.pool_wait_ms)
+        self.round_trips += call.round_trips
+        self.max_round_trips = max(self.max_round_trips, call.round_trips)
+        self.rows += call.rows
+        self.statements += call.statements
+        self.bytes_returned += call.bytes_returned
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency': self.latency.snapshot(),
+            'round_trips': self.round_trips,
+            'round_trips_per_call': round(self.round_trips / self.calls, 2) if self.calls else None,
+            'max_round_trips': self.max_round_trips,
+            'statements': self.statements,
+            'rows_fetched': self.rows,
+            'bytes_returned': self.bytes_returned,
+            'pool_wait': self.pool_wait.snapshot()
+        }
+
+_current_call: contextvars.ContextVar[Optional[CallStats]] = contextvars.ContextVar('current_call', default=None)
+
+def mark_call_failed() -> None:
+    """Count the tool call running in the current task as an error, for tools that return their errors"""
+    call = _current_call.get()
+    if call is not None:
+        call.failed = True
+
+class MetricsRegistry:
+    """Tool call and database metrics of one server process, kept in memory and never persisted"""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.tools: Dict[str, ToolMetrics] = {}
+        self.statement_latency = LatencyHistogram()
+        self.pool_wait = LatencyHistogram()
+        self.round_trips = 0
+        self.rows = 0
+        self.statements = 0
+        # Lookups per object cache type, e.g. 'indexes' or 'plans'
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+
+    @contextmanager
+    def tool_call(self, name: str) -> Iterator[CallStats]:
+        """
+        Measure a tool call; database work done while it runs is attributed to it.
+        The call counts as an error if it raises or is marked with mark_call_failed().
+        """
+        call = CallStats()
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield call
+            failed = False
+        finally:
+            _current_call.reset(token)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.tools.setdefault(name, ToolMetrics()).record(call, elapsed_ms, failed or call.failed)
+
+    def record_statement(self, elapsed_ms: float, round_trips: int, rows: int = 0) -> None:
+        """Record an executed statement, including the fetches it needed"""
+        self.statements += 1
+        self.statement_latency.observe(elapsed_ms)
+        call = _current_call.get()
+        if call is not None:
+            call.statements += 1
+        self.record_round_trips(round_trips, rows)
+
+    def record_round_trips(self, round_trips: int, rows: int = 0) -> None:
+        """Record round trips that are not statement executions, such as fetches, LOB reads and commits"""
+        self.round_trips += round_trips
+        self.rows += rows
+        call = _current_call.get()
+        if call is not None:
+            call.round_trips += round_trips
+            call.rows += rows
+
+    def record_pool_wait(self, elapsed_ms: float) -> None:
+        self.pool_wait.observe(elapsed_ms)
+        call = _current_call.get()
+        if call is not None:
+            call.pool_wait_ms += elapsed_ms
+
+    def record_cache_access(self, cache_type: str, hit: bool) -> None:
+        counts = self.cache_hits if hit else self.cache_misses
+        counts[cache_type] = counts.get(cache_type, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        tools: List[Tuple[str, ToolMetrics]] = sorted(self.tools.items(), key=lambda item: -item[1].latency.total_ms)
+        return {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'tools': {name: metrics.snapshot() for name, metrics in tools},
+            'database': {
+                'statements': self.statements,
+                'round_trips': self.round_trips,
+                'rows_fetched': self.rows,
+                'statement_latency': self.statement_latency.snapshot(),
+                'pool_wait': self.pool_wait.snapshot()
+            },
+            'cache': {
+                cache_type: {
+                    'hits': self.cache_hits.get(cache_type, 0),
+                    'misses': self.cache_misses.get(cache_type, 0)
+                }
+                for cache_type in sorted(set(self.cache_hits) | set(self.cache_misses))
+            }
+        }
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Set, Protocol, Optional, Any
 from pathlib import Path
-from .schema.formatter import format_schema
+from .schema.formatter import format_schema, DETAIL_FULL
 
 @dataclass
 class TableInfo:
@@ -10,18 +10,32 @@ class TableInfo:
     relationships: Dict[str, Dict[str, Any]]
     fully_loaded: bool = False
 
-    def format_schema(self) -> str:
+    def format_schema(self, detail: str = DETAIL_FULL, statistics: Optional[Dict[str, Any]] = None) -> str:
         """Format the schema information for the table, with smart relationship grouping.
         
+        Args:
+            detail: One of the formatter's DETAIL_LEVELS; lower levels trade detail for size.
+            statistics: Optional optimizer statistics for the table, shown alongside the schema.
+        
         Returns:
             A formatted string containing the table's complete schema information.
         """
         return format_schema(
             self.table_name,
             self.columns,
-            self.relationships
+            self.relationships,
+            detail,
+            statistics
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the table's cached structures as a plain dict for JSON output."""
+        return {
+            'table_name': self.table_name,
+            'columns': self.columns,
+            'relationships': self.relationships
+        }
+
 @dataclass
 class SchemaCache:
     tables: Dict[str, TableInfo]
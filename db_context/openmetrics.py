@@ -0,0 +1,223 @@
+"""OpenMetrics exposition of server metrics, served over HTTP or written to a text file for scraping.
+
+Everything is rendered on demand from state the server already keeps: the MetricsRegistry of tool
+calls and database round trips, the schema manager's caches and sync timestamps, and the
+connection pool's own counters. Nothing here touches the database.
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import LatencyHistogram
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Prefix of every metric family exported by the server
+PREFIX = "oracle_mcp"
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels: Optional[Dict[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Writer:
+    """Accumulates metric families in exposition order"""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str, unit: Optional[str] = None) -> None:
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        if unit:
+            self.lines.append(f"# UNIT {name} {unit}")
+        self.lines.append(f"# HELP {name} {help_text}")
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict[str, str]], float]],
+              unit: Optional[str] = None) -> None:
+        self.family(name, "gauge", help_text, unit)
+        for labels, value in samples:
+            self.sample(name, value, labels)
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict[str, str]], float]]) -> None:
+        self.family(name, "counter", help_text)
+        for labels, value in samples:
+            self.sample(f"{name}_total", value, labels)
+
+    def histogram(self, name: str, help_text: str,
+                  samples: Iterable[Tuple[Optional[Dict[str, str]], LatencyHistogram]]) -> None:
+        """A latency histogram in seconds, converted from the registry's millisecond buckets"""
+        self.family(name, "histogram", help_text, "seconds")
+        for labels, histogram in samples:
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + [float('inf')], histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else _number(bound / 1000)
+                self.sample(f"{name}_bucket", cumulative, {**(labels or {}), 'le': le})
+            self.sample(f"{name}_count", histogram.count, labels)
+            self.sample(f"{name}_sum", histogram.total_ms / 1000, labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines + ["# EOF"]) + "\n"
+
+def _resident_memory_bytes() -> Optional[int]:
+    """Current resident set size of this process where /proc is available, else the peak where known"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def render_openmetrics(db_context: Any) -> str:
+    """Render the metrics of a DatabaseContext in the OpenMetrics text format"""
+    registry = db_context.metrics
+    schema_manager = db_context.schema_manager
+    writer = _Writer()
+    now = time.time()
+
+    tools = sorted(registry.tools.items())
+    writer.counter(f"{PREFIX}_tool_calls", "Tool calls served", [({'tool': name}, m.calls) for name, m in tools])
+    writer.counter(f"{PREFIX}_tool_errors", "Tool calls that raised or returned an error", [({'tool': name}, m.errors) for name, m in tools])
+    writer.histogram(f"{PREFIX}_tool_duration_seconds", "Tool call latency",
+                     [({'tool': name}, m.latency) for name, m in tools])
+    writer.counter(f"{PREFIX}_tool_round_trips", "Database round trips made by tool calls",
+                   [({'tool': name}, m.round_trips) for name, m in tools])
+    writer.counter(f"{PREFIX}_tool_rows_fetched", "Rows fetched by tool calls",
+                   [({'tool': name}, m.rows) for name, m in tools])
+    writer.counter(f"{PREFIX}_tool_response_bytes", "Bytes returned by tool calls",
+                   [({'tool': name}, m.bytes_returned) for name, m in tools])
+
+    writer.counter(f"{PREFIX}_db_statements", "SQL statements executed", [(None, registry.statements)])
+    writer.counter(f"{PREFIX}_db_round_trips", "Database round trips", [(None, registry.round_trips)])
+    writer.counter(f"{PREFIX}_db_rows_fetched", "Rows fetched from the database", [(None, registry.rows)])
+    writer.histogram(f"{PREFIX}_db_statement_duration_seconds", "SQL statement latency including fetches",
+                     [(None, registry.statement_latency)])
+    writer.histogram(f"{PREFIX}_pool_wait_duration_seconds", "Time spent acquiring a pooled connection",
+                     [(None, registry.pool_wait)])
+
+    pool = db_context.db_connector.get_pool_stats()
+    if pool is not None:
+        writer.gauge(f"{PREFIX}_pool_busy_connections", "Pooled connections in use", [(None, pool['busy'])])
+        writer.gauge(f"{PREFIX}_pool_opened_connections", "Pooled connections open", [(None, pool['opened'])])
+        writer.gauge(f"{PREFIX}_pool_max_connections", "Maximum pooled connections", [(None, pool['max'])])
+
+    cache_types = sorted(set(registry.cache_hits) | set(registry.cache_misses))
+    writer.counter(f"{PREFIX}_cache_hits", "Cache lookups served from the cache",
+                   [({'cache': name}, registry.cache_hits.get(name, 0)) for name in cache_types])
+    writer.counter(f"{PREFIX}_cache_misses", "Cache lookups that went to the database",
+                   [({'cache': name}, registry.cache_misses.get(name, 0)) for name in cache_types])
+    ratios = []
+    for name in cache_types:
+        hits, misses = registry.cache_hits.get(name, 0), registry.cache_misses.get(name, 0)
+        ratios.append(({'cache': name}, hits / (hits + misses)))
+    writer.gauge(f"{PREFIX}_cache_hit_ratio", "Share of cache lookups served from the cache", ratios, "ratio")
+    writer.gauge(f"{PREFIX}_cache_entries", "Entries held per cache",
+                 [({'cache': name}, size) for name, size in sorted(schema_manager.get_cache_stats()['size'].items())])
+
+    cache_path = schema_manager.cache_path
+    if cache_path is not None and Path(cache_path).exists():
+        writer.gauge(f"{PREFIX}_cache_file_bytes", "Size of the persisted schema cache",
+                     [(None, Path(cache_path).stat().st_size)], "bytes")
+    memory = _resident_memory_bytes()
+    if memory is not None:
+        writer.gauge("process_resident_memory_bytes", "Resident memory of the server process", [(None, memory)],
+                     "bytes")
+
+    readiness = db_context.readiness()
+    writer.gauge(f"{PREFIX}_ready", "Whether the schema cache has loaded; 0 while tools use direct queries",
+                 [(None, 1 if readiness['state'] == "ready" else 0)])
+    writer.gauge(f"{PREFIX}_schema_version", "Schema version, bumped when DDL is detected",
+                 [(None, schema_manager.schema_version)])
+    writer.gauge(f"{PREFIX}_stats_version", "Statistics version, bumped when statistics are regathered",
+                 [(None, schema_manager.stats_version)])
+    ages = [({'refresh': 'full_cache'}, now - schema_manager.cache_stats['last_full_refresh'])]
+    if schema_manager.last_schema_sync:
+        ages.append(({'refresh': 'schema_sync'}, now - schema_manager.last_schema_sync))
+    if schema_manager.source_index is not None and schema_manager.source_index.last_refresh:
+        ages.append(({'refresh': 'source_index'}, now - schema_manager.source_index.last_refresh))
+    writer.gauge(f"{PREFIX}_refresh_age_seconds", "Time since each background refresh last ran",
+                 [(labels, round(age, 3)) for labels, age in ages], "seconds")
+    return writer.render()
+
+class MetricsExporter:
+    """Publishes render_openmetrics() on a local HTTP endpoint and/or by rewriting a text file periodically"""
+
+    def __init__(self, db_context: Any) -> None:
+        self.db_context = db_context
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._textfile_task: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = "127.0.0.1", port: Optional[int] = None, textfile: Optional[Path] = None,
+                    interval: float = 15.0) -> None:
+        """Start the HTTP endpoint on port (GET /metrics) and/or the text file writer; both are optional"""
+        if port is not None:
+            self._server = await asyncio.start_server(self._handle, host, port)
+            print(f"Serving OpenMetrics on http://{host}:{port}/metrics", file=sys.stderr)
+        if textfile is not None:
+            self._textfile_task = asyncio.create_task(self._write_periodically(Path(textfile), interval))
+            print(f"Writing OpenMetrics to {textfile} every {interval:g}s", file=sys.stderr)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._textfile_task is not None:
+            self._textfile_task.cancel()
+            try:
+                await self._textfile_task
+            except asyncio.CancelledError:
+                pass
+            self._textfile_task = None
+
+    def write_textfile(self, path: Path) -> None:
+        """Write the metrics atomically, so a scraper never sees a partial file"""
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(render_openmetrics(self.db_context), encoding='utf-8')
+        os.replace(temporary, path)
+
+    async def _write_periodically(self, path: Path, interval: float) -> None:
+        while True:
+            try:
+                self.write_textfile(path)
+            except Exception as e:
+                print(f"Error writing metrics to {path}: {e}", file=sys.stderr)
+            await asyncio.sleep(interval)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the request headers
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split('?')[0] == "/metrics":
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = render_openmetrics(self.db_context).encode('utf-8')
+            else:
+                status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", b"Not found\n"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+        except Exception as e:
+            print(f"Error serving metrics: {e}", file=sys.stderr)
+        finally:
+            writer.close()
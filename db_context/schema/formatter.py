@@ -84,35 +84,205 @@ Relationships:
 
 For less than RELATIONSHIP_GROUPING_THRESHOLD relationships, each relationship is listed individually without grouping.
 """
-from typing import List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, Set, Tuple, Callable, Optional
 import re
 from collections import defaultdict
 
+from ..tracing import traced
+
 # Configuration constants
 RELATIONSHIP_GROUPING_THRESHOLD = 10  # Number of relationships before grouping is applied
 COLUMN_GROUPING_THRESHOLD = 20     # Number of columns before compact format is used
 MIN_PREFIX_LENGTH = 3              # Minimum length for meaningful prefix grouping
+CHARS_PER_TOKEN = 4                # Rough character-to-token ratio used for token budgets
+
+# Detail levels, from most to least verbose, used when output has to fit a budget
+DETAIL_FULL = "full"          # Default formatting
+DETAIL_COMPACT = "compact"    # Columns always in compact form
+DETAIL_GROUPED = "grouped"    # Compact columns and relationships always grouped
+DETAIL_NAMES = "names"        # Column names only, relationships summarised as a count
+DETAIL_LEVELS = [DETAIL_FULL, DETAIL_COMPACT, DETAIL_GROUPED, DETAIL_NAMES]
+# Tables named in each list of the budget note; the rest are counted
+MAX_REPORTED_TABLES = 10
 
+@traced("format.schema")
 def format_schema(table_name: str, columns: List[Dict[str, Any]], 
-                relationships: Dict[str, Dict[str, Any]]) -> str:
-    """Format complete schema information for a table."""
+                relationships: Dict[str, Dict[str, Any]], detail: str = DETAIL_FULL,
+                statistics: Optional[Dict[str, Any]] = None) -> str:
+    """Format complete schema information for a table at the requested detail level.
+    
+    If statistics (as returned by get_schema_statistics for the table) are given, the table's row count
+    is shown at every level above DETAIL_NAMES and per-column statistics at DETAIL_FULL.
+    """
     result = [f"\nTable: {table_name}"]
     
+    if detail == DETAIL_NAMES:
+        result.append("Columns: " + ", ".join(column['name'] for column in columns))
+        if relationships:
+            result.append(f"Relationships: {len(relationships)} related tables (omitted)")
+        return "\n".join(result)
+    
     # Format columns with automatic compaction for large column sets
+    if statistics is not None:
+        result.append(format_statistics(statistics))
     result.append("Columns:")
-    column_lines = format_columns(columns, compact=len(columns) > COLUMN_GROUPING_THRESHOLD)
+    compact = detail != DETAIL_FULL or len(columns) > COLUMN_GROUPING_THRESHOLD
+    column_lines = format_columns(columns, compact=compact,
+                                  statistics=statistics.get('columns') if statistics else None)
     result.extend(column_lines)
     
     # Format relationships if present
     if relationships:
         result.append("Relationships:")
-        relationship_lines = format_relationships(relationships)
+        relationship_lines = format_relationships(relationships, force_grouping=detail == DETAIL_GROUPED)
         result.extend(relationship_lines)
     
     return "\n".join(result)
 
-def format_columns(columns: List[Dict[str, Any]], compact: bool = False) -> List[str]:
-    """Format column information, with option for compact representation for many columns."""
+@traced("format.schemas_with_budget")
+def format_schemas_with_budget(tables: List[Tuple[str, List[Dict[str, Any]], Dict[str, Dict[str, Any]]]],
+                               max_chars: int) -> str:
+    """Format several tables so the combined output stays within max_chars.
+    
+    The budget is shared out smallest-table-first: each table gets an equal share of what is
+    left and keeps the most detailed level that fits, so small tables stay fully detailed and
+    any unused share carries over to the larger ones. Tables degrade through DETAIL_LEVELS and
+    are omitted once even their column names do not fit. A note listing the degraded and
+    omitted tables, up to MAX_REPORTED_TABLES of each, is appended and counted against the budget.
+    If even the note does not fit, the output is cut at max_chars.
+    
+    Args:
+        tables: (table_name, columns, relationships) or (table_name, columns, relationships, statistics)
+            tuples in output order.
+        max_chars: Maximum length of the returned string.
+    """
+    renders: Dict[Tuple[int, str], str] = {}
+    def render(index: int, level: str) -> str:
+        if (index, level) not in renders:
+            table_name, columns, relationships, *statistics = tables[index]
+            renders[(index, level)] = format_schema(table_name, columns, relationships, level,
+                                                    statistics[0] if statistics else None)
+        return renders[(index, level)]
+    
+    budget = max_chars
+    while True:
+        rendered, levels = _allocate_budget(len(tables), render, budget)
+        report = _budget_report(tables, levels, max_chars)
+        output = "\n".join([text for text in rendered if text] + ([report] if report else []))
+        if len(output) <= max_chars:
+            return output
+        if budget == 0:
+            return output[:max_chars]
+        # Make room for the truncation note and lay the tables out again
+        budget = max(0, budget - (len(output) - max_chars))
+
+def _allocate_budget(count: int, render: Callable[[int, str], str],
+                     max_chars: int) -> Tuple[List[str], List[str]]:
+    """Pick a detail level per table within max_chars; returns rendered texts and levels ('' if omitted)."""
+    rendered = [""] * count
+    levels = [""] * count
+    remaining = max_chars
+    order = sorted(range(count), key=lambda i: len(render(i, DETAIL_FULL)))
+    
+    for position, index in enumerate(order):
+        # Each table after the first also costs a newline separator
+        share = remaining // (len(order) - position) - (1 if position else 0)
+        for level in DETAIL_LEVELS:
+            text = render(index, level)
+            if len(text) <= share:
+                rendered[index] = text
+                levels[index] = level
+                remaining -= len(text) + (1 if position else 0)
+                break
+    
+    return rendered, levels
+
+def _budget_report(tables: List[Tuple[str, List[Dict[str, Any]], Dict[str, Dict[str, Any]]]],
+                   levels: List[str], max_chars: int) -> str:
+    """Describe which tables were degraded or omitted, or return '' if everything is fully detailed."""
+    degraded = [f"{table[0]} ({level})" for table, level in zip(tables, levels) if level and level != DETAIL_FULL]
+    omitted = [table[0] for table, level in zip(tables, levels) if not level]
+    if not degraded and not omitted:
+        return ""
+    
+    def listing(names: List[str]) -> str:
+        listed = ', '.join(names[:MAX_REPORTED_TABLES])
+        return listed + (f" and {len(names) - MAX_REPORTED_TABLES} more" if len(names) > MAX_REPORTED_TABLES else "")
+    
+    report = [f"\n[Schema output limited to {max_chars} characters."]
+    if degraded:
+        report.append(f" Reduced detail: {listing(degraded)}.")
+    if omitted:
+        report.append(f" Omitted: {listing(omitted)}.")
+    report.append(" Request fewer tables or a larger budget for full detail.]")
+    return "".join(report)
+
+def format_statistics(statistics: Dict[str, Any]) -> str:
+    """Format a table's optimizer statistics as a single line."""
+    if not statistics.get('last_analyzed'):
+        return "Statistics: not analyzed"
+    parts = [f"{statistics['num_rows']:,} rows" if statistics.get('num_rows') is not None else "rows unknown"]
+    if statistics.get('blocks') is not None:
+        parts.append(f"{statistics['blocks']:,} blocks")
+    if statistics.get('avg_row_len'):
+        parts.append(f"avg row {statistics['avg_row_len']} bytes")
+    parts.append(f"analyzed {statistics['last_analyzed']}")
+    return "Statistics: " + ", ".join(parts)
+
+def _format_column_statistics(statistics: Dict[str, Any]) -> str:
+    """Format a column's optimizer statistics for appending to its line."""
+    parts = []
+    if statistics.get('num_distinct') is not None:
+        parts.append(f"distinct {statistics['num_distinct']:,}")
+    if statistics.get('num_nulls'):
+        parts.append(f"nulls {statistics['num_nulls']:,}")
+    if statistics.get('density') is not None:
+        parts.append(f"density {statistics['density']:.3g}")
+    if statistics.get('histogram'):
+        parts.append(f"histogram {statistics['histogram']} ({statistics.get('num_buckets')} buckets)")
+    return f" [{', '.join(parts)}]" if parts else ""
+
+def format_data_type(column: Dict[str, Any]) -> str:
+    """Full declared type of a column, e.g. VARCHAR2(50 CHAR) or NUMBER(10,2), from the cached type details.
+
+    Columns cached before type details were loaded only have the base type, which is returned as is.
+    """
+    data_type = column['type']
+    if column.get('char_length'):
+        unit = " CHAR" if column.get('char_semantics') and data_type in ('CHAR', 'VARCHAR2') else ""
+        return f"{data_type}({column['char_length']}{unit})"
+    if column.get('data_length'):
+        return f"{data_type}({column['data_length']})"
+    precision, scale = column.get('precision'), column.get('scale')
+    if data_type == 'NUMBER':
+        if precision is not None:
+            return f"{data_type}({precision},{scale})" if scale else f"{data_type}({precision})"
+        if scale is not None:
+            return f"{data_type}(*,{scale})"
+    elif data_type == 'FLOAT' and precision is not None:
+        return f"{data_type}({precision})"
+    return data_type
+
+def _format_column_attributes(column: Dict[str, Any]) -> str:
+    """Default, virtual and identity flags and the comment of a column, for the detailed view"""
+    parts = []
+    if column.get('identity'):
+        parts.append(" IDENTITY")
+    elif column.get('virtual'):
+        parts.append(f" AS ({column['default']})" if column.get('default') else " VIRTUAL")
+    elif column.get('default'):
+        parts.append(f" DEFAULT {column['default']}")
+    if column.get('comment'):
+        parts.append(f" -- {column['comment']}")
+    return "".join(parts)
+
+def format_columns(columns: List[Dict[str, Any]], compact: bool = False,
+                   statistics: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
+    """Format column information, with option for compact representation for many columns.
+    
+    Per-column statistics, keyed by column name, defaults, virtual and identity flags and comments
+    are only shown in the detailed view.
+    """
     result = []
     
     if compact:
@@ -120,7 +290,7 @@ def format_columns(columns: List[Dict[str, Any]], compact: bool = False) -> List
         null_cols = []
         not_null_cols = []
         for column in columns:
-            col_str = f"{column['name']}({column['type']})"
+            col_str = f"{column['name']}({format_data_type(column)})"
             if column["nullable"]:
                 null_cols.append(col_str)
             else:
@@ -134,12 +304,15 @@ def format_columns(columns: List[Dict[str, Any]], compact: bool = False) -> List
         # Detailed view for fewer columns
         for column in columns:
             nullable = "NULL" if column["nullable"] else "NOT NULL"
-            result.append(f"  - {column['name']}: {column['type']} {nullable}")
+            line = f"  - {column['name']}: {format_data_type(column)} {nullable}"
+            if statistics and column['name'] in statistics:
+                line += _format_column_statistics(statistics[column['name']])
+            result.append(line + _format_column_attributes(column))
     
     return result
 
-def format_relationships(relationships: Dict[str, Dict[str, Any]]) -> List[str]:
-    """Format relationship information with smart grouping for larger sets."""
+def format_relationships(relationships: Dict[str, Dict[str, Any]], force_grouping: bool = False) -> List[str]:
+    """Format relationship information with smart grouping for larger sets, or always if force_grouping."""
     if not relationships:
         return []
     
@@ -182,7 +355,7 @@ def format_relationships(relationships: Dict[str, Dict[str, Any]]) -> List[str]:
     # Format outgoing relationships
     if outgoing:
         result.append("  References:")
-        if len(outgoing) < RELATIONSHIP_GROUPING_THRESHOLD:
+        if len(outgoing) < RELATIONSHIP_GROUPING_THRESHOLD and not force_grouping:
             # Simple list format for small sets
             for ref_table, rel in sorted(outgoing, key=lambda x: x[0]):
                 col_pattern = f"{rel['local_column']}->{rel['foreign_column']}"
@@ -195,7 +368,7 @@ def format_relationships(relationships: Dict[str, Dict[str, Any]]) -> List[str]:
     # Format incoming relationships
     if incoming:
         result.append("  Referenced by:")
-        if len(incoming) < RELATIONSHIP_GROUPING_THRESHOLD:
+        if len(incoming) < RELATIONSHIP_GROUPING_THRESHOLD and not force_grouping:
             # Simple list format for small sets
             for ref_table, rel in sorted(incoming, key=lambda x: x[0]):
                 col_pattern = f"{rel['local_column']}->{rel['foreign_column']}"
@@ -228,75 +401,84 @@ def _group_relationships(relationships: List[tuple]) -> List[Dict[str, Any]]:
     # If no groups found, fall back to simple grouping by column patterns
     return _group_by_column_patterns(relationships)
 
+# Naming patterns checked in priority order; compiled once into a single alternation so
+# each table name is classified with one regex search instead of one per pattern.
+COMMON_PATTERNS = [
+    (r'^HIST_', 'HIST_*'),
+    (r'^TMP_', 'TMP_*'),
+    (r'^BAK_', 'BAK_*'),
+    (r'^ARCH_', 'ARCH_*'),
+    (r'_HISTORY$', '*_HISTORY'),
+    (r'_ARCHIVE$', '*_ARCHIVE'),
+    (r'_BACKUP$', '*_BACKUP'),
+    (r'_\d{4,}$', '*_YYYY'),  # Tables with year suffixes
+    (r'_[A-Z]{2,3}$', '*_XX'),  # Tables with 2-3 letter suffixes
+]
+_PATTERN_DISPLAY = {f"p{i}": display for i, (_, display) in enumerate(COMMON_PATTERNS)}
+_PREFIX_RE = re.compile("|".join(
+    f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(COMMON_PATTERNS) if pattern.startswith('^')
+))
+_SUFFIX_RE = re.compile("|".join(
+    f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(COMMON_PATTERNS) if not pattern.startswith('^')
+))
+
+def _match_pattern(table: str) -> str:
+    """Return the display pattern for the first common pattern matching the table name, or ''."""
+    # Prefix patterns rank ahead of suffix patterns, and within each regex the alternatives
+    # keep their priority order, so this matches the first pattern in COMMON_PATTERNS.
+    match = _PREFIX_RE.match(table) or _SUFFIX_RE.search(table)
+    return _PATTERN_DISPLAY[match.lastgroup] if match else ''
+
 def _group_by_patterns(relationships: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """Group tables by common naming patterns like HIST_, TMP_, etc."""
-    common_patterns = {
-        r'^HIST_': 'HIST_*',
-        r'^TMP_': 'TMP_*',
-        r'^BAK_': 'BAK_*',
-        r'^ARCH_': 'ARCH_*',
-        r'_HISTORY$': '*_HISTORY',
-        r'_ARCHIVE$': '*_ARCHIVE',
-        r'_BACKUP$': '*_BACKUP',
-        r'_\d{4,}$': '*_YYYY',  # Tables with year suffixes
-        r'_[A-Z]{2,3}$': '*_XX',  # Tables with 2-3 letter suffixes
-    }
-    
-    groups = defaultdict(lambda: {'pattern': '', 'tables': [], 'column_patterns': set()})
+    groups: Dict[str, Dict[str, Any]] = {}
     unmatched = []
+    # Hub tables are often referenced many times by the same table, so classify each name once
+    classified: Dict[str, str] = {}
     
     for table, rel in relationships:
-        matched = False
-        for pattern, display in common_patterns.items():
-            if re.search(pattern, table):
-                col_pattern = f"{rel['local_column']}->{rel['foreign_column']}"
-                groups[display]['pattern'] = display
-                groups[display]['tables'].append((table, rel))
-                groups[display]['column_patterns'].add(col_pattern)
-                matched = True
-                break
-        if not matched:
+        display = classified.get(table)
+        if display is None:
+            display = classified[table] = _match_pattern(table)
+        if not display:
             unmatched.append((table, rel))
+            continue
+        group = groups.get(display)
+        if group is None:
+            group = groups[display] = {'pattern': display, 'tables': [], 'column_patterns': set()}
+        group['tables'].append((table, rel))
+        group['column_patterns'].add(f"{rel['local_column']}->{rel['foreign_column']}")
     
     # Process any unmatched relationships
     if unmatched:
-        unmatched_group = _group_by_prefix(unmatched)
-        return list(groups.values()) + unmatched_group
+        return list(groups.values()) + _group_by_prefix(unmatched)
     
     return list(groups.values())
 
 def _group_by_prefix(relationships: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
-    """Group tables by common prefixes."""
+    """Group tables by common prefixes in a single pass over the sorted relationships.
+    
+    Two sorted neighbours share a prefix of at least MIN_PREFIX_LENGTH exactly when their first
+    MIN_PREFIX_LENGTH characters are equal, so runs are detected by comparing that key alone.
+    Because the input is sorted, the common prefix of a whole run is the common prefix of its
+    first and last table, which keeps the whole pass linear in the number of relationships.
+    """
     groups = []
-    current_group = {
-        'pattern': '',
-        'tables': [],
-        'column_patterns': set()
-    }
+    current_group: Dict[str, Any] = {'pattern': '', 'tables': [], 'column_patterns': set()}
+    current_key = None
     
-    for i, (table, rel) in enumerate(relationships):
+    for table, rel in relationships:
         col_pattern = f"{rel['local_column']}->{rel['foreign_column']}"
+        key = table[:MIN_PREFIX_LENGTH] if len(table) >= MIN_PREFIX_LENGTH else None
         
-        if not current_group['tables']:
-            current_group['tables'].append((table, rel))
-            current_group['column_patterns'].add(col_pattern)
-            continue
+        if current_group['tables'] and (key is None or key != current_key):
+            _finalize_group(current_group)
+            groups.append(current_group)
+            current_group = {'pattern': '', 'tables': [], 'column_patterns': set()}
         
-        prev_table = current_group['tables'][-1][0]
-        common_prefix = _get_common_prefix([prev_table, table])
-        
-        if len(common_prefix) >= MIN_PREFIX_LENGTH:
-            current_group['tables'].append((table, rel))
-            current_group['column_patterns'].add(col_pattern)
-        else:
-            if current_group['tables']:
-                _finalize_group(current_group)
-                groups.append(current_group)
-            current_group = {
-                'pattern': '',
-                'tables': [(table, rel)],
-                'column_patterns': {col_pattern}
-            }
+        current_group['tables'].append((table, rel))
+        current_group['column_patterns'].add(col_pattern)
+        current_key = key
     
     if current_group['tables']:
         _finalize_group(current_group)
@@ -326,29 +508,36 @@ def _group_by_column_patterns(relationships: List[Tuple[str, Dict[str, Any]]]) -
     return result
 
 def _finalize_group(group: Dict[str, Any]) -> None:
-    """Finalize a group by setting its pattern based on its contents."""
-    if not group['tables']:
+    """Finalize a group by setting its pattern based on its contents.
+    
+    Expects the group's tables in sorted order, as produced by _group_by_prefix.
+    """
+    tables = group['tables']
+    if not tables:
         return
         
-    tables = [t[0] for t in group['tables']]
-    if len(group['tables']) == 1:
-        group['pattern'] = tables[0]
+    if len(tables) == 1:
+        group['pattern'] = tables[0][0]
     else:
-        common_prefix = _get_common_prefix(tables)
+        common_prefix = _get_common_prefix([tables[0][0], tables[-1][0]])
         if len(common_prefix) >= MIN_PREFIX_LENGTH:
             group['pattern'] = f"{common_prefix}*"
         else:
-            group['pattern'] = ", ".join(tables)
+            group['pattern'] = ", ".join(t[0] for t in tables)
 
 def _get_common_prefix(strings: List[str]) -> str:
-    """Find the longest common prefix among strings."""
+    """Find the longest common prefix among strings.
+    
+    Only the lexicographically smallest and largest strings need comparing: every other
+    string sorts between them and therefore shares at least their common prefix.
+    """
     if not strings:
         return ""
-    shortest = min(strings)
-    for i, char in enumerate(shortest):
-        if not all(s[i] == char for s in strings):
-            return shortest[:i]
-    return shortest
+    first, last = min(strings), max(strings)
+    for i, char in enumerate(first):
+        if last[i] != char:
+            return first[:i]
+    return first
 
 def _format_relationship_groups(groups: List[Dict[str, Any]], result: List[str]) -> None:
     """Format grouped relationships and append to result list."""
@@ -1,11 +1,23 @@
+import asyncio
+import gzip
+import hashlib
 import json
 import time
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from pathlib import Path
 import sys
-from typing import Dict, List, Set, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Set, Optional, Any
 
 from ..models import TableInfo, SchemaCache, SchemaManager as SchemaManagerProtocol
+from ..source import SourceIndex
+from ..dependencies import DependencyGraph
+from ..catalog import ObjectCatalog
+from ..tracing import trace_methods, traced
+from .snapshot import read_snapshot, table_loaded, write_snapshot
 
+@trace_methods("schema")
 class SchemaManager(SchemaManagerProtocol):
     def __init__(self, db_connector: Any, cache_path: Path):
         self.db_connector = db_connector
@@ -13,6 +25,9 @@ class SchemaManager(SchemaManagerProtocol):
         self.cache_base_path = cache_path
         # Actual cache file path will be set after we get the schema name
         self.cache_path = None
+        self.legacy_cache_path = None
+        # Whether table bodies and metadata in the snapshot are zlib-compressed
+        self.compress_cache = True
         self.cache: Optional[SchemaCache] = None
         self.cache_stats = {
             'hits': 0,
@@ -20,25 +35,62 @@ class SchemaManager(SchemaManagerProtocol):
             'last_full_refresh': time.time()
         }
         self.object_cache = {
-            'plsql': {},
             'constraints': {},
             'indexes': {},
             'types': {},
-            'related_tables': {}  # Added cache for related tables
+            'related_tables': {},  # Added cache for related tables
+            'source': {}  # LAST_DDL_TIME of each PL/SQL source stored in the source cache directory
         }
         self.ttl = {
             'plsql': 1800,        # 30 minutes
             'constraints': 3600,   # 1 hour
             'indexes': 3600,      # 1 hour
             'types': 3600,        # 1 hour
-            'related_tables': 1800 # 30 minutes - relationships might change more frequently
+            'related_tables': 1800, # 30 minutes - relationships might change more frequently
+            'source': 60,         # 1 minute - after this, LAST_DDL_TIME is re-checked before serving
+            'statistics': 3600,   # 1 hour - optimizer statistics, reloaded sooner once they are regathered
+            'source_index': 300,  # 5 minutes - between incremental refreshes of the source index
+            'dependencies': 1800, # 30 minutes - dependency graph reload, sooner if the schema changes
+            'schema_sync': 60,    # 1 minute - between checks of the schema DDL and statistics signatures
+            'plans': 3600         # 1 hour - cached execution plans, dropped sooner on DDL or statistics changes
         }
+        # Schema sync state: schema_version is bumped whenever the DDL signature changes,
+        # stats_version whenever optimizer statistics are regathered
+        self.schema_version = 0
+        self.schema_signature: Optional[str] = None
+        self.stats_version = 0
+        self.stats_signature: Optional[str] = None
+        self.last_schema_sync = 0.0
+        # Optimizer statistics for all tables with their signature and load time. They are large, so they are
+        # kept in their own file, written only when they are reloaded, rather than in the schema cache
+        self.table_statistics: Optional[Dict[str, Any]] = None
+        self._statistics_file_read = False
+        # Whole-schema dependency graph, loaded on first use
+        self.dependency_graph: Optional[DependencyGraph] = None
+        # Indexed catalog of all objects in the schema and when it was loaded, persisted in its own file
+        self.object_catalog: Optional[ObjectCatalog] = None
+        self.catalog_loaded_at = 0.0
+        self._catalog_file_read = False
+        # Full-text index over all PL/SQL source, loaded or built on first search
+        self.source_index: Optional[SourceIndex] = None
+        # Held while the source index is loaded or refreshed, so concurrent searches share one refresh
+        self._source_index_lock = asyncio.Lock()
+        # In-memory LRU of execution plans keyed by (SQL fingerprint, schema_version, stats_version)
+        self.plan_cache: OrderedDict = OrderedDict()
+        self.plan_cache_size = 256
+        # Source of the current time for TTL checks; workload replay substitutes the recorded call times
+        self.clock: Callable[[], float] = time.time
+        # Load or build of the schema cache in progress, shared by everyone waiting for it
+        self._cache_task: Optional[asyncio.Future] = None
+        # Tables looked up with direct queries while the cache was loading, merged into it once it is ready
+        self._early_tables: Dict[str, TableInfo] = {}
 
     async def _initialize_cache_path(self) -> None:
         """Initialize the cache file path using the schema name"""
         schema_name = await self.db_connector.get_effective_schema()
-        # Create schema-specific cache file name
-        self.cache_path = self.cache_base_path.parent / f"{schema_name.lower()}.json"
+        # Create schema-specific cache file name; caches written before the binary snapshot format are JSON
+        self.cache_path = self.cache_base_path.parent / f"{schema_name.lower()}.snapshot"
+        self.legacy_cache_path = self.cache_path.with_suffix('.json')
 
     async def build_schema_index(self) -> Dict[str, TableInfo]:
         """
@@ -56,7 +108,7 @@ class SchemaManager(SchemaManagerProtocol):
                 relationships={}, 
                 fully_loaded=False
             )
-            for table_name in all_table_names
+            for table_name in sorted(all_table_names)
         }
         
         return schema_index
@@ -70,26 +122,21 @@ class SchemaManager(SchemaManagerProtocol):
         if not force_rebuild and self.cache_path.exists():
             try:
                 print(f"Opening existing index file for schema: {self.cache_path.stem}...", file=sys.stderr)
-                with open(self.cache_path, 'r') as f:
-                    data = json.load(f)
-                    print("Loading index in memory...", file=sys.stderr)
-                    # Load main schema cache
-                    cache = SchemaCache(
-                        tables={k: TableInfo(**{**v, 'table_name': k}) for k, v in data['tables'].items()},
-                        last_updated=data['last_updated'],
-                        all_table_names=set(data.get('all_table_names', []))
-                    )
-                    
-                    # Load additional object caches if they exist
-                    if 'object_cache' in data:
-                        self.object_cache = data['object_cache']
-                    if 'cache_stats' in data:
-                        self.cache_stats = data['cache_stats']
-                    
-                    return cache
-            except (json.JSONDecodeError, KeyError) as e:
+                cache, object_cache, cache_stats = read_snapshot(self.cache_path)
+                self._restore_object_cache(object_cache)
+                self.cache_stats = cache_stats
+                return cache
+            except (OSError, ValueError, zlib.error, KeyError) as e:
+                # ValueError covers SnapshotError, JSONDecodeError and UnicodeDecodeError
                 print(f"Error loading cache: {e}", file=sys.stderr)
                 # Fall through to rebuild
+
+        if not force_rebuild and self.legacy_cache_path.exists():
+            cache = self._load_legacy_cache()
+            if cache is not None:
+                print("Converting index to the snapshot format...", file=sys.stderr)
+                await self.save_cache(cache)
+                return cache
         
         # Build new cache
         tables = await self.build_schema_index()
@@ -105,6 +152,38 @@ class SchemaManager(SchemaManagerProtocol):
         await self.save_cache(cache)
         return cache
 
+    def _load_legacy_cache(self) -> Optional[SchemaCache]:
+        """Load a cache written in the JSON format used before snapshots"""
+        try:
+            with open(self.legacy_cache_path, 'r') as f:
+                data = json.load(f)
+            print("Loading index in memory...", file=sys.stderr)
+            cache = SchemaCache(
+                tables={k: TableInfo(**{**v, 'table_name': k}) for k, v in data['tables'].items()},
+                last_updated=data['last_updated'],
+                all_table_names=set(data.get('all_table_names', []))
+            )
+            if 'object_cache' in data:
+                self._restore_object_cache(data['object_cache'])
+            if 'cache_stats' in data:
+                self.cache_stats = data['cache_stats']
+            return cache
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"Error loading cache: {e}", file=sys.stderr)
+            return None
+
+    def _restore_object_cache(self, object_cache: MutableMapping) -> None:
+        """
+        Take the object caches read from a cache file, without decoding them. Cache types added since the
+        file was written start out empty, and types no longer kept in the schema cache are dropped.
+        """
+        for cache_type in [cache_type for cache_type in object_cache if cache_type not in self.object_cache]:
+            del object_cache[cache_type]
+        for cache_type, entries in self.object_cache.items():
+            if cache_type not in object_cache:
+                object_cache[cache_type] = entries
+        self.object_cache = object_cache
+
     async def save_cache(self, cache: Optional[SchemaCache] = None) -> None:
         """Save the current cache to disk"""
         cache_to_save = cache or self.cache
@@ -113,22 +192,91 @@ class SchemaManager(SchemaManagerProtocol):
             
         print(f"Saving updated index to disk for schema: {self.cache_path.stem}...", file=sys.stderr)
         self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.cache_path, 'w') as f:
-            json.dump({
-                'tables': {k: v.__dict__ for k, v in cache_to_save.tables.items()},
-                'last_updated': cache_to_save.last_updated,
-                'all_table_names': list(cache_to_save.all_table_names),
-                'object_cache': self.object_cache,
-                'cache_stats': self.cache_stats
-            }, f, indent=2)
+        write_snapshot(self.cache_path, cache_to_save, self.object_cache, self.cache_stats,
+                       compress=self.compress_cache)
         print("Index saved!", file=sys.stderr)
 
+    @property
+    def cache_loading(self) -> bool:
+        """Whether the schema cache is being loaded or built in the background and is not available yet"""
+        return self.cache is None and self._cache_task is not None and not self._cache_task.done()
+
+    def start_loading(self, prepare: Optional[Callable[[], Awaitable[Any]]] = None) -> asyncio.Future:
+        """
+        Start loading or building the schema cache in a shared task, unless one is already running.
+        prepare, such as creating the connection pool, is awaited first within the task, so cache_loading
+        is true from this call on and lookups made meanwhile use direct queries instead of waiting.
+        """
+        if self._cache_task is None:
+            self._cache_task = asyncio.ensure_future(self._load_cache(prepare))
+        return self._cache_task
+
+    async def _load_cache(self, prepare: Optional[Callable[[], Awaitable[Any]]]) -> SchemaCache:
+        if prepare is not None:
+            await prepare()
+        return await self.load_or_build_cache()
+
+    async def ensure_cache(self) -> SchemaCache:
+        """Load or build the schema cache once, however many callers are waiting for it"""
+        if self.cache is not None:
+            return self.cache
+        task = self.start_loading()
+        try:
+            # Shielded so a cancelled caller does not abort the load for everyone else
+            cache = await asyncio.shield(task)
+        except Exception:
+            if task.done():
+                self._cache_task = None  # Let the next caller retry a failed load
+            raise
+        if self.cache is None:
+            self.cache = cache
+            await self._merge_early_tables()
+        return self.cache
+
+    def cancel_loading(self) -> None:
+        """Stop a load or build of the schema cache in progress, at shutdown"""
+        if self.cache_loading:
+            self._cache_task.cancel()
+
+    async def _merge_early_tables(self) -> None:
+        """Keep the tables loaded with direct queries while the cache was loading"""
+        if not self._early_tables:
+            return
+        for table_name, table_info in self._early_tables.items():
+            self.cache.tables[table_name] = table_info
+            self.cache.all_table_names.add(table_name)
+        self._early_tables = {}
+        await self.save_cache()
+
+    async def _load_table_directly(self, table_name: str) -> Optional[TableInfo]:
+        """Answer a table lookup with a direct query while the schema cache is still loading"""
+        table_info = self._early_tables.get(table_name)
+        self.record_cache_access('tables', table_info is not None)
+        if table_info is None:
+            table_details = await self.db_connector.load_table_details(table_name)
+            if not table_details:
+                return None
+            table_info = TableInfo(
+                table_name=table_name,
+                columns=table_details["columns"],
+                relationships=table_details["relationships"],
+                fully_loaded=True
+            )
+            if self.cache is not None:
+                # The cache became ready during the query and the early tables were already merged
+                self.cache.tables[table_name] = table_info
+                self.cache.all_table_names.add(table_name)
+                await self.save_cache()
+            else:
+                self._early_tables[table_name] = table_info
+        return table_info
+
     async def get_schema_info(self, table_name: str) -> Optional[TableInfo]:
         """Get schema information for a specific table, loading it if necessary"""
-        if not self.cache:
-            self.cache = await self.load_or_build_cache()
-            
         table_name = table_name.upper()
+        if self.cache_loading:
+            return await self._load_table_directly(table_name)
+        await self.ensure_cache()
         
         # Check if we know about this table
         if table_name not in self.cache.all_table_names:
@@ -137,11 +285,13 @@ class SchemaManager(SchemaManagerProtocol):
         # Check if we have the table in our cache
         if table_name not in self.cache.tables:
             self.cache.tables[table_name] = TableInfo(
+                table_name=table_name,
                 columns=[], 
                 relationships={}, 
                 fully_loaded=False
             )
             
+        self.record_cache_access('tables', self.cache.tables[table_name].fully_loaded)
         # If the table isn't fully loaded, load it now
         if not self.cache.tables[table_name].fully_loaded:
             print(f"Lazily loading details for table {table_name}...", file=sys.stderr)
@@ -170,16 +320,16 @@ class SchemaManager(SchemaManagerProtocol):
         Search for table names matching the search term.
         First searches in cache, then falls back to database search if needed.
         """
-        if not self.cache:
-            self.cache = await self.load_or_build_cache()
-            
         search_term = search_term.upper()
+        if self.cache_loading:
+            return (await self.db_connector.search_in_database(search_term, limit))[:limit]
+        await self.ensure_cache()
         
-        # First try exact/substring matches in cache
-        matching_tables = [
+        # First try exact/substring matches in cache, sorted so results do not depend on set order
+        matching_tables = sorted(
             table_name for table_name in self.cache.all_table_names
             if search_term in table_name
-        ]
+        )
         
         # If we don't have enough results, search in the database
         if len(matching_tables) < limit:
@@ -203,17 +353,17 @@ class SchemaManager(SchemaManagerProtocol):
 
     async def search_columns(self, search_term: str, limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
         """Search for columns matching the given pattern across all tables"""
-        if not self.cache:
-            await self.initialize()
+        # Searching uncached tables needs the full list of table names, so this waits for the cache
+        await self.ensure_cache()
             
         search_term = search_term.upper()
         result = {}
         
-        # First check in cached tables to avoid database queries for already loaded tables
-        for table_name, table_info in self.cache.tables.items():
-            if not table_info.fully_loaded:
-                continue
-                
+        # First check in cached tables to avoid database queries for already loaded tables; tables whose
+        # details were never loaded are skipped without decoding them
+        tables = self.cache.tables
+        for table_name in [name for name in tables if table_loaded(tables, name)]:
+            table_info = tables[table_name]
             for column in table_info.columns:
                 if search_term in column["name"].upper():
                     if table_name not in result:
@@ -222,10 +372,9 @@ class SchemaManager(SchemaManagerProtocol):
         
         # If we don't have enough results, search in uncached tables
         if len(result) < limit:
-            uncached_tables = [
-                t for t in self.cache.all_table_names 
-                if t not in self.cache.tables or not self.cache.tables[t].fully_loaded
-            ]
+            uncached_tables = sorted(
+                t for t in self.cache.all_table_names if not table_loaded(tables, t)
+            )
             
             if uncached_tables:
                 try:
@@ -253,8 +402,7 @@ class SchemaManager(SchemaManagerProtocol):
 
     async def initialize(self) -> None:
         """Initialize the database context and build initial cache"""
-        self.cache = await self.load_or_build_cache()
-        if not self.cache:
+        if not await self.ensure_cache():
             raise RuntimeError("Failed to initialize schema cache")
 
     def is_cache_valid(self, cache_type: str, key: str) -> bool:
@@ -263,7 +411,12 @@ class SchemaManager(SchemaManagerProtocol):
             key not in self.object_cache[cache_type] or 
             'timestamp' not in self.object_cache[cache_type][key]):
             return False
-        return (time.time() - self.object_cache[cache_type][key]['timestamp']) < self.ttl[cache_type]
+        return (self.clock() - self.object_cache[cache_type][key]['timestamp']) < self.ttl[cache_type]
+
+    def record_cache_access(self, cache_type: str, hit: bool) -> None:
+        """Count a cache lookup, both in the persisted totals and in the per-type server metrics"""
+        self.cache_stats['hits' if hit else 'misses'] += 1
+        self.db_connector.metrics.record_cache_access(cache_type, hit)
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -271,10 +424,13 @@ class SchemaManager(SchemaManagerProtocol):
             **self.cache_stats,
             'size': {
                 'tables': len(self.cache.tables) if self.cache else 0,
-                'plsql': len(self.object_cache['plsql']),
+                'plsql': len(self.object_catalog) if self.object_catalog else 0,
                 'constraints': len(self.object_cache['constraints']),
                 'indexes': len(self.object_cache['indexes']),
-                'types': len(self.object_cache['types'])
+                'types': len(self.object_cache['types']),
+                'source': len(self.object_cache['source']),
+                'plans': len(self.plan_cache),
+                'statistics': len(self.table_statistics['tables']) if self.table_statistics else 0
             }
         }
 
@@ -282,5 +438,288 @@ class SchemaManager(SchemaManagerProtocol):
         """Update cache with new data"""
         self.object_cache[cache_type][key] = {
             'data': data,
-            'timestamp': time.time()
-        }
\ No newline at end of file
+            'timestamp': self.clock()
+        }
+
+    def _source_cache_file(self, key: str) -> Optional[Path]:
+        """Get the compressed file holding the cached source for a key"""
+        if not self.cache_path:
+            return None
+        # Object names may contain characters that are not valid in file names
+        file_name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.gz'
+        return self.cache_path.parent / f"{self.cache_path.stem}_source" / file_name
+
+    def get_cached_source(self, key: str, last_ddl_time: Optional[str] = None) -> Optional[str]:
+        """
+        Read a cached PL/SQL source from disk.
+        If last_ddl_time is given, the cached copy is only returned if it was taken at that DDL time.
+        """
+        entry = self.object_cache['source'].get(key)
+        if not entry or (last_ddl_time is not None and entry['data']['last_ddl_time'] != last_ddl_time):
+            return None
+        
+        source_file = self._source_cache_file(key)
+        if not source_file:
+            return None
+        try:
+            with gzip.open(source_file, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except OSError as e:
+            print(f"Error reading cached source for {key}: {e}", file=sys.stderr)
+            self.object_cache['source'].pop(key, None)
+            return None
+
+    @traced("schema.store_source", method=True)
+    def store_source(self, key: str, last_ddl_time: str, source: str) -> None:
+        """Write a PL/SQL source to the compressed source cache and record its DDL time"""
+        source_file = self._source_cache_file(key)
+        if not source_file:
+            return
+        
+        source_file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(source_file, 'wt', encoding='utf-8') as f:
+            f.write(source)
+        self.update_cache('source', key, {'last_ddl_time': last_ddl_time})
+
+    def _source_index_file(self) -> Optional[Path]:
+        """Get the compressed file holding the persisted source index"""
+        if not self.cache_path:
+            return None
+        return self.cache_path.parent / f"{self.cache_path.stem}_source_index.json.gz"
+
+    def _load_source_index(self) -> SourceIndex:
+        """Load the persisted source index, or return an empty one"""
+        index_file = self._source_index_file()
+        if index_file and index_file.exists():
+            try:
+                print("Loading source index...", file=sys.stderr)
+                with gzip.open(index_file, 'rt', encoding='utf-8') as f:
+                    return SourceIndex.from_dict(json.load(f))
+            except (OSError, json.JSONDecodeError, ValueError) as e:
+                print(f"Error loading source index: {e}", file=sys.stderr)
+        return SourceIndex()
+
+    @traced("schema.save_source_index", method=True)
+    def _save_source_index(self) -> None:
+        """Persist the source index to disk"""
+        index_file = self._source_index_file()
+        if not index_file or self.source_index is None:
+            return
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(index_file, 'wt', encoding='utf-8') as f:
+            json.dump(self.source_index.to_dict(), f, separators=(',', ':'))
+
+    def _side_file(self, suffix: str) -> Optional[Path]:
+        """Get a compressed file kept beside the schema cache, named {schema}_{suffix}.json.gz"""
+        if not self.cache_path:
+            return None
+        return self.cache_path.parent / f"{self.cache_path.stem}_{suffix}.json.gz"
+
+    def _load_side_file(self, suffix: str, description: str) -> Optional[Any]:
+        """Load a side file of the schema cache, or None if it is missing or unreadable"""
+        side_file = self._side_file(suffix)
+        if side_file and side_file.exists():
+            try:
+                print(f"Loading {description} from disk...", file=sys.stderr)
+                with gzip.open(side_file, 'rt', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error loading {description}: {e}", file=sys.stderr)
+        return None
+
+    @traced("schema.save_side_file", method=True)
+    def _save_side_file(self, suffix: str, data: Any) -> None:
+        """
+        Persist data that is large and changes rarely beside the schema cache, so that it is not rewritten
+        with the schema cache on every lazy table load
+        """
+        side_file = self._side_file(suffix)
+        if not side_file:
+            return
+        side_file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(side_file, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), default=str)
+
+    async def refresh_source_index(self, force: bool = False) -> SourceIndex:
+        """
+        Bring the source index up to date.
+        The first build streams all_source for the whole schema in one query; later refreshes compare
+        LAST_DDL_TIME for every source object and only re-read objects that were created or recompiled.
+        Concurrent callers wait for a refresh in progress and then find the index current.
+        """
+        async with self._source_index_lock:
+            if self.cache_path is None:
+                await self._initialize_cache_path()
+            if self.source_index is None:
+                self.source_index = self._load_source_index()
+        
+            index = self.source_index
+            if not force and self.clock() - index.last_refresh < self.ttl['source_index']:
+                return index
+        
+            ddl_times = await self.db_connector.get_source_ddl_times()
+            changed = [
+                key for key, last_ddl_time in ddl_times.items()
+                if key not in index.objects or index.objects[key]['last_ddl_time'] != last_ddl_time
+            ]
+            removed = [key for key in index.objects if key not in ddl_times]
+        
+            if changed and (not index.objects or len(changed) > len(ddl_times) // 2):
+                print(f"Building source index for {len(ddl_times)} objects...", file=sys.stderr)
+                sources = await self.db_connector.fetch_all_source()
+            elif changed:
+                print(f"Refreshing source index for {len(changed)} changed objects...", file=sys.stderr)
+                sources = await self.db_connector.fetch_all_source(sorted({name for _, name in changed}))
+            else:
+                sources = {}
+        
+            for key in removed:
+                index.remove(key)
+            for key in changed:
+                index.add(key, ddl_times[key], sources.get(key, []))
+        
+            index.last_refresh = self.clock()
+            if changed or removed:
+                self._save_source_index()
+            return index
+
+    async def search_source(self, pattern: str, object_type: Optional[str] = None, regex: bool = False,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        """Search all PL/SQL source in the schema using the local source index"""
+        index = await self.refresh_source_index()
+        return index.search(pattern, object_type, regex, limit)
+
+    async def sync_schema_version(self, force: bool = False) -> int:
+        """
+        Check whether any DDL ran or statistics were gathered in the schema since the last check and return
+        the current schema version; stats_version is updated alongside it.
+        The check is a single aggregate query and runs at most once per schema_sync TTL unless forced.
+        """
+        if not force and self.clock() - self.last_schema_sync < self.ttl['schema_sync']:
+            return self.schema_version
+        
+        signatures = await self.db_connector.get_schema_signatures()
+        self.last_schema_sync = self.clock()
+        if signatures['ddl'] != self.schema_signature:
+            if self.schema_signature is not None:
+                self.schema_version += 1
+                print(f"Schema change detected, schema version is now {self.schema_version}", file=sys.stderr)
+            self.schema_signature = signatures['ddl']
+        if signatures['stats'] != self.stats_signature:
+            if self.stats_signature is not None:
+                self.stats_version += 1
+                print(f"Statistics change detected, statistics version is now {self.stats_version}", file=sys.stderr)
+            self.stats_signature = signatures['stats']
+        return self.schema_version
+
+    async def get_dependency_graph(self) -> DependencyGraph:
+        """Get the schema's dependency graph, reloading it if the schema changed or it has expired"""
+        version = await self.sync_schema_version()
+        graph = self.dependency_graph
+        if (graph is None or graph.version != version or
+                self.clock() - graph.loaded_at >= self.ttl['dependencies']):
+            print("Loading dependency graph...", file=sys.stderr)
+            rows = await self.db_connector.get_all_dependencies()
+            schema = await self.db_connector.get_effective_schema()
+            self.dependency_graph = graph = DependencyGraph(rows, schema, version, loaded_at=self.clock())
+        return graph
+
+    async def get_dependent_objects(self, object_name: str, depth: int = 1) -> List[Dict[str, Any]]:
+        """Get objects depending on object_name up to the given depth, served from the dependency graph"""
+        graph = await self.get_dependency_graph()
+        return graph.dependents_of(object_name, depth)
+
+    async def get_object_catalog(self) -> ObjectCatalog:
+        """
+        Get the catalog of all objects in the schema.
+        The catalog is reused while it is within its TTL and was taken at the current schema DDL signature;
+        otherwise it is reloaded with a single all_objects query. It is persisted in its own file when
+        reloaded, and read from it once after a restart.
+        """
+        await self.sync_schema_version()
+        if self.cache_path is None:
+            await self._initialize_cache_path()
+        if self.object_catalog is None and not self._catalog_file_read:
+            self._catalog_file_read = True
+            data = self._load_side_file('catalog', "object catalog")
+            if isinstance(data, dict):
+                self.object_catalog = ObjectCatalog(data['owner'], data['objects'], data['signature'])
+                self.catalog_loaded_at = data['timestamp']
+        
+        catalog = self.object_catalog
+        if (catalog is not None and catalog.signature == self.schema_signature and
+                self.clock() - self.catalog_loaded_at < self.ttl['plsql']):
+            self.record_cache_access('plsql', True)
+        else:
+            self.record_cache_access('plsql', False)
+            print("Loading object catalog...", file=sys.stderr)
+            data = {
+                'owner': await self.db_connector.get_effective_schema(),
+                'signature': self.schema_signature,
+                'objects': await self.db_connector.get_all_objects(),
+                'timestamp': self.clock()
+            }
+            self.object_catalog = catalog = ObjectCatalog(data['owner'], data['objects'], data['signature'])
+            self.catalog_loaded_at = data['timestamp']
+            self._save_side_file('catalog', data)
+        return catalog
+
+    async def get_table_statistics(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get optimizer statistics for a table, or None if the table has none.
+        Statistics for the whole schema are loaded in one pass and reused while within their TTL and taken
+        at the current statistics signature, so no table costs its own round trip. They are persisted in
+        their own file when reloaded, and read from it once after a restart.
+        """
+        await self.sync_schema_version()
+        if self.cache_path is None:
+            await self._initialize_cache_path()
+        if self.table_statistics is None and not self._statistics_file_read:
+            self._statistics_file_read = True
+            self.table_statistics = self._load_side_file('statistics', "optimizer statistics")
+        
+        snapshot = self.table_statistics
+        if (isinstance(snapshot, dict) and snapshot.get('signature') == self.stats_signature and
+                self.clock() - snapshot.get('timestamp', 0) < self.ttl['statistics']):
+            self.record_cache_access('statistics', True)
+        else:
+            self.record_cache_access('statistics', False)
+            print("Loading optimizer statistics...", file=sys.stderr)
+            self.table_statistics = snapshot = {
+                'signature': self.stats_signature,
+                'tables': await self.db_connector.get_schema_statistics(),
+                'timestamp': self.clock()
+            }
+            self._save_side_file('statistics', self.table_statistics)
+        return snapshot['tables'].get(table_name.upper())
+
+    def invalidate_schema_state(self) -> None:
+        """Drop caches derived from the whole schema so they are reloaded on next use"""
+        self.dependency_graph = None
+        self.object_catalog = None
+        self.table_statistics = None
+        self.plan_cache.clear()
+        self.last_schema_sync = 0.0
+
+    async def plan_cache_key(self, fingerprint: str) -> tuple:
+        """Key for a plan cache entry; plans cached before the last DDL or statistics change no longer match"""
+        await self.sync_schema_version()
+        return (fingerprint, self.schema_version, self.stats_version)
+
+    def get_cached_plan(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Get a cached execution plan if present and within its TTL"""
+        entry = self.plan_cache.get(key)
+        if entry is None:
+            return None
+        if self.clock() - entry['timestamp'] >= self.ttl['plans']:
+            del self.plan_cache[key]
+            return None
+        self.plan_cache.move_to_end(key)
+        return entry['data']
+
+    def store_plan(self, key: tuple, plan: Dict[str, Any]) -> None:
+        """Cache an execution plan, evicting the least recently used plans beyond plan_cache_size"""
+        self.plan_cache[key] = {'data': plan, 'timestamp': self.clock()}
+        self.plan_cache.move_to_end(key)
+        while len(self.plan_cache) > self.plan_cache_size:
+            self.plan_cache.popitem(last=False)
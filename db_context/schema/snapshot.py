@@ -0,0 +1,244 @@
+"""Binary snapshot of the schema cache, with table details and object caches decoded on first access.
+
+Startup only decodes the header, the metadata and the table name index; each table's columns
+and relationships, and each object cache type, stay encoded in the file's bytes until they are
+used. When a snapshot is saved, tables and object caches that were never decoded have their
+stored bytes copied as they are.
+
+Layout, integers little-endian:
+    header   magic, u16 version, u16 flags, u32 table count, u32 section count, u64 metadata length,
+             u64 names length
+    meta     JSON with last_updated, cache_stats and the object cache type of each section
+    names    table names joined by newlines, UTF-8
+    offsets  u64 per table then per section, start of its body relative to the first body
+    lengths  u32 per table then per section, length of its body, 0 for tables whose details were never loaded
+    bodies   JSON [columns, relationships] per loaded table, then the JSON entries of each object cache type
+With FLAG_COMPRESSED, meta and each body are zlib-compressed separately.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from abc import abstractmethod
+from array import array
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..models import SchemaCache, TableInfo
+
+MAGIC = b"OMCSNAP\x00"
+SNAPSHOT_VERSION = 2
+FLAG_COMPRESSED = 1
+_HEADER = struct.Struct('<8sHHIIQQ')
+# Fast compression, as the snapshot is rewritten whenever a table is lazily loaded
+COMPRESSION_LEVEL = 1
+
+class SnapshotError(ValueError):
+    """The file is not a schema snapshot this version can read"""
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+class _LazyBodies(MutableMapping):
+    """Name -> value mapping over bodies in a snapshot's bytes, decoding a body on first access"""
+
+    def __init__(self, names: List[str], data: memoryview, offsets: array, lengths: array,
+                 compressed: bool) -> None:
+        self._names = names
+        self._positions = {name: position for position, name in enumerate(names)}
+        self._data = data
+        self._offsets = offsets
+        self._lengths = lengths
+        self._compressed = compressed
+        # Decoded or assigned entries, which take precedence over the stored bodies
+        self._entries: Dict[str, Any] = {}
+        self._deleted: set = set()
+
+    @abstractmethod
+    def _decode(self, name: str, data: Any) -> Any:
+        """Value of an entry from its decoded JSON body"""
+
+    @abstractmethod
+    def _empty(self, name: str) -> Any:
+        """Value of an entry stored without a body"""
+
+    def raw_body(self, name: str) -> Optional[bytes]:
+        """Stored body of an entry that has not been decoded or replaced (empty without one), else None"""
+        position = self._positions.get(name)
+        if position is None or name in self._entries or name in self._deleted:
+            return None
+        start = self._offsets[position]
+        return bytes(self._data[start:start + self._lengths[position]])
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._entries:
+            return self._entries[name]
+        position = self._positions.get(name)
+        if position is None or name in self._deleted:
+            raise KeyError(name)
+        length = self._lengths[position]
+        if not length:
+            return self._empty(name)
+        start = self._offsets[position]
+        body = self._data[start:start + length]
+        entry = self._entries[name] = self._decode(
+            name, json.loads(zlib.decompress(body) if self._compressed else bytes(body)))
+        return entry
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._entries[name] = value
+        self._deleted.discard(name)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._entries.pop(name, None)
+        if name in self._positions:
+            self._deleted.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries or (name in self._positions and name not in self._deleted)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._names:
+            if name not in self._deleted:
+                yield name
+        for name in self._entries:
+            if name not in self._positions:
+                yield name
+
+    def __len__(self) -> int:
+        return len(self._names) - len(self._deleted) + sum(1 for name in self._entries if name not in self._positions)
+
+class LazyTables(_LazyBodies):
+    """
+    Table name -> TableInfo mapping over a snapshot's bytes, decoding a table's body on first access.
+    Tables stored without details are returned as new, not fully loaded TableInfo objects.
+    """
+
+    def _decode(self, name: str, data: Any) -> TableInfo:
+        columns, relationships = data
+        return TableInfo(table_name=name, columns=columns, relationships=relationships, fully_loaded=True)
+
+    def _empty(self, name: str) -> TableInfo:
+        return TableInfo(table_name=name, columns=[], relationships={}, fully_loaded=False)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the table's details are loaded, without decoding them"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry.fully_loaded
+        position = self._positions.get(name)
+        return position is not None and name not in self._deleted and self._lengths[position] > 0
+
+class LazySections(_LazyBodies):
+    """Object cache type -> entries mapping over a snapshot's bytes, decoding a cache type on first access"""
+
+    def _decode(self, name: str, data: Any) -> Dict[str, Any]:
+        return data
+
+    def _empty(self, name: str) -> Dict[str, Any]:
+        entry = self._entries[name] = {}
+        return entry
+
+def table_loaded(tables: Mapping[str, TableInfo], name: str) -> bool:
+    """Whether a table's details are loaded, without decoding a snapshot's stored table"""
+    if isinstance(tables, LazyTables):
+        return tables.is_loaded(name)
+    table_info = tables.get(name)
+    return table_info is not None and table_info.fully_loaded
+
+def write_snapshot(path: Path, cache: SchemaCache, object_cache: Mapping[str, Any], cache_stats: Dict[str, Any],
+                   compress: bool = True) -> None:
+    """Write the cache to path atomically; tables and object caches never decoded are copied without re-encoding"""
+    tables = cache.tables
+    names = list(tables)
+    names += sorted(cache.all_table_names.difference(names))
+    sections = list(object_cache)
+
+    def encode(data: Any) -> bytes:
+        encoded = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+        return zlib.compress(encoded, COMPRESSION_LEVEL) if compress else encoded
+
+    def stored(mapping: Mapping[str, Any], name: str) -> Optional[bytes]:
+        """Stored body of an entry read from a snapshot with the same compression, if it was never decoded"""
+        if isinstance(mapping, _LazyBodies) and mapping._compressed == compress:
+            return mapping.raw_body(name)
+        return None
+
+    bodies: List[bytes] = []
+    for name in names:
+        body = stored(tables, name)
+        if body is None:
+            table_info = tables.get(name)
+            if table_info is not None and table_info.fully_loaded:
+                body = encode([table_info.columns, table_info.relationships])
+            else:
+                body = b""
+        bodies.append(body)
+    for name in sections:
+        body = stored(object_cache, name)
+        bodies.append(body if body is not None else encode(object_cache[name]))
+
+    offsets, lengths = array('Q'), array('I')
+    position = 0
+    for body in bodies:
+        offsets.append(position)
+        lengths.append(len(body))
+        position += len(body)
+
+    meta = encode({'last_updated': cache.last_updated, 'cache_stats': cache_stats, 'sections': sections})
+    names_blob = "\n".join(names).encode('utf-8')
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION, FLAG_COMPRESSED if compress else 0, len(names),
+                             len(sections), len(meta), len(names_blob)))
+        f.write(meta)
+        f.write(names_blob)
+        f.write(_little_endian(offsets).tobytes())
+        f.write(_little_endian(lengths).tobytes())
+        f.writelines(bodies)
+    os.replace(temporary, path)
+
+def read_snapshot(path: Path) -> Tuple[SchemaCache, LazySections, Dict[str, Any]]:
+    """Read a snapshot as (cache, object_cache, cache_stats), leaving table bodies and object caches encoded"""
+    data = memoryview(Path(path).read_bytes())
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"{path} is too short to be a schema snapshot")
+    magic, version, flags, count, section_count, meta_length, names_length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a schema snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"{path} has snapshot version {version}, expected {SNAPSHOT_VERSION}")
+    compressed = bool(flags & FLAG_COMPRESSED)
+    entries = count + section_count
+    if len(data) < _HEADER.size + meta_length + names_length + 12 * entries:
+        raise SnapshotError(f"{path} is truncated")
+
+    position = _HEADER.size
+    meta_bytes = data[position:position + meta_length]
+    meta = json.loads(zlib.decompress(meta_bytes) if compressed else bytes(meta_bytes))
+    position += meta_length
+    names = str(data[position:position + names_length], 'utf-8').split("\n") if count else []
+    position += names_length
+    offsets, lengths = array('Q'), array('I')
+    offsets.frombytes(data[position:position + 8 * entries])
+    position += 8 * entries
+    lengths.frombytes(data[position:position + 4 * entries])
+    position += 4 * entries
+    sections = meta['sections']
+    if len(names) != count or len(sections) != section_count:
+        raise SnapshotError(f"{path} is truncated")
+
+    bodies = data[position:]
+    offsets, lengths = _little_endian(offsets), _little_endian(lengths)
+    if max(map(sum, zip(offsets, lengths)), default=0) > len(bodies):
+        raise SnapshotError(f"{path} is truncated")
+    tables = LazyTables(names, bodies, offsets[:count], lengths[:count], compressed)
+    object_cache = LazySections(sections, bodies, offsets[count:], lengths[count:], compressed)
+    cache = SchemaCache(tables=tables, last_updated=meta['last_updated'], all_table_names=set(names))
+    return cache, object_cache, meta['cache_stats']
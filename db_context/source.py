@@ -0,0 +1,299 @@
+"""Helpers for working with PL/SQL source text: line selection and the full-text source index."""
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Words and statement terminators of PL/SQL code, once comments and literals are blanked out
+_TOKEN_RE = re.compile(r'[A-Za-z_][\w$#]*|;')
+# Closing delimiters of q-quoted literals whose opening delimiter is a bracket
+_Q_QUOTE_CLOSERS = {'[': ']', '{': '}', '(': ')', '<': '>'}
+
+def _code_lines(lines: List[str]) -> List[str]:
+    """
+    Blank out comments, string literals and quoted identifiers, keeping every line's length so
+    positions in the result match the original lines. Block comments and literals may span lines.
+    """
+    result = []
+    closing: Optional[str] = None  # Text that ends the comment, literal or identifier we are in
+    for line in lines:
+        chars = list(line)
+        position = 0
+        while position < len(line):
+            if closing is not None:
+                found = line.find(closing, position)
+                # Inside a plain literal, a doubled quote is an escaped quote rather than the end
+                while closing == "'" and found != -1 and line.startswith("''", found):
+                    found = line.find(closing, found + 2)
+                stop = len(line) if found == -1 else found + len(closing)
+                chars[position:stop] = " " * (stop - position)
+                position = stop
+                if found != -1:
+                    closing = None
+                continue
+            char = line[position]
+            if line.startswith("--", position):
+                chars[position:] = " " * (len(line) - position)
+                break
+            if line.startswith("/*", position):
+                closing, skip = "*/", 2
+            elif char in "qQ" and line.startswith("'", position + 1) and position + 2 < len(line) and \
+                    (position == 0 or not (line[position - 1].isalnum() or line[position - 1] in "_$#")):
+                delimiter = line[position + 2]
+                closing, skip = _Q_QUOTE_CLOSERS.get(delimiter, delimiter) + "'", 3
+            elif char == "'":
+                closing, skip = "'", 1
+            elif char == '"':
+                closing, skip = '"', 1
+            else:
+                position += 1
+                continue
+            chars[position:position + skip] = " " * skip
+            position += skip
+        result.append("".join(chars))
+    return result
+
+def _subprogram_end(code: List[str], line_index: int, column: int) -> Optional[int]:
+    """
+    Find the line after the end of a subprogram, scanning its code from just after the name.
+
+    A declaration ends at its ';', as does a call spec (IS LANGUAGE ... or IS EXTERNAL ...). A body
+    ends at the END that closes its outermost BEGIN: blocks, CASE and nested subprograms are tracked,
+    and END IF / END LOOP close nothing that is counted. Returns None if the end is not found.
+    """
+    tokens = ((index, match.group(0).upper())
+              for index in range(line_index, len(code))
+              for match in _TOKEN_RE.finditer(code[index], column if index == line_index else 0))
+    # One entry per open unit; True while a subprogram or DECLARE block still awaits its BEGIN
+    stack: List[bool] = []
+    in_header = True  # Between PROCEDURE/FUNCTION and the ';' or IS/AS that ends its header
+    after_is = False
+    closing_end = False
+    for index, token in tokens:
+        if closing_end:
+            # The token after END says what it closes
+            closing_end = False
+            if token in ('IF', 'LOOP'):
+                continue
+            stack.pop()
+            if not stack:
+                return index + 1 if token == ';' else _statement_end(tokens, index)
+            if token == ';' or token == 'CASE':
+                continue
+        if after_is:
+            after_is = False
+            if token in ('LANGUAGE', 'EXTERNAL'):
+                # A call spec has no body; it ends at its ';' like a declaration
+                stack.pop()
+                if not stack:
+                    return _statement_end(tokens, index)
+                continue
+        if in_header:
+            if token == ';':
+                in_header = False
+                if not stack:
+                    return index + 1
+            elif token in ('IS', 'AS'):
+                in_header = False
+                stack.append(True)
+                after_is = True
+            continue
+        if token in ('PROCEDURE', 'FUNCTION'):
+            in_header = True
+        elif token == 'DECLARE':
+            stack.append(True)
+        elif token == 'BEGIN':
+            if stack and stack[-1]:
+                stack[-1] = False
+            else:
+                stack.append(False)
+        elif token == 'CASE':
+            stack.append(False)
+        elif token == 'END':
+            closing_end = True
+    return None
+
+def _statement_end(tokens: Iterator[Tuple[int, str]], index: int) -> int:
+    """Line after the next ';' in tokens, or after line index if there is none"""
+    for token_index, token in tokens:
+        if token == ';':
+            return token_index + 1
+    return index + 1
+
+def find_subprogram_ranges(lines: List[str], name: str) -> List[Tuple[int, int]]:
+    """
+    Find the line ranges of a procedure or function inside package or type source.
+
+    Declarations (package specs, forward declarations) end at their terminating ';', bodies end at
+    the END matching their BEGIN, with or without the name after it. Comments and literals are
+    ignored. If a body's end cannot be found, it runs to the next subprogram or the end of the
+    source. Overloads produce one range each.
+
+    Returns:
+        (start, end) pairs of 0-based line indexes, end exclusive, in source order.
+    """
+    quoted = re.escape(name.upper())
+    start_re = re.compile(rf'^\s*(?:PROCEDURE|FUNCTION)\s+{quoted}(?![\w$#])', re.IGNORECASE)
+    any_start_re = re.compile(r'^\s*(?:PROCEDURE|FUNCTION)\s', re.IGNORECASE)
+    # Quoted names are matched once the quotes around them are blanked out
+    code = _code_lines([_unquote_name(line, name) for line in lines])
+
+    ranges = []
+    index = 0
+    while index < len(lines):
+        header = start_re.match(code[index])
+        if not header:
+            index += 1
+            continue
+
+        end = _subprogram_end(code, index, header.end())
+        if end is None:
+            end = next((later for later in range(index + 1, len(lines)) if any_start_re.match(code[later])),
+                       len(lines))
+        ranges.append((index, end))
+        index = end
+
+    return ranges
+
+def _unquote_name(line: str, name: str) -> str:
+    """Replace a quoted occurrence of name with the bare name, so it survives blanking of quoted identifiers"""
+    return re.sub(rf'"({re.escape(name)})"', r' \1 ', line, flags=re.IGNORECASE)
+
+def select_source_lines(source: str, offset: int = 0, max_lines: Optional[int] = None,
+                        subprogram: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Select part of a source text by line offset and count, optionally within a named subprogram.
+
+    Args:
+        source: The complete source text.
+        offset: Number of lines to skip, counted from the start of the selected region.
+        max_lines: Maximum number of lines to return, or None for the rest of the region.
+        subprogram: Restrict the region to this procedure or function (all overloads).
+
+    Returns:
+        A dict with the selected 'source', the 1-based 'start_line' and 'end_line' it covers in the
+        full source, 'total_lines' of the full source, the 'remaining_lines' in the region and the
+        'next_offset' to continue from (None at the end) and, for subprograms, the 1-based 'ranges' found.
+        'source' is empty if the subprogram was not found or the offset is past the end.
+    """
+    lines = source.split("\n") if source else []
+    result: Dict[str, Any] = {'total_lines': len(lines)}
+
+    if subprogram:
+        ranges = find_subprogram_ranges(lines, subprogram)
+        result['ranges'] = [(start + 1, end) for start, end in ranges]
+        region = [index for start, end in ranges for index in range(start, end)]
+    else:
+        region = range(len(lines))
+
+    offset = max(offset, 0)
+    stop = len(region) if max_lines is None else min(len(region), offset + max(max_lines, 0))
+    selected = region[offset:stop]
+
+    result['source'] = "\n".join(lines[index] for index in selected)
+    result['start_line'] = selected[0] + 1 if len(selected) else 0
+    result['end_line'] = selected[-1] + 1 if len(selected) else 0
+    result['remaining_lines'] = len(region) - stop if len(selected) else 0
+    result['next_offset'] = stop if result['remaining_lines'] else None
+    return result
+
+class SourceIndex:
+    """
+    In-memory full-text index over PL/SQL source.
+
+    Each object's lines are kept alongside an inverted index from lowercase character trigrams to
+    the objects containing them. A substring search intersects the posting sets of the pattern's
+    trigrams and only scans the lines of the surviving candidate objects.
+    """
+
+    def __init__(self) -> None:
+        # (object_type, object_name) -> {'last_ddl_time': str, 'lines': List[str]}
+        self.objects: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.trigrams: Dict[str, Set[Tuple[str, str]]] = {}
+        self.last_refresh: float = 0.0
+
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        text = text.lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key: Tuple[str, str], last_ddl_time: Optional[str], lines: List[str]) -> None:
+        """Add or replace an object's source in the index"""
+        self.remove(key)
+        self.objects[key] = {'last_ddl_time': last_ddl_time, 'lines': lines}
+        for trigram in self._trigrams("\n".join(lines)):
+            self.trigrams.setdefault(trigram, set()).add(key)
+
+    def remove(self, key: Tuple[str, str]) -> None:
+        """Remove an object from the index if present"""
+        entry = self.objects.pop(key, None)
+        if not entry:
+            return
+        for trigram in self._trigrams("\n".join(entry['lines'])):
+            postings = self.trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self.trigrams[trigram]
+
+    def _candidates(self, pattern: str) -> List[Tuple[str, str]]:
+        """Objects that contain every trigram of the pattern, in name order"""
+        trigrams = self._trigrams(pattern)
+        if not trigrams:
+            return sorted(self.objects)
+        postings = sorted((self.trigrams.get(t, set()) for t in trigrams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(self, pattern: str, object_type: Optional[str] = None, regex: bool = False,
+               limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Find source lines matching a pattern.
+
+        Args:
+            pattern: Case-insensitive substring to look for, or a regular expression if regex is set.
+            object_type: Only search objects of this type.
+            regex: Treat the pattern as a case-insensitive regular expression (scans every object).
+            limit: Maximum number of line hits to return; must be at least 1.
+
+        Returns:
+            Hits as dicts with 'type', 'name', 'line' (1-based) and 'text', in object then line order.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be a positive number, got {limit}")
+        if regex:
+            matcher = re.compile(pattern, re.IGNORECASE).search
+            candidates = sorted(self.objects)
+        else:
+            needle = pattern.lower()
+            matcher = lambda text: needle in text.lower()
+            candidates = self._candidates(pattern)
+
+        hits = []
+        for key in candidates:
+            if object_type and key[0] != object_type:
+                continue
+            for number, text in enumerate(self.objects[key]['lines'], start=1):
+                if matcher(text):
+                    hits.append({'type': key[0], 'name': key[1], 'line': number, 'text': text})
+                    if len(hits) >= limit:
+                        return hits
+        return hits
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form of the index; trigram postings are rebuilt on load"""
+        return {
+            'last_refresh': self.last_refresh,
+            'objects': [[key[0], key[1], entry['last_ddl_time'], entry['lines']]
+                        for key, entry in self.objects.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SourceIndex':
+        index = cls()
+        for object_type, object_name, last_ddl_time, lines in data.get('objects', []):
+            index.add((object_type, object_name), last_ddl_time, lines)
+        index.last_refresh = data.get('last_refresh', 0.0)
+        return index
@@ -0,0 +1,283 @@
+"""Optimization analysis of parsed SQL statements, optionally grounded in cached table and index metadata."""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..models import TableInfo
+from .parser import ColumnRef, Operand, ParsedStatement, Predicate, QueryBlock, TableRef
+
+# Operators that can drive an index range scan when the other side is a constant
+_SARGABLE_OPERATORS = {'=', '<', '>', '<=', '>=', 'BETWEEN', 'IN', 'LIKE'}
+_CONSTANT_KINDS = ('literal', 'bind', 'subquery')
+_CHARACTER_TYPES = ('CHAR', 'VARCHAR', 'VARCHAR2', 'NCHAR', 'NVARCHAR2', 'CLOB', 'NCLOB')
+
+class _BlockScope:
+    """Resolves column references in one query block to (table name, column name)"""
+
+    def __init__(self, block: QueryBlock, tables: Dict[str, TableInfo]) -> None:
+        self.block = block
+        self.tables = tables
+        # qualifier -> source, where a source is referenced by its alias, or its name if it has none
+        self.sources: Dict[str, TableRef] = {table.label: table for table in block.tables}
+        self.labels = [table.label for table in block.tables]
+
+    def columns_of(self, table_name: Optional[str]) -> Optional[Set[str]]:
+        info = self.tables.get(table_name) if table_name else None
+        if info is None or not info.columns:
+            return None
+        return {column['name'] for column in info.columns}
+
+    def resolve(self, column: ColumnRef) -> Tuple[Optional[str], Optional[str]]:
+        """Return the (source label, table name) a column belongs to; label is None if unresolved"""
+        if column.qualifier is not None:
+            table = self.sources.get(column.qualifier)
+            return (table.label, table.name) if table else (None, None)
+        if len(self.block.tables) == 1:
+            table = self.block.tables[0]
+            return table.label, table.name
+        owners = [table for table in self.block.tables
+                  if column.column in (self.columns_of(table.name) or ())]
+        if len(owners) == 1:
+            return owners[0].label, owners[0].name
+        return None, None
+
+def _normalized(predicate: Predicate) -> Tuple[Operand, Optional[Operand]]:
+    """Put the column side of a comparison on the left, e.g. :id = t.id becomes t.id = :id"""
+    if predicate.right is not None and _is_constant(predicate.left) and \
+            predicate.right.kind in ('column', 'function', 'expression') and predicate.right.column:
+        return predicate.right, predicate.left
+    return predicate.left, predicate.right
+
+def _is_constant(operand: Optional[Operand]) -> bool:
+    """Whether an operand is fixed for the duration of the query, such as a literal, bind or SYSDATE - 1"""
+    return operand is not None and (operand.kind in _CONSTANT_KINDS or
+                                    (operand.kind == 'expression' and operand.column is None))
+
+def _is_leading_wildcard(operand: Optional[Operand]) -> bool:
+    return operand is not None and operand.kind == 'literal' and bool(operand.literal) and \
+        operand.literal.lstrip('nN').startswith(("'%", "'_"))
+
+def _syntax_suggestions(statement: ParsedStatement) -> List[str]:
+    """Suggestions that depend only on the statement's structure"""
+    suggestions = []
+    if any(block.select_star and block.depth == 0 for block in statement.blocks):
+        suggestions.append("Consider selecting only needed columns instead of SELECT *")
+
+    hints = " ".join(statement.hints).upper()
+    for block in statement.blocks:
+        for predicate in block.predicates:
+            left, right = _normalized(predicate)
+            if predicate.operator == 'LIKE' and _is_leading_wildcard(right):
+                suggestions.append(f"Leading wildcard in LIKE on {left.column or 'an expression'} prevents "
+                                   f"index range scans")
+            elif predicate.operator == 'IN' and right is not None and right.kind == 'subquery':
+                suggestions.append("Consider using EXISTS instead of IN with subqueries for better performance")
+            elif predicate.operator == 'NOT IN' and right is not None and right.kind == 'subquery':
+                suggestions.append(f"NOT IN with a subquery on {left.column or 'an expression'} returns no rows if "
+                                   f"the subquery yields a NULL; NOT EXISTS is safer and always allows an anti-join")
+
+        or_columns = {str(predicate.left.column) for predicate in block.predicates
+                      if predicate.in_or and predicate.left.column}
+        if block.has_or and len(or_columns) > 1:
+            suggestions.append("OR conditions across different columns may prevent index usage. "
+                               "Consider UNION ALL of separated queries")
+
+        source_count = len(block.tables)
+        if source_count > 4:
+            suggestions.append(f"Query joins {source_count} tables - consider reviewing join order and conditions")
+        if source_count > 3 and "LEADING" not in hints and "ORDERED" not in hints:
+            suggestions.append("Multi-table joins may benefit from LEADING hint to control join order")
+    return suggestions
+
+def _cartesian_suggestions(block: QueryBlock, scope: _BlockScope) -> List[str]:
+    """Report sources that no join predicate connects to the rest of the block"""
+    sources = block.tables
+    if len(sources) < 2:
+        return []
+    parent = {label: label for label in scope.labels}
+
+    def find(label: str) -> str:
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(first: str, second: str) -> None:
+        if first in parent and second in parent:
+            parent[find(first)] = find(second)
+
+    for first, second in block.joined_sources:
+        union(first, second)
+    for index, table in enumerate(sources):
+        # CROSS JOIN states the intent explicitly
+        if table.join_type == 'CROSS' and index > 0:
+            union(sources[index - 1].label, table.label)
+
+    for predicate in block.predicates:
+        labels = set()
+        for operand in (predicate.left, predicate.right):
+            if operand is None or operand.column is None:
+                continue
+            label, _ = scope.resolve(operand.column)
+            if label is not None:
+                labels.add(label)
+            elif operand.column.qualifier is None:
+                # An unqualified column we cannot place could be a join condition: don't guess
+                return []
+        labels = sorted(labels)
+        for label in labels[1:]:
+            union(labels[0], label)
+
+    groups: Dict[str, List[str]] = {}
+    for label in scope.labels:
+        groups.setdefault(find(label), []).append(label)
+    if len(groups) < 2:
+        return []
+    described = " / ".join(", ".join(group) for group in groups.values())
+    return [f"No join predicate connects {described}: this produces a cartesian product. "
+            f"Add the missing join condition, or use CROSS JOIN if it is intended"]
+
+class _IndexLookup:
+    """Answers which columns of a table are usable by its indexes"""
+
+    def __init__(self, indexes: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.indexes = indexes
+
+    def known(self, table_name: Optional[str]) -> bool:
+        return table_name in self.indexes
+
+    def supporting(self, table_name: str, column: str, filtered: Set[str]) -> Optional[str]:
+        """Name of an index that can drive a scan on column given the other filtered columns"""
+        for index in self.indexes.get(table_name, []):
+            columns = index.get('columns') or []
+            if column in columns and all(prior in filtered for prior in columns[:columns.index(column)]):
+                return index['name']
+        return None
+
+    def containing(self, table_name: str, column: str) -> Optional[Dict[str, Any]]:
+        for index in self.indexes.get(table_name, []):
+            if column in (index.get('columns') or []):
+                return index
+        return None
+
+def _column_type(tables: Dict[str, TableInfo], table_name: str, column: str) -> Optional[str]:
+    info = tables.get(table_name)
+    for entry in (info.columns if info else []):
+        if entry['name'] == column:
+            return entry.get('type')
+    return None
+
+def _schema_suggestions(block: QueryBlock, scope: _BlockScope, tables: Dict[str, TableInfo],
+                        lookup: _IndexLookup) -> List[str]:
+    """Suggestions for one block checked against the tables' columns and indexes"""
+    suggestions = []
+
+    # Columns compared for equality with constants, per table, so composite index prefixes can be honoured
+    filtered: Dict[str, Set[str]] = {}
+    for predicate in block.predicates:
+        left, right = _normalized(predicate)
+        if left.kind == 'column' and predicate.operator in ('=', 'IN') and _is_constant(right) and \
+                not predicate.in_or:
+            _, table_name = scope.resolve(left.column)
+            if table_name:
+                filtered.setdefault(table_name, set()).add(left.column.column)
+
+    # Per table: whether any filter can use an index, and the filter columns no index supports
+    indexed_access: Set[str] = set()
+    unindexed: Dict[str, List[str]] = {}
+    for predicate in block.predicates:
+        left, right = _normalized(predicate)
+        if left.column is None:
+            continue
+        _, table_name = scope.resolve(left.column)
+        if not table_name or table_name not in tables:
+            continue
+        column = left.column.column
+        qualified = f"{table_name}.{column}"
+        columns = scope.columns_of(table_name)
+        if columns is not None and column not in columns:
+            continue
+
+        # Join predicates: both sides columns of different known tables
+        if right is not None and right.kind == 'column':
+            _, right_table = scope.resolve(right.column)
+            if right_table and right_table != table_name and predicate.operator == '=' and \
+                    lookup.known(table_name) and lookup.known(right_table) and \
+                    not lookup.containing(table_name, column) and \
+                    not lookup.containing(right_table, right.column.column):
+                suggestions.append(f"Join on {qualified} = {right_table}.{right.column.column} has no index on "
+                                   f"either column; consider indexing the foreign key side")
+            continue
+
+        if not _is_constant(right):
+            continue
+
+        if left.kind in ('function', 'expression') and lookup.known(table_name):
+            index_name = lookup.supporting(table_name, column, filtered.get(table_name, set()))
+            if index_name:
+                wrapped = f"{left.function}({left.column})" if left.kind == 'function' else \
+                    f"An expression on {left.column}"
+                suggestions.append(f"{wrapped} prevents use of index {index_name} on {qualified}; compare the bare "
+                                   f"column (move the function to the other side) or create a function-based index")
+            continue
+
+        if left.kind != 'column':
+            continue
+
+        # Implicit conversion: a character column compared to a number converts the column
+        column_type = (_column_type(tables, table_name, column) or '').upper()
+        if right.kind == 'literal' and right.literal and right.literal.lstrip('+-')[:1].isdigit() and \
+                column_type.startswith(_CHARACTER_TYPES):
+            index = lookup.containing(table_name, column) if lookup.known(table_name) else None
+            suggestions.append(f"{qualified} is {column_type} but compared to the number {right.literal}; Oracle "
+                               f"applies TO_NUMBER to the column" +
+                               (f", which disables index {index['name']}" if index else "") +
+                               ". Quote the literal")
+            continue
+
+        if predicate.operator not in _SARGABLE_OPERATORS or not lookup.known(table_name):
+            continue
+        if predicate.operator == 'LIKE' and _is_leading_wildcard(right):
+            continue
+        if lookup.supporting(table_name, column, filtered.get(table_name, set())):
+            if not predicate.in_or:
+                indexed_access.add(table_name)
+            continue
+        index = lookup.containing(table_name, column)
+        if index:
+            prefix = index['columns'][:index['columns'].index(column)]
+            suggestions.append(f"{qualified} is only a non-leading column of index {index['name']} "
+                               f"({', '.join(index['columns'])}); without equality predicates on "
+                               f"{', '.join(prefix)} it can at best use a skip scan")
+        else:
+            unindexed.setdefault(table_name, [])
+            if column not in unindexed[table_name]:
+                unindexed[table_name].append(column)
+
+    for table_name, columns in unindexed.items():
+        if table_name in indexed_access:
+            continue
+        suggestions.append(f"No index supports the filter on {table_name} ({', '.join(columns)}); {table_name} will "
+                           f"be read with a full table scan. Consider an index on the most selective of these columns")
+    return suggestions
+
+def analyze_statement(statement: ParsedStatement, tables: Optional[Dict[str, TableInfo]] = None,
+                      indexes: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> List[str]:
+    """
+    Produce optimization suggestions for a parsed statement.
+
+    Args:
+        statement: The parsed statement.
+        tables: Metadata of the referenced tables by upper-case name, used to resolve unqualified columns
+            and check data types. Tables missing here are only checked structurally.
+        indexes: Indexes of the referenced tables by name, as returned by get_table_indexes.
+
+    Returns:
+        Suggestion strings without duplicates, structural ones first.
+    """
+    tables = tables or {}
+    lookup = _IndexLookup(indexes or {})
+    suggestions = _syntax_suggestions(statement)
+    for block in statement.blocks:
+        scope = _BlockScope(block, tables)
+        suggestions.extend(_cartesian_suggestions(block, scope))
+        suggestions.extend(_schema_suggestions(block, scope, tables, lookup))
+    return list(dict.fromkeys(suggestions))
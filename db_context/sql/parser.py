@@ -0,0 +1,614 @@
+"""
+Lightweight structural parser for Oracle SQL statements.
+
+This is not a full grammar: it recognizes query blocks, their FROM sources and the simple
+predicates in WHERE and ON clauses, which is what the optimization analysis needs. Anything it
+does not understand is skipped rather than rejected.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple, Union
+
+from .tokenizer import (Token, tokenize, WORD, QUOTED_IDENT, STRING, NUMBER, BIND, HINT, COMMENT,
+                        OP, PUNCT)
+
+# A parenthesized group of tokens; nested groups are nested lists
+Node = Union[Token, 'Group']
+
+class Group(list):
+    """Tokens between a pair of parentheses, with nested parentheses as nested Groups"""
+
+# Keywords that end a FROM clause or start another clause at the same level
+_CLAUSE_KEYWORDS = {'SELECT', 'FROM', 'WHERE', 'GROUP', 'HAVING', 'ORDER', 'CONNECT', 'START', 'UNION',
+                    'INTERSECT', 'MINUS', 'EXCEPT', 'FETCH', 'OFFSET', 'FOR', 'MODEL', 'WINDOW',
+                    'RETURNING', 'RETURN', 'LOG', 'SET', 'VALUES', 'INTO', 'USING', 'WHEN'}
+_SET_OPERATORS = {'UNION', 'INTERSECT', 'MINUS', 'EXCEPT'}
+_JOIN_WORDS = {'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS', 'NATURAL'}
+_COMPARISON_OPERATORS = {'=', '<>', '!=', '^=', '<', '>', '<=', '>='}
+# Words that look like identifiers in an operand but are not column references
+_NON_COLUMN_WORDS = {'NULL', 'SYSDATE', 'SYSTIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIMESTAMP', 'USER', 'ROWNUM',
+                     'ROWID', 'LEVEL', 'TRUE', 'FALSE', 'DATE', 'TIMESTAMP', 'INTERVAL', 'PRIOR', 'DISTINCT',
+                     'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'NOT', 'AND', 'OR', 'IS', 'IN', 'LIKE', 'BETWEEN',
+                     'EXISTS', 'ANY', 'ALL', 'SOME', 'ESCAPE', 'DUAL'}
+# Keywords and pseudo-columns that can appear unqualified inside expressions without being column names
+_EXPRESSION_KEYWORDS = _NON_COLUMN_WORDS | {
+    'AS', 'ASC', 'DESC', 'NULLS', 'FIRST', 'LAST', 'OVER', 'PARTITION', 'BY', 'ORDER', 'ROWS', 'RANGE', 'GROUPS',
+    'UNBOUNDED', 'PRECEDING', 'FOLLOWING', 'CURRENT', 'ROW', 'DAY', 'MONTH', 'YEAR', 'HOUR', 'MINUTE', 'SECOND',
+    'TO', 'WITH', 'TIME', 'ZONE', 'LOCAL', 'AT', 'KEEP', 'WITHIN', 'GROUP', 'FROM', 'FOR', 'USING', 'ON',
+    'LEADING', 'TRAILING', 'BOTH', 'OVERFLOW', 'TRUNCATE', 'ERROR', 'WITHOUT', 'COUNT', 'DEFAULT', 'RETURNING',
+    'MEMBER', 'OF', 'SUBMULTISET', 'MULTISET', 'TYPE', 'ONLY', 'SIBLINGS', 'NOCYCLE', 'COLLATE', 'SEPARATOR',
+    'UID', 'LOCALTIMESTAMP', 'DBTIMEZONE', 'SESSIONTIMEZONE', 'ORA_ROWSCN', 'COLUMN_VALUE', 'OBJECT_VALUE',
+    'CONNECT_BY_ROOT', 'CONNECT_BY_ISLEAF', 'CONNECT_BY_ISCYCLE', 'SET', 'EMPTY', 'FORMAT', 'JSON',
+    'WRAPPER', 'CONDITIONAL', 'UNCONDITIONAL', 'ARRAY', 'EXCLUDE', 'TIES', 'PERCENT'}
+# Constructs that introduce columns the parser does not track
+_UNTRACKED_COLUMN_WORDS = {'PIVOT', 'UNPIVOT', 'MODEL', 'MATCH_RECOGNIZE', 'JSON_TABLE', 'XMLTABLE', 'LATERAL',
+                           'TABLE', 'APPLY'}
+_ALIAS_STOP_WORDS = _CLAUSE_KEYWORDS | _JOIN_WORDS | {'ON', 'PARTITION', 'SAMPLE', 'AS', 'LATERAL', 'PIVOT',
+                                                      'UNPIVOT', 'WITH', 'CONNECT', 'START'}
+
+@dataclass
+class ColumnRef:
+    """A column reference; qualifier is the alias or table name it was written with, if any"""
+    column: str
+    qualifier: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.qualifier}.{self.column}" if self.qualifier else self.column
+
+@dataclass
+class Operand:
+    """One side of a predicate"""
+    kind: str                            # 'column', 'function', 'literal', 'bind', 'subquery' or 'expression'
+    column: Optional[ColumnRef] = None   # The column for 'column', or the wrapped column for 'function'
+    function: Optional[str] = None       # Function name for 'function'
+    literal: Optional[str] = None        # Literal text for 'literal'
+
+@dataclass
+class Predicate:
+    """A simple comparison from a WHERE or ON clause"""
+    operator: str                        # '=', '<', 'LIKE', 'NOT IN', 'BETWEEN', 'IS NULL', ...
+    left: Operand
+    right: Optional[Operand] = None      # First operand on the right; None for IS [NOT] NULL
+    in_or: bool = False                  # Whether the predicate is one branch of an OR
+    clause: str = 'WHERE'                # 'WHERE' or 'ON'
+
+@dataclass
+class TableRef:
+    """A source in a FROM clause; name is None for inline views and table functions"""
+    name: Optional[str]
+    alias: Optional[str] = None
+    schema: Optional[str] = None
+    join_type: Optional[str] = None      # None for the first source or comma joins, 'CROSS', 'NATURAL', 'INNER', ...
+
+    @property
+    def label(self) -> str:
+        """The name this source is referenced by inside its query block"""
+        return self.alias or self.name or '<inline view>'
+
+@dataclass
+class QueryBlock:
+    """A single SELECT (or the DML statement itself) with its sources and predicates"""
+    tables: List[TableRef] = field(default_factory=list)
+    predicates: List[Predicate] = field(default_factory=list)
+    # Pairs of source labels joined by USING or NATURAL (column pairs are in predicates)
+    joined_sources: List[Tuple[str, str]] = field(default_factory=list)
+    # Every column reference in the block's own clauses (not its subqueries); '*' for qualified t.*
+    columns: List[ColumnRef] = field(default_factory=list)
+    # Column aliases defined in the select list
+    aliases: Set[str] = field(default_factory=set)
+    select_star: bool = False
+    has_or: bool = False
+    # Whether the block uses PIVOT, MODEL, lateral joins or similar constructs that create new columns
+    untracked_columns: bool = False
+    depth: int = 0                       # 0 for the outermost block, +1 per level of subquery nesting
+    # The block this one is nested in, for resolving correlated references
+    outer: Optional['QueryBlock'] = field(default=None, repr=False, compare=False)
+
+@dataclass
+class ParsedStatement:
+    """The query blocks of a statement in the order they appear in the text"""
+    statement_type: str
+    blocks: List[QueryBlock] = field(default_factory=list)
+    hints: List[str] = field(default_factory=list)
+    cte_names: Set[str] = field(default_factory=set)
+    # Lexical problems found while parsing, such as unbalanced parentheses or unterminated literals
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def tables(self) -> List[TableRef]:
+        """All named sources in the statement, excluding references to WITH clause queries"""
+        return [table for block in self.blocks for table in block.tables
+                if table.name and not (table.schema is None and table.name in self.cte_names)]
+
+def _group_tokens(tokens: List[Token], problems: List[str]) -> Group:
+    """Nest tokens by parentheses; unbalanced parentheses are reported to problems and tolerated"""
+    root = Group()
+    stack = [root]
+    for token in tokens:
+        if token.kind == PUNCT and token.value == '(':
+            group = Group()
+            stack[-1].append(group)
+            stack.append(group)
+        elif token.kind == PUNCT and token.value == ')':
+            if len(stack) > 1:
+                stack.pop()
+            else:
+                problems.append(f"Unmatched ')' at position {token.position}")
+        else:
+            stack[-1].append(token)
+    if len(stack) > 1:
+        problems.append(f"{len(stack) - 1} unclosed '('")
+    return root
+
+def _is_word(node: Node, *values: str) -> bool:
+    return isinstance(node, Token) and node.kind == WORD and (not values or node.value in values)
+
+def _is_punct(node: Node, value: str) -> bool:
+    return isinstance(node, Token) and node.kind == PUNCT and node.value == value
+
+def _is_identifier(node: Node) -> bool:
+    return isinstance(node, Token) and node.kind in (WORD, QUOTED_IDENT)
+
+def _is_subquery(node: Node) -> bool:
+    return isinstance(node, Group) and bool(node) and (_is_word(node[0], 'SELECT', 'WITH') or
+                                                       (isinstance(node[0], Group) and _is_subquery(node[0])))
+
+def _split(nodes: List[Node], separator) -> List[List[Node]]:
+    """Split a node list wherever separator(node) is true"""
+    parts: List[List[Node]] = [[]]
+    for node in nodes:
+        if separator(node):
+            parts.append([])
+        else:
+            parts[-1].append(node)
+    return parts
+
+class _Parser:
+    def __init__(self, statement: ParsedStatement) -> None:
+        self.statement = statement
+        # Blocks currently being parsed, innermost last
+        self.stack: List[QueryBlock] = []
+
+    def parse_statement(self, nodes: List[Node], depth: int = 0) -> None:
+        """Parse a statement or subquery body, which may be a set operation over several blocks"""
+        nodes = self._parse_with(nodes, depth)
+        while len(nodes) == 1 and _is_subquery(nodes[0]):
+            nodes = self._parse_with(list(nodes[0]), depth)
+        if not nodes:
+            return
+        for branch in _split(nodes, lambda node: _is_word(node, *_SET_OPERATORS)):
+            # "UNION ALL" leaves ALL at the start of the next branch
+            if branch and _is_word(branch[0], 'ALL', 'DISTINCT'):
+                branch = branch[1:]
+            if len(branch) == 1 and _is_subquery(branch[0]):
+                self.parse_statement(list(branch[0]), depth)
+            elif branch:
+                self.parse_block(branch, depth)
+
+    def _parse_with(self, nodes: List[Node], depth: int) -> List[Node]:
+        """Consume a leading WITH clause, parsing each named query, and return the remaining nodes"""
+        if not nodes or not _is_word(nodes[0], 'WITH'):
+            return nodes
+        index = 1
+        while index < len(nodes):
+            node = nodes[index]
+            if _is_identifier(node) and index + 1 < len(nodes):
+                # name [(columns)] AS (query)
+                name = node.value
+                index += 1
+                if isinstance(nodes[index], Group) and not _is_subquery(nodes[index]):
+                    index += 1
+                if index < len(nodes) and _is_word(nodes[index], 'AS'):
+                    index += 1
+                if index < len(nodes) and isinstance(nodes[index], Group):
+                    self.statement.cte_names.add(name)
+                    self.parse_statement(list(nodes[index]), depth + 1)
+                    index += 1
+                if index < len(nodes) and _is_punct(nodes[index], ','):
+                    index += 1
+                    continue
+            return nodes[index:]
+        return []
+
+    def parse_block(self, nodes: List[Node], depth: int) -> None:
+        """Parse one query block: SELECT ... FROM ... WHERE ..., or an UPDATE / DELETE / INSERT / MERGE"""
+        block = QueryBlock(depth=depth, outer=self.stack[-1] if self.stack else None)
+        self.statement.blocks.append(block)
+        self.stack.append(block)
+        try:
+            self._parse_block_clauses(nodes, block, depth)
+        finally:
+            self.stack.pop()
+
+    def _parse_block_clauses(self, nodes: List[Node], block: QueryBlock, depth: int) -> None:
+        block.untracked_columns = any(_is_word(node, *_UNTRACKED_COLUMN_WORDS) for node in nodes)
+        clauses = self._clauses(nodes)
+
+        if 'SELECT' in clauses:
+            select_list = clauses['SELECT']
+            for item in _split(select_list, lambda node: _is_punct(node, ',')):
+                item = [node for node in item if not (isinstance(node, Token) and node.kind in (HINT, COMMENT))]
+                if item and isinstance(item[-1], Token) and item[-1].kind == OP and item[-1].value == '*':
+                    block.select_star = True
+                # "expr alias" or "expr AS alias"
+                if len(item) > 1 and _is_identifier(item[-1]) and not _is_punct(item[-2], '.') and \
+                        not (isinstance(item[-2], Token) and item[-2].kind == OP) and \
+                        not _is_word(item[-2], 'DISTINCT', 'UNIQUE', 'ALL', 'PRIOR', 'NOT', 'CONNECT_BY_ROOT'):
+                    block.aliases.add(item[-1].value)
+                    item = item[:-2] if _is_word(item[-2], 'AS') else item[:-1]
+                self._collect_columns(item, block)
+            self._parse_nested(select_list, depth)
+        if 'FROM' in clauses:
+            self._parse_from(clauses['FROM'], block, depth)
+        if 'UPDATE' in clauses:
+            self._parse_from(clauses['UPDATE'], block, depth)
+            self._collect_columns(clauses.get('SET', []), block)
+            self._parse_nested(clauses.get('SET', []), depth)
+        if 'INTO' in clauses and 'INSERT' in clauses:
+            # The target table, then its column list
+            target = []
+            for node in clauses['INTO']:
+                if isinstance(node, Group):
+                    self._collect_columns(list(node), block)
+                    break
+                target.append(node)
+            self._parse_from(target, block, depth)
+        elif 'INTO' in clauses and 'MERGE' in clauses:
+            self._parse_from(clauses['INTO'], block, depth)
+        if 'WHERE' in clauses:
+            self._collect_columns(clauses['WHERE'], block)
+            self._parse_condition(clauses['WHERE'], block, 'WHERE', depth)
+        for name in ('GROUP', 'HAVING', 'ORDER', 'CONNECT', 'START'):
+            self._collect_columns(clauses.get(name, []), block)
+        for name in ('GROUP', 'HAVING', 'ORDER', 'CONNECT', 'START', 'VALUES'):
+            self._parse_nested(clauses.get(name, []), depth)
+        # INSERT ... SELECT: the query follows the target
+        if 'INSERT' in clauses and 'SELECT_BODY' in clauses:
+            self.parse_statement(clauses['SELECT_BODY'], depth)
+
+    def _clauses(self, nodes: List[Node]) -> dict:
+        """Split a block into its top-level clauses keyed by leading keyword"""
+        clauses: dict = {}
+        current = None
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            keyword = node.value if _is_word(node) else None
+            if keyword in ('INSERT', 'MERGE') and current is None:
+                clauses[keyword] = []
+                current = keyword
+            elif keyword == 'SELECT' and current in ('INTO', 'INSERT'):
+                clauses['SELECT_BODY'] = nodes[index:]
+                break
+            elif keyword in ('SELECT', 'FROM', 'WHERE', 'HAVING', 'SET', 'VALUES') or \
+                    (keyword == 'UPDATE' and current is None) or \
+                    (keyword == 'DELETE' and current is None) or \
+                    (keyword == 'INTO' and current in ('INSERT', 'MERGE')):
+                current = keyword if keyword != 'DELETE' else 'FROM'
+                clauses.setdefault(current, [])
+                # DELETE [FROM] table
+                if keyword == 'DELETE' and index + 1 < len(nodes) and _is_word(nodes[index + 1], 'FROM'):
+                    index += 1
+            elif keyword in ('GROUP', 'ORDER', 'CONNECT', 'START') and index + 1 < len(nodes) and \
+                    _is_word(nodes[index + 1], 'BY', 'WITH', 'SIBLINGS'):
+                current = keyword
+                clauses.setdefault(current, [])
+            elif keyword in ('FETCH', 'OFFSET', 'FOR', 'RETURNING', 'RETURN', 'LOG', 'MODEL', 'WINDOW'):
+                current = None
+            elif current is not None:
+                clauses[current].append(node)
+            index += 1
+        return clauses
+
+    def _collect_columns(self, nodes: List[Node], block: QueryBlock) -> None:
+        """Record the column references in an expression list, skipping function names, keywords and subqueries"""
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            if isinstance(node, Group):
+                if not _is_subquery(node):
+                    self._collect_columns(list(node), block)
+                index += 1
+                continue
+            if not _is_identifier(node):
+                index += 1
+                continue
+            # Words following AS (CAST targets) or COLLATE are types and collations, not columns
+            if index > 0 and _is_word(nodes[index - 1], 'AS', 'COLLATE', 'RETURNING'):
+                index += 1
+                continue
+
+            names = [node]
+            end = index + 1
+            while end + 1 < len(nodes) and _is_punct(nodes[end], '.') and _is_identifier(nodes[end + 1]):
+                names.append(nodes[end + 1])
+                end += 2
+            star = end + 1 < len(nodes) and _is_punct(nodes[end], '.') and \
+                isinstance(nodes[end + 1], Token) and nodes[end + 1].value == '*'
+            is_call = end < len(nodes) and isinstance(nodes[end], Group)
+            index = end + 2 if star else end
+
+            if is_call or names[-1].value in ('NEXTVAL', 'CURRVAL'):
+                continue
+            if star:
+                block.columns.append(ColumnRef(column='*', qualifier=names[-1].value))
+            elif len(names) > 1:
+                block.columns.append(ColumnRef(column=names[-1].value, qualifier=names[-2].value))
+            elif names[0].kind == QUOTED_IDENT or names[0].value not in _EXPRESSION_KEYWORDS:
+                block.columns.append(ColumnRef(column=names[0].value))
+
+    def _parse_nested(self, nodes: List[Node], depth: int) -> None:
+        """Parse subqueries appearing anywhere in an expression list"""
+        for node in nodes:
+            if isinstance(node, Group):
+                if _is_subquery(node):
+                    self.parse_statement(list(node), depth + 1)
+                else:
+                    self._parse_nested(node, depth)
+
+    def _parse_from(self, nodes: List[Node], block: QueryBlock, depth: int) -> None:
+        """Parse a FROM clause into sources, join conditions and USING / NATURAL join pairs"""
+        index = 0
+        join_type: Optional[str] = None
+        pending_join_words: List[str] = []
+        previous: Optional[TableRef] = None
+        while index < len(nodes):
+            node = nodes[index]
+            if _is_punct(node, ','):
+                join_type, pending_join_words = None, []
+                index += 1
+                continue
+            if _is_word(node, *_JOIN_WORDS):
+                if node.value == 'JOIN':
+                    words = [word for word in pending_join_words if word != 'OUTER']
+                    join_type = words[0] if words else 'INNER'
+                    pending_join_words = []
+                else:
+                    pending_join_words.append(node.value)
+                index += 1
+                continue
+            if _is_word(node, 'ON'):
+                end = index + 1
+                while end < len(nodes) and not (_is_punct(nodes[end], ',') or
+                                                _is_word(nodes[end], 'WHEN', *_JOIN_WORDS)):
+                    end += 1
+                self._collect_columns(nodes[index + 1:end], block)
+                self._parse_condition(nodes[index + 1:end], block, 'ON', depth)
+                index = end
+                continue
+            if _is_word(node, 'USING'):
+                if index + 1 < len(nodes) and isinstance(nodes[index + 1], Group) and \
+                        not _is_subquery(nodes[index + 1]):
+                    if previous is not None and len(block.tables) > 1:
+                        block.joined_sources.append((block.tables[-2].label, previous.label))
+                    index += 2
+                else:
+                    # MERGE INTO target USING source ON (...)
+                    join_type = 'MERGE'
+                    index += 1
+                continue
+            if _is_word(node, 'WHEN'):
+                break
+            if _is_word(node, 'LATERAL'):
+                index += 1
+                continue
+
+            # A source: [schema.]name[@dblink] | (subquery) | TABLE(...), then an optional alias
+            table = None
+            if _is_subquery(node):
+                self.parse_statement(list(node), depth + 1)
+                table = TableRef(name=None)
+                index += 1
+            elif _is_word(node, 'TABLE', 'XMLTABLE', 'JSON_TABLE') and index + 1 < len(nodes) and \
+                    isinstance(nodes[index + 1], Group):
+                self._parse_nested(nodes[index + 1], depth)
+                table = TableRef(name=None)
+                index += 2
+            elif isinstance(node, Group):
+                # Parenthesized join: treat its contents as part of this FROM clause
+                self._parse_from(list(node), block, depth)
+                index += 1
+                continue
+            elif _is_identifier(node):
+                names = [node.value]
+                index += 1
+                while index + 1 < len(nodes) and _is_punct(nodes[index], '.') and _is_identifier(nodes[index + 1]):
+                    names.append(nodes[index + 1].value)
+                    index += 2
+                # Skip a database link
+                if index + 1 < len(nodes) and isinstance(nodes[index], Token) and nodes[index].value == '@':
+                    index += 2
+                    while index + 1 < len(nodes) and _is_punct(nodes[index], '.'):
+                        index += 2
+                table = TableRef(name=names[-1], schema=names[-2] if len(names) > 1 else None)
+            else:
+                index += 1
+                continue
+
+            # Skip PARTITION (...), SAMPLE (...) and similar modifiers before the alias
+            while index < len(nodes) and _is_word(nodes[index], 'PARTITION', 'SUBPARTITION', 'SAMPLE', 'SEED',
+                                                  'BLOCK', 'AS', 'VERSIONS', 'FOR'):
+                if _is_word(nodes[index], 'AS') and index + 1 < len(nodes) and _is_word(nodes[index + 1], 'OF'):
+                    index += 2
+                    while index < len(nodes) and not _is_identifier(nodes[index]):
+                        index += 1
+                    index += 1
+                    continue
+                index += 1
+                if index < len(nodes) and isinstance(nodes[index], Group):
+                    index += 1
+            if index < len(nodes) and _is_identifier(nodes[index]) and \
+                    not _is_word(nodes[index], *_ALIAS_STOP_WORDS):
+                table.alias = nodes[index].value
+                index += 1
+
+            if join_type is None and pending_join_words:
+                join_type = pending_join_words[0]
+            table.join_type = join_type if block.tables else None
+            if table.join_type == 'NATURAL' and block.tables:
+                block.joined_sources.append((block.tables[-1].label, table.label))
+            block.tables.append(table)
+            previous = table
+            join_type, pending_join_words = None, []
+
+    def _parse_condition(self, nodes: List[Node], block: QueryBlock, clause: str, depth: int,
+                         in_or: bool = False) -> None:
+        """Parse a boolean condition into predicates, descending into parentheses and subqueries"""
+        disjuncts = _split(nodes, lambda node: _is_word(node, 'OR'))
+        if len(disjuncts) > 1:
+            block.has_or = True
+            in_or = True
+        for disjunct in disjuncts:
+            for conjunct in self._split_and(disjunct):
+                stripped = conjunct[1:] if conjunct and _is_word(conjunct[0], 'NOT') else conjunct
+                if len(stripped) == 1 and isinstance(stripped[0], Group) and not _is_subquery(stripped[0]):
+                    self._parse_condition(list(stripped[0]), block, clause, depth, in_or)
+                    continue
+                self._parse_nested(conjunct, depth)
+                predicate = self._parse_predicate(conjunct)
+                if predicate:
+                    predicate.in_or = in_or
+                    predicate.clause = clause
+                    block.predicates.append(predicate)
+
+    @staticmethod
+    def _split_and(nodes: List[Node]) -> List[List[Node]]:
+        """Split on AND, keeping the AND of BETWEEN x AND y inside its predicate"""
+        parts: List[List[Node]] = [[]]
+        in_between = False
+        for node in nodes:
+            if _is_word(node, 'BETWEEN'):
+                in_between = True
+            elif _is_word(node, 'AND'):
+                if in_between:
+                    in_between = False
+                else:
+                    parts.append([])
+                    continue
+            parts[-1].append(node)
+        return [part for part in parts if part]
+
+    def _parse_predicate(self, nodes: List[Node]) -> Optional[Predicate]:
+        """Parse a single comparison into a Predicate, or None if it is not a simple comparison"""
+        for index, node in enumerate(nodes):
+            if not isinstance(node, Token):
+                continue
+            operator = None
+            width = 1
+            if node.kind == OP and node.value in _COMPARISON_OPERATORS:
+                operator = '<>' if node.value in ('!=', '^=') else node.value
+            elif node.kind == WORD and node.value in ('LIKE', 'IN', 'BETWEEN'):
+                operator = node.value
+                if index > 0 and _is_word(nodes[index - 1], 'NOT'):
+                    operator = f"NOT {operator}"
+                    index -= 1
+                    width = 2
+            elif node.kind == WORD and node.value == 'IS':
+                negated = index + 1 < len(nodes) and _is_word(nodes[index + 1], 'NOT')
+                operator = 'IS NOT NULL' if negated else 'IS NULL'
+                left = self._operand(nodes[:index])
+                return Predicate(operator, left) if left else None
+            if operator is None:
+                continue
+            left = self._operand(nodes[:index])
+            right_nodes = nodes[index + width:]
+            # ANY / ALL / SOME (subquery) behave like IN for our purposes
+            if right_nodes and _is_word(right_nodes[0], 'ANY', 'ALL', 'SOME'):
+                right_nodes = right_nodes[1:]
+            if operator.endswith('BETWEEN'):
+                right_nodes = _split(right_nodes, lambda n: _is_word(n, 'AND'))[0]
+            elif operator.endswith('LIKE'):
+                right_nodes = _split(right_nodes, lambda n: _is_word(n, 'ESCAPE'))[0]
+            right = self._operand(right_nodes)
+            if left is None or right is None:
+                return None
+            return Predicate(operator, left, right)
+        return None
+
+    @staticmethod
+    def _column(nodes: List[Node]) -> Optional[ColumnRef]:
+        """A column reference if the nodes are exactly [[schema.]table.]column with an optional (+)"""
+        if nodes and isinstance(nodes[-1], Group) and len(nodes[-1]) == 1 and \
+                isinstance(nodes[-1][0], Token) and nodes[-1][0].value == '+':
+            nodes = nodes[:-1]
+        if not nodes or len(nodes) % 2 == 0 or len(nodes) > 5:
+            return None
+        names = nodes[0::2]
+        if not all(_is_identifier(name) for name in names) or not all(_is_punct(dot, '.') for dot in nodes[1::2]):
+            return None
+        if len(names) == 1 and names[0].kind == WORD and names[0].value in _NON_COLUMN_WORDS:
+            return None
+        return ColumnRef(column=names[-1].value, qualifier=names[-2].value if len(names) > 1 else None)
+
+    def _operand(self, nodes: List[Node]) -> Optional[Operand]:
+        """Classify one side of a comparison"""
+        nodes = [node for node in nodes if not (isinstance(node, Token) and node.kind in (COMMENT, HINT))]
+        if not nodes:
+            return None
+        column = self._column(nodes)
+        if column:
+            return Operand('column', column=column)
+        if len(nodes) == 1:
+            node = nodes[0]
+            if isinstance(node, Group):
+                if _is_subquery(node):
+                    return Operand('subquery')
+                # A parenthesized list of literals or binds, as in IN (1, 2, 3)
+                if len(node) > 1 and all(isinstance(n, Token) and n.kind in (STRING, NUMBER, BIND, PUNCT)
+                                         for n in node):
+                    return Operand('literal')
+                return self._operand(list(node)) or Operand('expression')
+            if node.kind in (STRING, NUMBER):
+                return Operand('literal', literal=node.value)
+            if node.kind == BIND:
+                return Operand('bind')
+            if node.kind == WORD:
+                return Operand('literal', literal=node.value)
+        # Signed number
+        if len(nodes) == 2 and isinstance(nodes[0], Token) and nodes[0].value in ('-', '+') and \
+                isinstance(nodes[1], Token) and nodes[1].kind == NUMBER:
+            return Operand('literal', literal=nodes[0].value + nodes[1].value)
+        # DATE '...' / TIMESTAMP '...'
+        if len(nodes) == 2 and _is_word(nodes[0], 'DATE', 'TIMESTAMP') and \
+                isinstance(nodes[1], Token) and nodes[1].kind == STRING:
+            return Operand('literal', literal=nodes[1].value)
+        # function(column, ...) wrapping a column reference
+        if len(nodes) == 2 and _is_word(nodes[0]) and isinstance(nodes[1], Group):
+            arguments = _split(list(nodes[1]), lambda node: _is_punct(node, ','))
+            for argument in arguments:
+                wrapped = self._column(argument)
+                if wrapped:
+                    return Operand('function', column=wrapped, function=nodes[0].value)
+            return Operand('expression')
+        # An expression over a column, e.g. col + 1 or col || 'x'
+        for start in range(len(nodes)):
+            for end in (start + 5, start + 3, start + 1):
+                wrapped = self._column(nodes[start:end]) if end <= len(nodes) else None
+                if wrapped and (end == len(nodes) or isinstance(nodes[end], Token) and nodes[end].kind == OP):
+                    return Operand('expression', column=wrapped)
+        return Operand('expression')
+
+def parse(sql: str) -> ParsedStatement:
+    """
+    Parse a SQL statement into its query blocks.
+
+    Args:
+        sql: The statement text; comments and a trailing semicolon are allowed.
+
+    Returns:
+        A ParsedStatement with one QueryBlock per SELECT (including subqueries, inline views and
+        WITH clause queries) or DML target, plus the statement's optimizer hints.
+    """
+    tokens = tokenize(sql)
+    hints = [token.value for token in tokens if token.kind == HINT]
+    tokens = [token for token in tokens if token.kind != COMMENT]
+    while tokens and tokens[-1].kind == PUNCT and tokens[-1].value == ';':
+        tokens.pop()
+
+    first = next((token.value for token in tokens if token.kind == WORD), '')
+    statement = ParsedStatement(statement_type=first, hints=hints)
+    for token in tokens:
+        if token.kind == STRING and (len(token.value) < 2 or not token.value.endswith("'")):
+            statement.problems.append(f"Unterminated string literal at position {token.position}")
+    nodes = _group_tokens(tokens, statement.problems)
+    _Parser(statement).parse_statement(list(nodes))
+    return statement
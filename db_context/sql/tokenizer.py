@@ -0,0 +1,120 @@
+"""Lightweight Oracle SQL tokenizer and statement fingerprinting."""
+import re
+from typing import List, NamedTuple
+
+# Token kinds
+WORD = "WORD"                  # Unquoted identifier or keyword, value upper-cased
+QUOTED_IDENT = "QUOTED_IDENT"  # "Quoted" identifier, value without quotes, case preserved
+STRING = "STRING"              # String literal including quotes, including q'[...]' and N'...'
+NUMBER = "NUMBER"              # Numeric literal
+BIND = "BIND"                  # Bind variable such as :id or :1
+HINT = "HINT"                  # Optimizer hint comment /*+ ... */
+COMMENT = "COMMENT"            # Any other comment
+OP = "OP"                      # Operator
+PUNCT = "PUNCT"                # ( ) , . ;
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    position: int
+
+# Closing delimiters for Oracle q-quoted strings; any other character closes itself
+_Q_QUOTE_CLOSERS = {'[': ']', '{': '}', '(': ')', '<': '>'}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<hint>/\*\+.*?\*/)
+  | (?P<block_comment>/\*.*?(?:\*/|\Z))
+  | (?P<line_comment>--[^\n]*)
+  | (?P<qstring>[nN]?[qQ]')
+  | (?P<string>[nN]?'(?:[^']|'')*(?:'|\Z))
+  | (?P<quoted_ident>"[^"]*(?:"|\Z))
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?[fFdD]?)
+  | (?P<bind>:(?:\w+|"[^"]*"))
+  | (?P<word>[^\W\d][\w$#]*)
+  | (?P<op><>|!=|\^=|<=|>=|\|\||=>|[-+*/=<>@%])
+  | (?P<punct>[(),.;])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+def tokenize(sql: str) -> List[Token]:
+    """Split SQL text into tokens. Whitespace is dropped; comments and hints are kept as tokens."""
+    tokens = []
+    position = 0
+    length = len(sql)
+    while position < length:
+        match = _TOKEN_RE.match(sql, position)
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "qstring":
+            # q'<delim>...<closing delim>' can contain unescaped quotes, so find its end by hand
+            start = position
+            open_index = match.end()
+            delimiter = sql[open_index] if open_index < length else "'"
+            closer = _Q_QUOTE_CLOSERS.get(delimiter, delimiter) + "'"
+            close_index = sql.find(closer, open_index + 1)
+            end = length if close_index < 0 else close_index + 2
+            tokens.append(Token(STRING, sql[start:end], start))
+            position = end
+            continue
+        position = match.end()
+        if kind == "ws":
+            continue
+        if kind == "hint":
+            tokens.append(Token(HINT, text, match.start()))
+        elif kind in ("block_comment", "line_comment"):
+            tokens.append(Token(COMMENT, text, match.start()))
+        elif kind == "string":
+            tokens.append(Token(STRING, text, match.start()))
+        elif kind == "quoted_ident":
+            tokens.append(Token(QUOTED_IDENT, text.strip('"'), match.start()))
+        elif kind == "number":
+            tokens.append(Token(NUMBER, text, match.start()))
+        elif kind == "bind":
+            tokens.append(Token(BIND, text, match.start()))
+        elif kind == "word":
+            tokens.append(Token(WORD, text.upper(), match.start()))
+        elif kind == "punct":
+            tokens.append(Token(PUNCT, text, match.start()))
+        else:
+            tokens.append(Token(OP, text, match.start()))
+    return tokens
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a statement so that textually different but equivalent queries compare equal.
+
+    Comments are dropped (hints are kept, as they change the plan), unquoted identifiers and keywords
+    are upper-cased, whitespace is collapsed, string and numeric literals become '?', literal lists
+    of IN predicates such as IN (1, 2, 3) collapse to a single '?', and a trailing semicolon is ignored.
+    Other literal lists, such as function arguments, keep one '?' per literal.
+    """
+    parts: List[str] = []
+    # One entry per open parenthesis: whether it opens the list of an IN predicate
+    in_lists: List[bool] = []
+    for token in tokenize(sql):
+        if token.kind == COMMENT:
+            continue
+        if token.kind in (STRING, NUMBER):
+            # A sign directly after an operator or opening bracket belongs to the literal
+            if parts and parts[-1] in ("-", "+") and (len(parts) < 2 or parts[-2] in ("(", ",", "=", "<", ">",
+                                                                                       "<=", ">=", "<>", "!=")):
+                parts.pop()
+            # Collapse "?, ?, ?" runs inside an IN list into one placeholder
+            if in_lists and in_lists[-1] and len(parts) >= 2 and parts[-1] == "," and parts[-2] == "?":
+                parts.pop()
+                continue
+            parts.append("?")
+        elif token.kind == QUOTED_IDENT:
+            parts.append(f'"{token.value}"')
+        elif token.kind == HINT:
+            parts.append(" ".join(token.value.split()).upper())
+        else:
+            if token.value == "(":
+                in_lists.append(bool(parts) and parts[-1] == "IN")
+            elif token.value == ")" and in_lists:
+                in_lists.pop()
+            parts.append(token.value)
+    while parts and parts[-1] == ";":
+        parts.pop()
+    return " ".join(parts)
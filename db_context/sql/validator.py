@@ -0,0 +1,167 @@
+"""Validation of parsed SQL statements against cached table metadata, without touching the database."""
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..models import TableInfo
+from .parser import ColumnRef, ParsedStatement, QueryBlock, TableRef
+
+# Maximum number of "did you mean" candidates per problem
+MAX_SUGGESTIONS = 3
+# Data dictionary views and public synonyms available to every schema
+_DICTIONARY_PREFIXES = ('ALL_', 'USER_', 'DBA_', 'CDB_', 'V$', 'GV$')
+
+def is_dictionary_view(name: str) -> bool:
+    """Whether a name refers to DUAL or a data dictionary view, which are not part of the schema cache"""
+    return name == 'DUAL' or name.startswith(_DICTIONARY_PREFIXES)
+
+def _did_you_mean(name: str, candidates: Iterable[str]) -> List[str]:
+    return difflib.get_close_matches(name, sorted(set(candidates)), n=MAX_SUGGESTIONS, cutoff=0.6)
+
+class _Validator:
+    def __init__(self, statement: ParsedStatement, tables: Dict[str, TableInfo], known_tables: Set[str],
+                 unchecked: Set[str]) -> None:
+        self.statement = statement
+        self.tables = tables
+        self.known_tables = known_tables
+        self.unchecked = unchecked
+        self.aliases: Set[str] = set().union(*(block.aliases for block in statement.blocks))
+        self.errors: List[Dict[str, Any]] = []
+        self.warnings: List[Dict[str, Any]] = []
+        self.tables_checked = 0
+        self.columns_checked = 0
+
+    def report(self, target: List[Dict[str, Any]], message: str, suggestions: Optional[List[str]] = None) -> None:
+        problem = {'message': message, 'suggestions': suggestions or []}
+        if problem not in target:
+            target.append(problem)
+
+    def _is_cte(self, table: TableRef) -> bool:
+        return table.schema is None and table.name in self.statement.cte_names
+
+    def _columns(self, table: TableRef) -> Optional[Set[str]]:
+        """Column names of a source, or None if they are not known (views, inline views, missing tables)"""
+        if not table.name or self._is_cte(table):
+            return None
+        info = self.tables.get(table.name)
+        if info is None or not info.columns:
+            return None
+        return {column['name'] for column in info.columns}
+
+    def check_tables(self) -> None:
+        for block in self.statement.blocks:
+            for table in block.tables:
+                if not table.name or self._is_cte(table) or table.name in self.unchecked or \
+                        is_dictionary_view(table.name):
+                    continue
+                if table.name in self.tables:
+                    self.tables_checked += 1
+                    continue
+                qualified = f"{table.schema}.{table.name}" if table.schema else table.name
+                self.report(self.errors, f"Table or view {qualified} does not exist",
+                            _did_you_mean(table.name, self.known_tables))
+        for name in sorted(self.unchecked):
+            if any(table.name == name for table in self.statement.tables):
+                self.report(self.warnings, f"{name} is not a table of this schema (view, synonym or other "
+                                           f"schema); its columns were not checked")
+
+    def check_block(self, block: QueryBlock) -> None:
+        # Scopes from the innermost outwards, for correlated references
+        scopes = []
+        current = block
+        while current is not None:
+            scopes.append(current)
+            current = current.outer
+
+        for column in block.columns:
+            if column.qualifier is not None:
+                self._check_qualified(column, scopes)
+            else:
+                self._check_unqualified(column, scopes)
+
+    def _check_qualified(self, column: ColumnRef, scopes: List[QueryBlock]) -> None:
+        for scope in scopes:
+            source = next((table for table in scope.tables if table.label == column.qualifier), None)
+            if source is None:
+                continue
+            columns = self._columns(source)
+            if columns is None or column.column == '*':
+                return
+            self.columns_checked += 1
+            if column.column not in columns:
+                via = f" (alias {source.alias})" if source.alias else ""
+                self.report(self.errors, f"Column {column.column} does not exist in {source.name}{via}",
+                            [f"{column.qualifier}.{name}" for name in _did_you_mean(column.column, columns)])
+            return
+
+        labels = [table.label for scope in scopes for table in scope.tables]
+        hidden = [table for scope in scopes for table in scope.tables
+                  if table.alias and table.name == column.qualifier]
+        if hidden:
+            self.report(self.errors, f"{column} refers to {column.qualifier}, which is aliased as "
+                                     f"{hidden[0].alias} in this query; use the alias",
+                        [f"{hidden[0].alias}.{column.column}"])
+        else:
+            self.report(self.errors, f"{column} uses unknown table or alias {column.qualifier}",
+                        _did_you_mean(column.qualifier, labels))
+
+    def _check_unqualified(self, column: ColumnRef, scopes: List[QueryBlock]) -> None:
+        if column.column in self.aliases or any(scope.untracked_columns for scope in scopes):
+            return
+        opaque = False
+        candidates: Set[str] = set()
+        for scope in scopes:
+            owners = []
+            for table in scope.tables:
+                columns = self._columns(table)
+                if columns is None:
+                    opaque = True
+                    continue
+                candidates |= columns
+                if column.column in columns:
+                    owners.append(table)
+            if owners:
+                self.columns_checked += 1
+                if len(owners) > 1 and not scope.joined_sources:
+                    labels = [table.label for table in owners]
+                    self.report(self.errors, f"Column {column.column} is ambiguous: it exists in "
+                                             f"{', '.join(labels)}; qualify it",
+                                [f"{label}.{column.column}" for label in labels])
+                return
+        if opaque or not candidates:
+            return
+        self.columns_checked += 1
+        names = [table.name for scope in scopes for table in scope.tables if table.name]
+        self.report(self.errors, f"Column {column.column} does not exist in {', '.join(dict.fromkeys(names))}",
+                    _did_you_mean(column.column, candidates))
+
+def validate_statement(statement: ParsedStatement, tables: Dict[str, TableInfo], known_tables: Iterable[str],
+                       unchecked: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """
+    Resolve every table and column reference of a parsed statement against table metadata.
+
+    Args:
+        statement: The parsed statement.
+        tables: Metadata of the referenced tables that exist, by upper-case name.
+        known_tables: All table names of the schema, used for "did you mean" suggestions.
+        unchecked: Referenced names that exist but whose columns are not known, such as views, synonyms
+            and tables of other schemas; references to them are accepted without checking.
+
+    Returns:
+        A dict with 'valid', the 'errors' and 'warnings' found (each with a 'message' and 'suggestions'),
+        and the number of 'tables_checked' and 'columns_checked'.
+    """
+    validator = _Validator(statement, tables, set(known_tables), unchecked or set())
+    for problem in statement.problems:
+        validator.report(validator.errors, problem)
+    if not statement.blocks:
+        validator.report(validator.errors, "No SELECT, INSERT, UPDATE, DELETE or MERGE statement found")
+    validator.check_tables()
+    for block in statement.blocks:
+        validator.check_block(block)
+    return {
+        'valid': not validator.errors,
+        'errors': validator.errors,
+        'warnings': validator.warnings,
+        'tables_checked': validator.tables_checked,
+        'columns_checked': validator.columns_checked
+    }
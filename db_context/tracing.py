@@ -0,0 +1,245 @@
+"""Trace spans from tool call down to SQL statement, exported as JSON lines or OTLP.
+
+Spans nest through a context variable, so a span opened in a tool call is the parent of the spans
+its context, schema manager and connector calls open, down to one span per SQL statement carrying
+the statement's Oracle SQL_ID and row count. A trace is exported once all of its spans have ended.
+
+Tracing is off until an exporter is configured; until then span() and the traced wrappers only
+check a flag.
+"""
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import os
+import reprlib
+import struct
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+SERVICE_NAME = "oracle-mcp-server"
+# Longest SQL text recorded on a span
+MAX_STATEMENT_CHARS = 2000
+# Seconds to wait for an OTLP collector before dropping a batch
+OTLP_TIMEOUT = 5
+
+# Bounded repr of call arguments recorded on spans, so large column lists stay small
+_argument_repr = reprlib.Repr()
+_argument_repr.maxstring = 80
+_argument_repr.maxother = 80
+_argument_repr.maxlist = _argument_repr.maxdict = 5
+
+# Alphabet of Oracle's base-32 SQL_ID encoding
+_SQL_ID_ALPHABET = "0123456789abcdfghjkmnpqrstuvwxyz"
+
+def oracle_sql_id(sql: str) -> str:
+    """The SQL_ID Oracle assigns to a statement text, for correlation with V$SQL and AWR"""
+    digest = hashlib.md5(sql.encode('utf-8') + b'\x00').digest()
+    _, _, msb, lsb = struct.unpack('<IIII', digest)
+    value = msb * 2 ** 32 + lsb
+    chars = []
+    for _ in range(13):
+        value, remainder = divmod(value, 32)
+        chars.append(_SQL_ID_ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, value: int) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start_ns / 1e9,
+            'duration_ms': round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        def value(v: Any) -> Dict[str, Any]:
+            if isinstance(v, bool):
+                return {'boolValue': v}
+            if isinstance(v, int):
+                return {'intValue': str(v)}
+            if isinstance(v, float):
+                return {'doubleValue': v}
+            return {'stringValue': str(v)}
+
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 3 if self.name.startswith('sql') else 1,  # CLIENT for statements, INTERNAL otherwise
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or self.start_ns),
+            'attributes': [{'key': k, 'value': value(v)} for k, v in self.attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+def otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    """An OTLP/JSON ExportTraceServiceRequest for the given spans"""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+        'scopeSpans': [{'scope': {'name': 'db_context'}, 'spans': [span.to_otlp() for span in spans]}]
+    }]}
+
+class JsonLinesExporter:
+    """Appends finished traces to a file, one span per line, or one OTLP/JSON request per line if otlp"""
+
+    def __init__(self, path: Path, otlp: bool = False) -> None:
+        self.path = Path(path)
+        self.otlp = otlp
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        if self.otlp:
+            lines = [json.dumps(otlp_payload(spans), separators=(',', ':'), default=str)]
+        else:
+            lines = [json.dumps(span.to_dict(), separators=(',', ':'), default=str) for span in spans]
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+class OtlpHttpExporter:
+    """Posts finished traces as OTLP/JSON to a collector, e.g. http://localhost:4318/v1/traces"""
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+
+    def export(self, spans: List[Span]) -> None:
+        # Posted from a daemon thread so a slow or absent collector never delays a tool call
+        threading.Thread(target=self._post, args=(otlp_payload(spans),), daemon=True).start()
+
+    def _post(self, payload: Dict[str, Any]) -> None:
+        request = urllib.request.Request(self.endpoint, data=json.dumps(payload, default=str).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=OTLP_TIMEOUT):
+                pass
+        except Exception as e:
+            print(f"Error exporting trace to {self.endpoint}: {e}", file=sys.stderr)
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+
+class Tracer:
+    def __init__(self) -> None:
+        self.exporters: List[Any] = []
+        # Finished spans and number of open spans per trace; a trace is exported when none remain open
+        self._finished: Dict[str, List[Span]] = {}
+        self._open: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def configure(self, exporters: List[Any]) -> None:
+        self.exporters = list(exporters)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Open a child of the current span, or a new trace if there is none; yields None when disabled"""
+        if not self.exporters:
+            yield None
+            return
+        parent = _current_span.get()
+        span = Span(name=name, trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+                    span_id=os.urandom(8).hex(), parent_id=parent.span_id if parent else None,
+                    start_ns=time.time_ns(), attributes=attributes)
+        with self._lock:
+            self._open[span.trace_id] = self._open.get(span.trace_id, 0) + 1
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def current(self) -> Optional[Span]:
+        return _current_span.get() if self.exporters else None
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._finished.setdefault(span.trace_id, []).append(span)
+            self._open[span.trace_id] -= 1
+            if self._open[span.trace_id] > 0:
+                return
+            del self._open[span.trace_id]
+            spans = self._finished.pop(span.trace_id)
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                print(f"Error exporting trace: {e}", file=sys.stderr)
+
+tracer = Tracer()
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+def describe_arguments(args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Short description of call arguments for a span"""
+    parts = [_argument_repr.repr(arg) for arg in args]
+    parts += [f"{key}={_argument_repr.repr(value)}" for key, value in kwargs.items()]
+    return ", ".join(parts)
+
+def traced(name: str, method: bool = False) -> Callable[[F], F]:
+    """Run a function, sync or async, inside a span called name; for methods, self is left out of the arguments"""
+    skip = 1 if method else 0
+
+    def decorator(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not tracer.exporters:
+                    return await fn(*args, **kwargs)
+                with tracer.span(name, **{'code.arguments': describe_arguments(args[skip:], kwargs)}):
+                    return await fn(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.exporters:
+                return fn(*args, **kwargs)
+            with tracer.span(name, **{'code.arguments': describe_arguments(args[skip:], kwargs)}):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+def trace_methods(layer: str) -> Callable[[type], type]:
+    """Class decorator tracing every public coroutine method as '<layer>.<method>'"""
+    def decorator(cls: type) -> type:
+        for attribute, value in list(vars(cls).items()):
+            if not attribute.startswith('_') and inspect.iscoroutinefunction(value):
+                setattr(cls, attribute, traced(f"{layer}.{attribute}", method=True)(value))
+        return cls
+    return decorator
@@ -1,14 +1,23 @@
 from mcp.server.fastmcp import FastMCP, Context
+import asyncio
+import functools
+import inspect
 import json
 import os
+import signal
 import sys
-from typing import Dict, List, AsyncIterator, Optional
+from typing import Any, Awaitable, Callable, Dict, List, AsyncIterator, Optional
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
 from db_context import DatabaseContext
+from db_context.metrics import mark_call_failed
+from db_context.diagnostics import RequestProfiler, SlowOperationLog, WorkloadRecorder
+from db_context.openmetrics import MetricsExporter
+from db_context.tracing import JsonLinesExporter, OtlpHttpExporter, MAX_STATEMENT_CHARS, tracer
+from db_context.schema.formatter import format_schemas_with_budget, format_data_type, CHARS_PER_TOKEN
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,34 +26,81 @@ ORACLE_CONNECTION_STRING = os.getenv('ORACLE_CONNECTION_STRING')
 TARGET_SCHEMA = os.getenv('TARGET_SCHEMA')  # Optional schema override
 CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
 USE_THICK_MODE = os.getenv('THICK_MODE', '').lower() in ('true', '1', 'yes')  # Convert string to boolean
+# Compress the schema cache snapshot; disable to trade disk space for slightly faster saves and lookups
+CACHE_COMPRESSION = os.getenv('CACHE_COMPRESSION', 'true').lower() in ('true', '1', 'yes')
 ORACLE_CLIENT_LIB_DIR = os.getenv('ORACLE_CLIENT_LIB_DIR', None)
+# Optional OpenMetrics export: an HTTP endpoint on METRICS_PORT and/or a file rewritten every METRICS_INTERVAL seconds
+METRICS_PORT = int(os.getenv('METRICS_PORT')) if os.getenv('METRICS_PORT') else None
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', None)
+METRICS_INTERVAL = float(os.getenv('METRICS_INTERVAL', '15'))
+# Optional tracing: spans appended to TRACE_FILE as JSON lines (TRACE_FORMAT=jsonl) or OTLP/JSON requests
+# (TRACE_FORMAT=otlp), and/or posted to an OTLP/HTTP collector at TRACE_OTLP_ENDPOINT
+TRACE_FILE = os.getenv('TRACE_FILE', None)
+TRACE_FORMAT = os.getenv('TRACE_FORMAT', 'jsonl').lower()
+TRACE_OTLP_ENDPOINT = os.getenv('TRACE_OTLP_ENDPOINT', None)
+# Tool calls, SQL statements and cache writes slower than this are logged, with their timing breakdown,
+# to stderr and CACHE_DIR/slow_operations.jsonl; unset to disable
+SLOW_OPERATION_MS = float(os.getenv('SLOW_OPERATION_MS')) if os.getenv('SLOW_OPERATION_MS') else None
+# Tool calls profiled after SIGUSR1 is received
+PROFILE_REQUESTS = int(os.getenv('PROFILE_REQUESTS', '10'))
+# Append every tool call, with its arguments and start time, to this file for replay with benchmarks.replay
+WORKLOAD_FILE = os.getenv('WORKLOAD_FILE', None)
 
-@asynccontextmanager
-async def app_lifespan(server: FastMCP) -> AsyncIterator[DatabaseContext]:
-    """Manage application lifecycle and ensure DatabaseContext is properly initialized"""
-    print("App Lifespan initialising", file=sys.stderr)
-    connection_string = ORACLE_CONNECTION_STRING
-    if not connection_string:
+# Profiles tool calls on demand, writing profiles to CACHE_DIR
+profiler = RequestProfiler(Path(CACHE_DIR))
+# Captures the workload when WORKLOAD_FILE is set
+workload_recorder = WorkloadRecorder(Path(WORKLOAD_FILE)) if WORKLOAD_FILE else None
+
+def create_database_context() -> DatabaseContext:
+    """Create the DatabaseContext served by this process from the environment settings"""
+    if not ORACLE_CONNECTION_STRING:
         raise ValueError("ORACLE_CONNECTION_STRING environment variable is required. Set it in .env file or environment.")
     
     cache_dir = Path(CACHE_DIR)
     cache_dir.mkdir(parents=True, exist_ok=True)
     
     db_context = DatabaseContext(
-        connection_string=connection_string,
+        connection_string=ORACLE_CONNECTION_STRING,
         cache_path=cache_dir / 'schema_cache.json',
         target_schema=TARGET_SCHEMA,
         use_thick_mode=USE_THICK_MODE,  # Pass the thick mode setting
         lib_dir=ORACLE_CLIENT_LIB_DIR
     )
+    db_context.schema_manager.compress_cache = CACHE_COMPRESSION
+    return db_context
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[DatabaseContext]:
+    """Manage application lifecycle and ensure DatabaseContext is properly initialized"""
+    print("App Lifespan initialising", file=sys.stderr)
+    db_context = create_database_context()
+    cache_dir = Path(CACHE_DIR)
     
+    exporter = MetricsExporter(db_context)
+    trace_exporters = []
+    if TRACE_FILE:
+        trace_exporters.append(JsonLinesExporter(Path(TRACE_FILE), otlp=TRACE_FORMAT == 'otlp'))
+    if TRACE_OTLP_ENDPOINT:
+        trace_exporters.append(OtlpHttpExporter(TRACE_OTLP_ENDPOINT))
+    if SLOW_OPERATION_MS is not None:
+        trace_exporters.append(SlowOperationLog(SLOW_OPERATION_MS, cache_dir / 'slow_operations.jsonl'))
+    tracer.configure(trace_exporters)
+    if hasattr(signal, 'SIGUSR1'):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, profiler.arm, PROFILE_REQUESTS)
+        except (NotImplementedError, RuntimeError):
+            pass  # Signal handlers are only available on the main thread's loop on POSIX
     try:
-        # Initialize cache on startup
-        print("Initialising database cache...", file=sys.stderr)
-        await db_context.initialize()
-        print("Cache ready!", file=sys.stderr)
+        # Load the schema cache in the background so the MCP handshake does not wait for it;
+        # until it is ready, tools answer with direct queries
+        print("Initialising database cache in the background...", file=sys.stderr)
+        db_context.start_initialization()
+        await exporter.start(METRICS_HOST, METRICS_PORT, Path(METRICS_TEXTFILE) if METRICS_TEXTFILE else None,
+                             METRICS_INTERVAL)
         yield db_context
     finally:
+        await exporter.stop()
         # Ensure proper cleanup of database resources
         print("Closing database connections...", file=sys.stderr)
         await db_context.close()
@@ -52,10 +108,124 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[DatabaseContext]:
 
 # Initialize FastMCP server
 mcp = FastMCP("oracle", lifespan=app_lifespan)
-print("FastMCP server initialized", file=sys.stderr)
+# Tools return formatted text; without an output schema, registering them at startup skips building a
+# second pydantic model per tool and responses are not repeated as structured content. Older mcp
+# versions have no structured output and need no option.
+TOOL_OPTIONS = {'structured_output': False} if 'structured_output' in inspect.signature(mcp.tool).parameters else {}
+
+OUTPUT_FORMATS = ("text", "json", "compact_json")
+
+def tool() -> Callable[[Callable[..., Awaitable[str]]], Callable[..., Awaitable[str]]]:
+    """
+    Register a tool with the server, measuring each call: latency, database round trips, rows fetched,
+    pool wait and the size of the response are recorded in the DatabaseContext metrics, the call
+    is the root span of a trace when tracing is enabled, it is profiled while the profiler is armed,
+    and it is appended to the workload file when one is set.
+    """
+    def decorator(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        @functools.wraps(fn)
+        async def instrumented(*args: Any, **kwargs: Any) -> str:
+            ctx = kwargs.get('ctx')
+            db_context: Optional[DatabaseContext] = ctx.request_context.lifespan_context if ctx else None
+            if db_context is None:
+                return await fn(*args, **kwargs)
+            arguments = {k: v for k, v in kwargs.items() if k != 'ctx'}
+            started, start = time.time(), time.perf_counter()
+            with db_context.metrics.tool_call(fn.__name__) as call, tracer.span(f"tool.{fn.__name__}") as span, \
+                    profiler.profile_call(fn.__name__):
+                try:
+                    result = await fn(*args, **kwargs)
+                    call.bytes_returned = len(result.encode('utf-8')) if isinstance(result, str) else 0
+                    if span is not None:
+                        span.set('tool.arguments', json.dumps(arguments, default=str)[:MAX_STATEMENT_CHARS])
+                        span.set('tool.response_bytes', call.bytes_returned)
+                    return result
+                finally:
+                    if workload_recorder is not None:
+                        workload_recorder.record(fn.__name__, arguments, started,
+                                                 (time.perf_counter() - start) * 1000, call.bytes_returned)
+        return mcp.tool(**TOOL_OPTIONS)(instrumented)
+    return decorator
+
+def _check_output_format(output_format: str) -> Optional[str]:
+    """Return an error message if output_format is not supported"""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Unsupported output_format '{output_format}'. Use one of: {', '.join(OUTPUT_FORMATS)}"
+    return None
+
+def _tool_error(message: str) -> str:
+    """Count the running tool call as failed in the metrics and return its error message"""
+    mark_call_failed()
+    return message
+
+def _to_json(payload: Any, output_format: str) -> str:
+    """Serialize a tool payload for the json/compact_json output formats"""
+    if output_format == "compact_json":
+        return json.dumps(payload, separators=(",", ":"), default=str)
+    return json.dumps(payload, indent=2, default=str)
+
+def _check_budget(max_tokens: Optional[int], max_chars: Optional[int]) -> Optional[str]:
+    """Return an error message if a size limit is set but not positive"""
+    for name, limit in (("max_tokens", max_tokens), ("max_chars", max_chars)):
+        if limit is not None and limit <= 0:
+            return f"{name} must be a positive number, got {limit}"
+    return None
 
-@mcp.tool()
-async def get_table_schema(table_name: str, ctx: Context) -> str:
+def _output_budget(max_tokens: Optional[int], max_chars: Optional[int]) -> Optional[int]:
+    """Combine the optional token and character limits into a single character budget"""
+    limits = [limit for limit in (max_chars, max_tokens * CHARS_PER_TOKEN if max_tokens else None) if limit]
+    return min(limits) if limits else None
+
+async def _table_statistics(db_context: DatabaseContext, table_infos: List) -> Dict[str, Any]:
+    """Optimizer statistics of the given tables by table name, from the bulk statistics cache"""
+    statistics = {}
+    for table_info in table_infos:
+        table_statistics = await db_context.get_table_statistics(table_info.table_name)
+        if table_statistics is not None:
+            statistics[table_info.table_name] = table_statistics
+    return statistics
+
+def _format_tables(table_infos: List, header_lines: List[str], budget: Optional[int],
+                   statistics: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Join header lines and table schemas, fitting the schemas into the remaining budget if one is set.
+    Optimizer statistics, keyed by table name, are shown for the tables that have them.
+    """
+    statistics = statistics or {}
+    if budget is None:
+        return "\n".join(header_lines + [table_info.format_schema(statistics=statistics.get(table_info.table_name))
+                                         for table_info in table_infos])
+    
+    header = "\n".join(header_lines)
+    remaining = budget - len(header) - (1 if header else 0)
+    if len(header) > budget or (remaining <= 0 and table_infos):
+        return _fit_header(header_lines, len(table_infos), budget)
+    body = format_schemas_with_budget(
+        [(t.table_name, t.columns, t.relationships, statistics.get(t.table_name)) for t in table_infos],
+        max(0, remaining)
+    )
+    return "\n".join(part for part in (header, body) if part)
+
+def _fit_header(header_lines: List[str], table_count: int, budget: int) -> str:
+    """
+    Keep as many header lines as fit in the budget together with a note saying how many lines and
+    table schemas were left out; the result is cut at the budget if even the note does not fit.
+    """
+    ends = []
+    length = -1
+    for line in header_lines:
+        length += len(line) + 1
+        ends.append(length)
+    for kept in range(len(header_lines), -1, -1):
+        note = (f"[Output limited to {budget} characters: {len(header_lines) - kept} header line(s) and "
+                f"{table_count} table schema(s) omitted. Request fewer tables or a larger budget.]")
+        if (ends[kept - 1] + 1 if kept else 0) + len(note) <= budget:
+            return "\n".join(header_lines[:kept] + [note])
+    return note[:budget]
+
+@tool()
+async def get_table_schema(table_name: str, ctx: Context, include_statistics: bool = False,
+                           output_format: str = "text") -> str:
     """
     Get the schema information for a specific table including columns, data types, nullability, and relationships.
     Use this when you need to understand the structure of a particular table to write queries against it or to analyze data models.
@@ -65,21 +235,38 @@ async def get_table_schema(table_name: str, ctx: Context) -> str:
     Args:
         table_name: The name of the table to get schema information for (case-insensitive). Must be an exact table name,
                    as this tool does not support partial matches or wildcards. For pattern matching, use search_tables_schema instead.
+        include_statistics: Also show optimizer statistics: the table's row count and blocks, and each column's
+                           number of distinct values, nulls, density and histogram, with when they were gathered.
+                           Useful for judging selectivity when writing efficient queries.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing the table's schema information including columns (with data types and nullability)
-        and relationships to other tables. Returns an error message if the table is not found in the database schema.
+        and relationships to other tables. Returns an error message if the table is not found in the database schema,
+        as an {"error": ...} object in the JSON formats.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     table_info = await db_context.get_schema_info(table_name)
+    statistics = await _table_statistics(db_context, [table_info]) if table_info and include_statistics else {}
     
     if not table_info:
-        return f"Table '{table_name}' not found in the schema."
+        message = f"Table '{table_name}' not found in the schema."
+        return _to_json({"error": message}, output_format) if output_format != "text" else message
+    
+    if output_format != "text":
+        payload = table_info.to_dict()
+        if include_statistics:
+            payload['statistics'] = statistics.get(table_info.table_name)
+        return _to_json(payload, output_format)
     
     # Delegate formatting to the TableInfo model
-    return table_info.format_schema()
+    return table_info.format_schema(statistics=statistics.get(table_info.table_name))
 
-@mcp.tool()
+@tool()
 async def rebuild_schema_cache(ctx: Context) -> str:
     """
     Force a complete rebuild of the database schema cache. This operation is computationally expensive and time-consuming
@@ -101,10 +288,12 @@ async def rebuild_schema_cache(ctx: Context) -> str:
         cache_size = len(db_context.schema_manager.cache.all_table_names) if db_context.schema_manager.cache else 0
         return f"Schema cache rebuilt successfully. Indexed {cache_size} tables."
     except Exception as e:
-        return f"Failed to rebuild schema cache: {str(e)}"
+        return _tool_error(f"Failed to rebuild schema cache: {str(e)}")
 
-@mcp.tool()
-async def get_tables_schema(table_names: List[str], ctx: Context) -> str:
+@tool()
+async def get_tables_schema(table_names: List[str], ctx: Context, max_tokens: Optional[int] = None,
+                            max_chars: Optional[int] = None, include_statistics: bool = False,
+                            output_format: str = "text") -> str:
     """
     Get the schema information for multiple tables at once in a single database query.
     This tool is significantly more efficient than calling get_table_schema multiple times as it
@@ -113,12 +302,23 @@ async def get_tables_schema(table_names: List[str], ctx: Context) -> str:
     that join multiple tables.
     
     There is no hard limit on how many tables can be requested, but requesting too many large tables
-    at once may cause performance issues. If a requested table doesn't exist, an error message for that
-    specific table will be included in the results while still returning information for valid tables.
+    at once may produce very long output; set max_tokens or max_chars to bound it. When a budget is set,
+    tables that do not fit are progressively shown with compact columns, then grouped relationships,
+    then column names only, and finally omitted, with a note listing what was reduced. If a requested
+    table doesn't exist, an error message for that specific table will be included in the results
+    while still returning information for valid tables.
     
     Args:
         table_names: A list of table names to get schema information for (case-insensitive). Each name
                     must be exact, as this tool does not support partial matches or wildcards.
+        max_tokens: Optional approximate upper bound on the size of the response, in LLM tokens.
+        max_chars: Optional upper bound on the size of the response, in characters.
+        include_statistics: Also show optimizer statistics (row counts, and per column distinct values, nulls,
+                           density and histograms). Statistics for the whole schema are loaded and cached in one
+                           pass, so this adds no per-table database queries.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+                      Budgets apply to text output only.
     
     Returns:
         A formatted string containing the schema information for all requested tables, including
@@ -126,21 +326,48 @@ async def get_tables_schema(table_names: List[str], ctx: Context) -> str:
         grouped and clearly separated in the output.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format) or _check_budget(max_tokens, max_chars)
+    if error:
+        return error
+    budget = _output_budget(max_tokens, max_chars)
+    # Formatted schemas and not-found messages in request order, for text output without a budget
     results = []
+    missing = []
+    missing_names = []
+    table_infos = []
+    statistics = {}
     
     for table_name in table_names:
         table_info = await db_context.get_schema_info(table_name)
         if not table_info:
-            results.append(f"\nTable '{table_name}' not found in the schema.")
+            message = f"\nTable '{table_name}' not found in the schema."
+            results.append(message)
+            missing.append(message)
+            missing_names.append(table_name)
             continue
         
-        # Delegate formatting to the TableInfo model
-        results.append(table_info.format_schema())
+        table_infos.append(table_info)
+        if include_statistics:
+            statistics.update(await _table_statistics(db_context, [table_info]))
+        if output_format == "text" and budget is None:
+            # Delegate formatting to the TableInfo model
+            results.append(table_info.format_schema(statistics=statistics.get(table_info.table_name)))
     
-    return "\n".join(results)
+    if output_format != "text":
+        tables = []
+        for table_info in table_infos:
+            payload = table_info.to_dict()
+            if include_statistics:
+                payload['statistics'] = statistics.get(table_info.table_name)
+            tables.append(payload)
+        return _to_json({"tables": tables, "not_found": missing_names}, output_format)
+    if budget is None:
+        return "\n".join(results)
+    return _format_tables(table_infos, missing, budget, statistics)
 
-@mcp.tool()
-async def search_tables_schema(search_term: str, ctx: Context) -> str:
+@tool()
+async def search_tables_schema(search_term: str, ctx: Context, max_tokens: Optional[int] = None,
+                               max_chars: Optional[int] = None, output_format: str = "text") -> str:
     """
     Search for tables with names similar to the provided search terms and return their schema information.
     Multiple terms can be provided separated by commas or whitespace to find tables matching any of the terms.
@@ -152,10 +379,17 @@ async def search_tables_schema(search_term: str, ctx: Context) -> str:
     to 20 tables total across all search terms to prevent overwhelming responses for generic terms. This means that if 
     too many tables are matched, only the first 20 will be returned, which may lead to missing very relevant tables. So, 
     if you encounter this, try to be more specific with your search terms and consider there may be more relevant tables.
+    Set max_tokens or max_chars to bound the response; tables that do not fit are shown with less detail or omitted,
+    and a note lists what was reduced.
     
     Args:
         search_term: One or more strings to search for in table names (case-insensitive), separated by commas or spaces.
                      Each term is treated as a separate search, with results combined (logical OR).
+        max_tokens: Optional approximate upper bound on the size of the response, in LLM tokens.
+        max_chars: Optional upper bound on the size of the response, in characters.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+                      Budgets apply to text output only.
     
     Returns:
         A formatted string containing the schema information for all matching tables (up to 20 tables total),
@@ -163,6 +397,9 @@ async def search_tables_schema(search_term: str, ctx: Context) -> str:
         error message listing which terms were searched.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format) or _check_budget(max_tokens, max_chars)
+    if error:
+        return error
     
     # Split search term by commas and whitespace and remove empty strings
     search_terms = [term.strip() for term in search_term.replace(',', ' ').split()]
@@ -184,7 +421,7 @@ async def search_tables_schema(search_term: str, ctx: Context) -> str:
     total_matches = len(matching_tables)
     limited_tables = matching_tables[:20]
     
-    if not matching_tables:
+    if not matching_tables and output_format == "text":
         return f"No tables found matching any of these terms: {', '.join(search_terms)}"
     
     if total_matches > 20:
@@ -195,18 +432,25 @@ async def search_tables_schema(search_term: str, ctx: Context) -> str:
     matching_tables = limited_tables
     
     # Now load the schema for each matching table
+    table_infos = []
     for table_name in matching_tables:
         table_info = await db_context.get_schema_info(table_name)
         if not table_info:
             continue
-        
-        # Delegate formatting to the TableInfo model
-        results.append(table_info.format_schema())
+        table_infos.append(table_info)
     
-    return "\n".join(results)
+    if output_format != "text":
+        return _to_json({
+            "search_terms": search_terms,
+            "total_matches": total_matches,
+            "tables": [table_info.to_dict() for table_info in table_infos]
+        }, output_format)
+    
+    # Delegate formatting to the TableInfo model, within the output budget if one was given
+    return _format_tables(table_infos, results, _output_budget(max_tokens, max_chars))
 
-@mcp.tool()
-async def get_database_vendor_info(ctx: Context) -> str:
+@tool()
+async def get_database_vendor_info(ctx: Context, output_format: str = "text") -> str:
     """
     Returns the database vendor type and version by querying the connected Oracle database.
     This information is critical for writing database-specific SQL features and syntax that may vary between vendors 
@@ -218,16 +462,26 @@ async def get_database_vendor_info(ctx: Context) -> str:
     current schema context, and additional version-specific details when available. This can help diagnose 
     connection issues or verify you're connected to the expected database environment.
     
+    Args:
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
     Returns:
         A formatted string containing the database vendor type, version information, current schema,
         and any additional version-specific details available from the database. Returns an error
         message if the database could not be queried successfully.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         db_info = await db_context.get_database_info()
         
+        if output_format != "text":
+            return _to_json(db_info, output_format)
+        
         if not db_info:
             return "Could not retrieve database vendor information."
         
@@ -246,10 +500,10 @@ async def get_database_vendor_info(ctx: Context) -> str:
             
         return "\n".join(result)
     except Exception as e:
-        return f"Error retrieving database vendor information: {str(e)}"
+        return _tool_error(f"Error retrieving database vendor information: {str(e)}")
 
-@mcp.tool()
-async def search_columns(search_term: str, ctx: Context) -> str:
+@tool()
+async def search_columns(search_term: str, ctx: Context, output_format: str = "text") -> str:
     """
     Search for tables containing columns that match the provided search term in their name.
     This tool is extremely useful when you know what data you need (like 'customer_id' or 'order_date') 
@@ -264,16 +518,24 @@ async def search_columns(search_term: str, ctx: Context) -> str:
     Args:
         search_term: A string to search for in column names (case-insensitive). For example, 'address',
                     'date', 'amount', etc. Does not support wildcards or regex patterns.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string listing tables and their matching columns (up to 50 results) with data types
         and nullability information. Returns an error message if no matches are found or an error occurs.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         matching_columns = await db_context.search_columns(search_term, limit=50)
         
+        if output_format != "text":
+            return _to_json(matching_columns, output_format)
+        
         if not matching_columns:
             return f"No columns found matching '{search_term}'"
         
@@ -284,14 +546,14 @@ async def search_columns(search_term: str, ctx: Context) -> str:
             results.append("Matching columns:")
             for col in columns:
                 nullable = "NULL" if col["nullable"] else "NOT NULL"
-                results.append(f"  - {col['name']}: {col['type']} {nullable}")
+                results.append(f"  - {col['name']}: {format_data_type(col)} {nullable}")
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error searching columns: {str(e)}"
+        return _tool_error(f"Error searching columns: {str(e)}")
 
-@mcp.tool()
-async def get_pl_sql_objects(object_type: str, name_pattern: Optional[str], ctx: Context) -> str:
+@tool()
+async def get_pl_sql_objects(object_type: str, name_pattern: Optional[str], ctx: Context, output_format: str = "text") -> str:
     """
     Get information about PL/SQL objects (procedures, functions, packages, triggers, etc) in the database.
     Use this tool to discover existing database code objects for analysis, debugging, or understanding how
@@ -309,16 +571,24 @@ async def get_pl_sql_objects(object_type: str, name_pattern: Optional[str], ctx:
         name_pattern: Pattern to filter object names (case-insensitive, supports % wildcards).
                      e.g., "CUSTOMER%" will find all objects starting with "CUSTOMER", "%ORDER%" will find 
                      objects containing "ORDER". If null or empty, all objects of the specified type are returned.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing information about the matching PL/SQL objects, including their
         names, owners, status, and timestamps. Returns an error message if no matching objects are found.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         objects = await db_context.get_pl_sql_objects(object_type.upper(), name_pattern)
         
+        if output_format != "text":
+            return _to_json(objects, output_format)
+        
         if not objects:
             pattern_msg = f" matching '{name_pattern}'" if name_pattern else ""
             return f"No {object_type.upper()} objects found{pattern_msg}"
@@ -338,10 +608,12 @@ async def get_pl_sql_objects(object_type: str, name_pattern: Optional[str], ctx:
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error retrieving PL/SQL objects: {str(e)}"
+        return _tool_error(f"Error retrieving PL/SQL objects: {str(e)}")
 
-@mcp.tool()
-async def get_object_source(object_type: str, object_name: str, ctx: Context) -> str:
+@tool()
+async def get_object_source(object_type: str, object_name: str, ctx: Context, offset: int = 0,
+                            max_lines: Optional[int] = None, procedure_name: Optional[str] = None,
+                            output_format: str = "text") -> str:
     """
     Get the source code for a PL/SQL object (procedure, function, package, trigger, etc.).
     Essential for debugging, understanding, or optimizing existing database code. Use this tool
@@ -353,31 +625,126 @@ async def get_object_source(object_type: str, object_name: str, ctx: Context) ->
     appropriate database permissions to view the source code of objects, particularly those owned by 
     different schemas.
     
+    Large packages can be read in pages with offset and max_lines, or narrowed to a single procedure or
+    function with procedure_name. Paged responses state which lines were returned and how many remain.
+    
     Args:
         object_type: Type of object (PROCEDURE, FUNCTION, PACKAGE, TRIGGER, etc.) to retrieve. 
                     Value is automatically converted to uppercase.
         object_name: Name of the object to retrieve source for. Value is automatically converted to uppercase.
                     Must be an exact object name (no wildcards or partial matching).
+        offset: Number of lines to skip before returning source (default 0). When procedure_name is given,
+               the offset counts from the start of that procedure or function.
+        max_lines: Maximum number of lines to return. Omit to return everything after the offset.
+        procedure_name: Only return the named procedure or function (all overloads) from a package or type.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
-        A string containing the complete source code of the requested object with original formatting
+        A string containing the requested source code of the object with original formatting
         preserved. Returns an error message if the object does not exist, the user lacks permissions
         to view it, or an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
-        source = await db_context.get_object_source(object_type.upper(), object_name.upper())
+        if not offset and max_lines is None and not procedure_name:
+            source = await db_context.get_object_source(object_type.upper(), object_name.upper())
+            
+            if output_format != "text":
+                return _to_json({
+                    "type": object_type.upper(),
+                    "name": object_name.upper(),
+                    "source": source
+                }, output_format)
+            
+            if not source:
+                return f"No source found for {object_type} {object_name}"
+            
+            return f"Source for {object_type} {object_name}:\n\n{source}"
+        
+        page = await db_context.get_object_source_lines(
+            object_type.upper(), object_name.upper(), offset, max_lines, procedure_name
+        )
+        
+        if output_format != "text":
+            return _to_json({"type": object_type.upper(), "name": object_name.upper(), **page}, output_format)
         
-        if not source:
+        if not page['total_lines']:
             return f"No source found for {object_type} {object_name}"
+        if procedure_name and not page['ranges']:
+            return f"No procedure or function '{procedure_name}' found in {object_type} {object_name}"
+        if not page['source']:
+            return f"No source lines after offset {offset} in {object_type} {object_name}"
         
-        return f"Source for {object_type} {object_name}:\n\n{source}"
+        scope = f" {procedure_name}" if procedure_name else ""
+        header = (f"Source for {object_type} {object_name}{scope} "
+                  f"(lines {page['start_line']}-{page['end_line']} of {page['total_lines']}):")
+        if page['remaining_lines']:
+            header += (f"\n{page['remaining_lines']} more lines follow; "
+                       f"call again with offset={page['next_offset']} to continue.")
+        return f"{header}\n\n{page['source']}"
     except Exception as e:
-        return f"Error retrieving object source: {str(e)}"
+        return _tool_error(f"Error retrieving object source: {str(e)}")
 
-@mcp.tool()
-async def get_table_constraints(table_name: str, ctx: Context) -> str:
+@tool()
+async def search_source(pattern: str, ctx: Context, object_type: Optional[str] = None, regex: bool = False,
+                        limit: int = 100, output_format: str = "text") -> str:
+    """
+    Search the source code of all PL/SQL objects (packages, procedures, functions, triggers, types) in the
+    schema and return the matching lines. Use this to find which code reads or writes a column or table,
+    calls a procedure, or raises an error, instead of listing objects and reading their source one by one.
+    
+    The search runs against a local full-text index of the schema's source, built on first use and then
+    refreshed incrementally for objects recompiled since, so repeated searches return in milliseconds.
+    
+    Args:
+        pattern: Text to search for (case-insensitive substring), e.g. 'CUSTOMER_ID' or 'INSERT INTO ORDERS'.
+        object_type: Optional object type to restrict the search to (PACKAGE BODY, PROCEDURE, TRIGGER, etc.).
+                    Value is automatically converted to uppercase.
+        regex: Treat the pattern as a case-insensitive regular expression. Slower, as every object is scanned.
+        limit: Maximum number of matching lines to return (default 100).
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
+    Returns:
+        A formatted string listing matching lines grouped by object, with object type, name and line number.
+        Returns a message if nothing matches or an error occurs during the search.
+    """
+    db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
+    if limit < 1:
+        return f"limit must be a positive number, got {limit}"
+    
+    try:
+        hits = await db_context.search_source(pattern, object_type.upper() if object_type else None, regex, limit)
+        
+        if output_format != "text":
+            return _to_json(hits, output_format)
+        
+        if not hits:
+            return f"No source lines found matching '{pattern}'"
+        
+        limit_msg = f" (limited to {limit})" if len(hits) >= limit else ""
+        results = [f"Found {len(hits)} source lines matching '{pattern}'{limit_msg}:"]
+        current = None
+        for hit in hits:
+            if (hit['type'], hit['name']) != current:
+                current = (hit['type'], hit['name'])
+                results.append(f"\n{hit['type']}: {hit['name']}")
+            results.append(f"  {hit['line']}: {hit['text'].strip()}")
+        
+        return "\n".join(results)
+    except Exception as e:
+        return _tool_error(f"Error searching source: {str(e)}")
+
+@tool()
+async def get_table_constraints(table_name: str, ctx: Context, output_format: str = "text") -> str:
     """
     Get constraints (primary keys, foreign keys, unique constraints, check constraints) for a table.
     Use this to understand the data integrity rules, relationships, and business rules encoded in the database.
@@ -391,6 +758,8 @@ async def get_table_constraints(table_name: str, ctx: Context) -> str:
     
     Args:
         table_name: The name of the table to get constraints for (case-insensitive). Must be an exact table name.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing the table's constraints with detailed information including constraint
@@ -398,10 +767,16 @@ async def get_table_constraints(table_name: str, ctx: Context) -> str:
         or if an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         constraints = await db_context.get_table_constraints(table_name)
         
+        if output_format != "text":
+            return _to_json(constraints, output_format)
+        
         if not constraints:
             return f"No constraints found for table '{table_name}'"
         
@@ -425,10 +800,10 @@ async def get_table_constraints(table_name: str, ctx: Context) -> str:
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error retrieving constraints: {str(e)}"
+        return _tool_error(f"Error retrieving constraints: {str(e)}")
 
-@mcp.tool()
-async def get_table_indexes(table_name: str, ctx: Context) -> str:
+@tool()
+async def get_table_indexes(table_name: str, ctx: Context, output_format: str = "text") -> str:
     """
     Get indexes defined on a table to understand and optimize query performance. 
     Essential for query optimization and understanding performance characteristics of the table.
@@ -442,6 +817,8 @@ async def get_table_indexes(table_name: str, ctx: Context) -> str:
     
     Args:
         table_name: The name of the table to get indexes for (case-insensitive). Must be an exact table name.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing the table's indexes including column information, uniqueness flags,
@@ -449,10 +826,16 @@ async def get_table_indexes(table_name: str, ctx: Context) -> str:
         an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         indexes = await db_context.get_table_indexes(table_name)
         
+        if output_format != "text":
+            return _to_json(indexes, output_format)
+        
         if not indexes:
             return f"No indexes found for table '{table_name}'"
         
@@ -471,10 +854,10 @@ async def get_table_indexes(table_name: str, ctx: Context) -> str:
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error retrieving indexes: {str(e)}"
+        return _tool_error(f"Error retrieving indexes: {str(e)}")
 
-@mcp.tool()
-async def get_dependent_objects(object_name: str, ctx: Context) -> str:
+@tool()
+async def get_dependent_objects(object_name: str, ctx: Context, depth: int = 1, output_format: str = "text") -> str:
     """
     Get objects that depend on the specified object (find usage references) in the database.
     This tool is crucial for impact analysis before modifying or dropping database objects,
@@ -485,9 +868,16 @@ async def get_dependent_objects(object_name: str, ctx: Context) -> str:
     triggers that reference tables or columns, and any other database object that relies on the specified object.
     Understanding these dependencies helps prevent breaking changes and cascading failures in database applications.
     
+    Set depth above 1 to include indirect dependents (for example a procedure that calls a package that reads a
+    view built on the table), or 0 to follow every level. Results come from an in-memory dependency graph of the
+    whole schema that is reloaded when DDL is detected, so deep impact analysis costs no extra database queries.
+    
     Args:
         object_name: Name of the object to find dependencies for (case-insensitive). The value is automatically
                     converted to uppercase. Must be an exact object name with no wildcards.
+        depth: Number of dependency levels to follow: 1 (default) for direct dependents only, 0 for all levels.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing objects that depend on the specified object, including their types,
@@ -495,9 +885,15 @@ async def get_dependent_objects(object_name: str, ctx: Context) -> str:
         are found or if an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
-        dependencies = await db_context.get_dependent_objects(object_name.upper())
+        dependencies = await db_context.get_dependent_objects(object_name.upper(), depth)
+        
+        if output_format != "text":
+            return _to_json(dependencies, output_format)
         
         if not dependencies:
             return f"No objects found that depend on '{object_name}'"
@@ -508,13 +904,15 @@ async def get_dependent_objects(object_name: str, ctx: Context) -> str:
             results.append(f"\n{dep['type']}: {dep['name']}")
             if 'owner' in dep:
                 results.append(f"Owner: {dep['owner']}")
+            if dep.get('depth', 1) > 1:
+                results.append(f"Depth: {dep['depth']} (via {dep['referenced_name']})")
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error retrieving dependencies: {str(e)}"
+        return _tool_error(f"Error retrieving dependencies: {str(e)}")
 
-@mcp.tool()
-async def get_user_defined_types(type_pattern: Optional[str], ctx: Context) -> str:
+@tool()
+async def get_user_defined_types(type_pattern: Optional[str], ctx: Context, output_format: str = "text") -> str:
     """
     Get information about user-defined types in the database schema such as object types, nested tables,
     VARRAYs, and custom type definitions. Use this tool when working with complex data structures, stored
@@ -529,6 +927,8 @@ async def get_user_defined_types(type_pattern: Optional[str], ctx: Context) -> s
         type_pattern: Pattern to filter type names (case-insensitive, supports % wildcards). For example,
                      "CUSTOMER%" will find types like CUSTOMER_TYPE, CUSTOMER_ADDRESS_TYPE, etc.
                      If null or empty, all user-defined types will be returned (may be a large list).
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string containing information about user-defined types, including name, type category,
@@ -536,10 +936,16 @@ async def get_user_defined_types(type_pattern: Optional[str], ctx: Context) -> s
         the pattern or if an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         types = await db_context.get_user_defined_types(type_pattern)
         
+        if output_format != "text":
+            return _to_json(types, output_format)
+        
         if not types:
             pattern_msg = f" matching '{type_pattern}'" if type_pattern else ""
             return f"No user-defined types found{pattern_msg}"
@@ -558,10 +964,10 @@ async def get_user_defined_types(type_pattern: Optional[str], ctx: Context) -> s
         
         return "\n".join(results)
     except Exception as e:
-        return f"Error retrieving user-defined types: {str(e)}"
+        return _tool_error(f"Error retrieving user-defined types: {str(e)}")
 
-@mcp.tool()
-async def get_related_tables(table_name: str, ctx: Context) -> str:
+@tool()
+async def get_related_tables(table_name: str, ctx: Context, output_format: str = "text") -> str:
     """
     Get all tables that are related to the specified table through foreign keys.
     This tool is critical for understanding the database schema relationships and building proper JOINs.
@@ -576,6 +982,8 @@ async def get_related_tables(table_name: str, ctx: Context) -> str:
     Args:
         table_name: The name of the table to find relationships for (case-insensitive). 
                    Must be an exact table name with no wildcards.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
     
     Returns:
         A formatted string showing all related tables in both directions (incoming and outgoing relationships),
@@ -583,10 +991,16 @@ async def get_related_tables(table_name: str, ctx: Context) -> str:
         Returns an error message if no relationships exist or if an error occurs during retrieval.
     """
     db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
     
     try:
         related = await db_context.get_related_tables(table_name)
         
+        if output_format != "text":
+            return _to_json(related, output_format)
+        
         if not related['referenced_tables'] and not related['referencing_tables']:
             return f"No related tables found for '{table_name}'"
         
@@ -605,8 +1019,267 @@ async def get_related_tables(table_name: str, ctx: Context) -> str:
         return "\n".join(results)
         
     except Exception as e:
-        return f"Error getting related tables: {str(e)}"
+        return _tool_error(f"Error getting related tables: {str(e)}")
+
+@tool()
+async def explain_sql(sql: str, ctx: Context, output_format: str = "text") -> str:
+    """
+    Get the Oracle optimizer's execution plan for a SQL statement without running it, together with
+    optimization suggestions checked against the referenced tables' columns and indexes (unindexed
+    filters, missing join conditions, functions or implicit conversions on indexed columns). Use this to check how a query you have written will be executed:
+    which indexes it uses, the join order and methods, and the estimated cost, rows and bytes per step.
+    
+    The plan is produced with EXPLAIN PLAN and formatted by DBMS_XPLAN.DISPLAY, including the access
+    and filter predicates applied at each step. Each request uses its own statement ID in the plan
+    table, so several agents can explain queries in parallel safely. Plans are cached by the statement's
+    normalized text (case, whitespace, comments and literal values are ignored, hints are not), so
+    re-explaining a query while refining it is answered from memory until the schema's DDL or
+    optimizer statistics change.
+    
+    Args:
+        sql: The SQL statement to explain (SELECT, INSERT, UPDATE, DELETE or MERGE). A trailing semicolon
+            is ignored. The statement is not executed.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
+    Returns:
+        A formatted string containing the DBMS_XPLAN execution plan followed by optimization suggestions.
+        Returns an error message if the statement could not be explained.
+    """
+    db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
+    
+    try:
+        plan = await db_context.explain_query_plan(sql)
+        
+        if output_format != "text":
+            return _to_json(plan, output_format)
+        
+        if "error" in plan:
+            return _tool_error(f"Error explaining SQL: {plan['error']}")
+        
+        results = ["Execution plan (cached):" if plan.get('cached') else "Execution plan:"]
+        explained_sql = plan.get('explained_sql')
+        if plan.get('cached') and explained_sql is not None and explained_sql.strip() != sql.strip():
+            results.append("Note: this plan was explained for the statement below, which differs from yours only in "
+                           "literals or formatting. Its predicates and cardinality estimates reflect that statement's literals:")
+            results.extend(f"    {line}" for line in explained_sql.strip().split("\n"))
+            results.append("")
+        results.extend(plan['execution_plan'])
+        
+        if plan.get('optimization_suggestions'):
+            results.append("\nOptimization suggestions:")
+            for suggestion in plan['optimization_suggestions']:
+                results.append(f"  - {suggestion}")
+        
+        return "\n".join(results)
+    except Exception as e:
+        return _tool_error(f"Error explaining SQL: {str(e)}")
+
+@tool()
+async def sample_table(table_name: str, ctx: Context, rows: int = 10, columns: Optional[List[str]] = None,
+                       max_bytes: int = 16384, output_format: str = "text") -> str:
+    """
+    Show a few representative rows of a table. Use this to understand what the data in a table
+    looks like (value formats, typical codes, how columns are populated) before writing queries.
+    
+    The rows are read in a read-only transaction with a time limit. Large tables are sampled at the
+    block level so only a small fraction of them is read, which means the rows are representative
+    but not in any particular order; small tables return their first rows. Long text values are
+    shortened, binary and LOB values are summarized, and output stops at the byte limit.
+    
+    Args:
+        table_name: The name of the table to sample (case-insensitive).
+        rows: Number of rows to return (default 10, at most 100).
+        columns: Optional list of column names to include; all columns by default.
+        max_bytes: Approximate limit on the size of the returned values (default 16384, at most 65536).
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
+    Returns:
+        The sampled rows as a table with one line per row, noting whether the table was sampled and
+        whether the byte limit cut the output short.
+    """
+    db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
+    
+    try:
+        sample = await db_context.sample_table(table_name, rows, columns, max_bytes)
+        
+        if output_format != "text":
+            return _to_json(sample, output_format)
+        
+        how = "sampled" if sample['sampled'] else "first rows"
+        results = [f"{len(sample['rows'])} row(s) from {sample['table']} ({how}):", ""]
+        results.append(" | ".join(sample['columns']))
+        for row in sample['rows']:
+            results.append(" | ".join("NULL" if value is None else str(value) for value in row))
+        
+        if sample['truncated']:
+            results.append(f"\n[Output stopped at the {sample['max_bytes']} byte limit; request fewer columns or rows.]")
+        
+        return "\n".join(results)
+    except Exception as e:
+        return _tool_error(f"Error sampling table: {str(e)}")
+
+@tool()
+async def validate_sql(sql: str, ctx: Context, output_format: str = "text") -> str:
+    """
+    Check a SQL statement for references to tables and columns that do not exist, without sending it
+    to the database. Use this before running or explaining a query you have written: misspelled
+    column names, wrong table aliases and ambiguous unqualified columns are reported with
+    "did you mean" suggestions drawn from the cached schema.
+    
+    The statement is parsed locally and every table and column reference (including those in
+    subqueries, joins, GROUP BY and ORDER BY) is resolved against the cached table metadata.
+    Views, synonyms and tables in other schemas are accepted but their columns are not checked.
+    This does not check SQL syntax beyond balanced parentheses and terminated string literals.
+    
+    Args:
+        sql: The SQL statement to check (SELECT, INSERT, UPDATE, DELETE or MERGE).
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
+    Returns:
+        A summary stating whether the statement is valid, followed by each problem found with its
+        suggested corrections, and any references that could not be checked.
+    """
+    db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
+    
+    try:
+        result = await db_context.validate_sql(sql)
+        
+        if output_format != "text":
+            return _to_json(result, output_format)
+        
+        checked = f"{result['tables_checked']} table and {result['columns_checked']} column references checked"
+        if result['valid']:
+            results = [f"No problems found ({checked})."]
+        else:
+            results = [f"Found {len(result['errors'])} problem(s) ({checked}):"]
+            for problem in result['errors']:
+                line = f"  - {problem['message']}"
+                if problem['suggestions']:
+                    line += f". Did you mean: {', '.join(problem['suggestions'])}?"
+                results.append(line)
+        
+        if result['warnings']:
+            results.append("\nNot checked:")
+            for warning in result['warnings']:
+                results.append(f"  - {warning['message']}")
+        
+        return "\n".join(results)
+    except Exception as e:
+        return _tool_error(f"Error validating SQL: {str(e)}")
+
+@tool()
+async def get_server_metrics(ctx: Context, reset: bool = False, output_format: str = "text") -> str:
+    """
+    Show performance metrics of this server since it started (or since the last reset): per tool,
+    the number of calls and errors, latency percentiles (p50/p95/p99), database round trips per call,
+    statements executed, rows fetched, bytes returned and time spent waiting for a pooled connection;
+    and for the database as a whole, statement latency and pool wait percentiles.
+    Use this to find which tools are slow and whether the time goes to the database.
+    
+    The schema cache loads in the background after the server starts. The readiness line shows whether it
+    is still loading, in which case table lookups and searches are answered with direct queries.
+    
+    Round trips are estimated from the statements executed, fetch batches, LOB reads and commits.
+    Latency percentiles are interpolated from histogram buckets, so they are approximate.
+    
+    Args:
+        reset: Clear all metrics after reporting them, to measure a fresh interval.
+        output_format: "text" (default) for readable output, or "json" / "compact_json" to return the
+                      underlying structures as indented or minified JSON for programmatic clients.
+    
+    Returns:
+        The schema cache readiness, a table of per-tool metrics sorted by total time spent, followed by
+        database-wide metrics.
+    """
+    db_context: DatabaseContext = ctx.request_context.lifespan_context
+    error = _check_output_format(output_format)
+    if error:
+        return error
+    
+    metrics = db_context.metrics.snapshot()
+    metrics['readiness'] = readiness = db_context.readiness()
+    if reset:
+        db_context.metrics.reset()
+    
+    if output_format != "text":
+        return _to_json(metrics, output_format)
+    
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+    
+    results = [f"Server metrics over the last {metrics['uptime_seconds']:.0f}s:"]
+    if readiness['state'] == "ready":
+        results.append(f"Schema cache: ready, {readiness['tables_indexed']:,} tables indexed "
+                       f"in {readiness['elapsed_seconds']:.1f}s")
+    elif readiness['state'] == "failed":
+        results.append(f"Schema cache: failed to load ({readiness['error']}); retried on next use")
+    else:
+        results.append(f"Schema cache: {readiness['state']} for {readiness['elapsed_seconds'] or 0:.1f}s; "
+                       f"table lookups and searches use direct queries until it is ready")
+    if metrics['tools']:
+        results.append("\nTools (p50 / p95 / p99 / max ms; round trips per call; pool wait p95 ms):")
+        for name, tool_metrics in metrics['tools'].items():
+            latency = tool_metrics['latency']
+            results.append(
+                f"  - {name}: {tool_metrics['calls']} calls, {tool_metrics['errors']} errors, "
+                f"{ms(latency['p50_ms'])} / {ms(latency['p95_ms'])} / {ms(latency['p99_ms'])} / "
+                f"{ms(latency['max_ms'])} ms; {tool_metrics['round_trips_per_call']} round trips "
+                f"(max {tool_metrics['max_round_trips']}), {tool_metrics['rows_fetched']:,} rows, "
+                f"{tool_metrics['bytes_returned']:,} bytes; pool wait {ms(tool_metrics['pool_wait']['p95_ms'])} ms"
+            )
+    else:
+        results.append("\nNo tool calls recorded yet.")
+    
+    database = metrics['database']
+    statement_latency, pool_wait = database['statement_latency'], database['pool_wait']
+    results.append(f"\nDatabase: {database['statements']:,} statements, {database['round_trips']:,} round trips, "
+                   f"{database['rows_fetched']:,} rows")
+    results.append(f"  Statement latency: p50 {ms(statement_latency['p50_ms'])}, p95 {ms(statement_latency['p95_ms'])}, "
+                   f"p99 {ms(statement_latency['p99_ms'])}, max {ms(statement_latency['max_ms'])} ms")
+    results.append(f"  Pool wait: {pool_wait['count']:,} acquisitions, p95 {ms(pool_wait['p95_ms'])}, "
+                   f"max {ms(pool_wait['max_ms'])} ms")
+    if reset:
+        results.append("\nMetrics have been reset.")
+    
+    return "\n".join(results)
+
+@tool()
+async def profile_requests(ctx: Context, requests: int = 10) -> str:
+    """
+    Profile the next tool calls with cProfile, to diagnose where a running server spends its CPU time
+    without restarting it. The profile covers everything the server does from the first profiled call
+    until the last one completes, including calls running concurrently.
+    
+    When done, the profile is written to the cache directory as profile-<timestamp>.prof (for pstats
+    or snakeviz) with a .txt summary of the functions with the highest cumulative time.
+    
+    Args:
+        requests: Number of tool calls to profile after this one (default 10, 0 to cancel a pending request).
+    
+    Returns:
+        Confirmation of how many calls will be profiled and where the profile will be written.
+    """
+    if requests < 0:
+        return "requests must be zero or more"
+    profiler.arm(requests)
+    if requests == 0:
+        return "Profiling cancelled." + (f" Last profile: {profiler.last_profile}" if profiler.last_profile else "")
+    return (f"Profiling the next {requests} tool calls; the profile will be written to "
+            f"{profiler.output_dir.resolve()}/profile-<timestamp>.prof with a .txt summary.")
 
 if __name__ == "__main__":
+    print("Starting FastMCP server", file=sys.stderr)
     mcp.run()
 
@@ -33,9 +33,7 @@ def test_oracle_mcp_server():
         cwd='/Users/aryangosaliya/Desktop/oracle-mcp-server'
     )
     
-    # Wait for initialization
-    print("⏳ Waiting 8 seconds for server initialization...")
-    time.sleep(8)
+    # No wait needed: the server answers immediately and loads its schema cache in the background
     
     # Test sequence
     tests = [